@@ -1,5 +1,7 @@
 import click
 import random
+import os
+import sys
 from __netsetup__ import (
     setup_network,
     project_config    
@@ -10,12 +12,16 @@ from rich.style import Style
 from rich.text import Text
 from time import sleep
 from importlib import import_module
-import hashlib
 import grpc
 import docker
 from random import randint
 from google.protobuf.json_format import MessageToDict
 
+# the modules shared with the nodes are imported the way the nodes import them
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "chord_node"))
+from chordRing import ChordRing
+from ringView import RingView
+
 
 @click.group()
 def cli():
@@ -32,10 +38,15 @@ def cli():
 @cli.command()
 @click.option('--university', type=str, metavar='UNIVERSITY', help ='Name of the university to search for computer scientists.')
 @click.option('--awards', type=int, metavar='AWARDS', help = 'Minimum number of awards per computer scientist.')
-def lookup(university: str, awards: int):
+@click.option('--mode', type=click.Choice(['iterative', 'recursive']), default=None, help = 'Routing mode of the lookup. Defaults to the mode of the contacted node.')
+@click.option('--timeout', type=float, default=2.0, help = 'Seconds to wait for a replica before falling back to the next one.')
+def lookup(university: str, awards: int, mode: str = None, timeout: float = 2.0):
     """
     Distributed lookup for computer scientists
     from a specific university with a minimum number of awards.
+
+    With successor replication(REPLICATION_FACTOR above 1) the query is sent to the replica of the university's key
+    with the fewest outstanding requests, falling back to another one on timeout.
     
     """
 
@@ -44,24 +55,24 @@ def lookup(university: str, awards: int):
             raise ValueError
         console = Console() 
         key_value = hash(university)
-        network = _dnet_inspect() 
-        arbitary_node = network[randint(0, len(network) - 1)]
+        view = _ring_view()
+        arbitary_node = random.choice(_ring_nodes())
         chordprot_pb2 = import_module(".chordprot_pb2", package = "protobufs.generated")
-        chordprot_pb2_grpc = import_module(".chordprot_pb2_grpc", package = "protobufs.generated")
         
-        ChordStub = getattr(chordprot_pb2_grpc, "ChordStub")
         SuccessorRequest = getattr(chordprot_pb2, "SuccessorRequest")
-        DataTransferStub = getattr(chordprot_pb2_grpc, "DataTransferStub")
         RangeQueryRequest = getattr(chordprot_pb2, "RangeQueryRequest")
         
-        with grpc.insecure_channel(arbitary_node[1]+":50051") as channel:
-            client = ChordStub(channel)
-            corresponding_node = client.find_successor(SuccessorRequest(key_id = key_value))
+        factor = int(project_config['compose']['variables']['REPLICATION_FACTOR'])
+        
+        client = view.stub(arbitary_node[1])
+        corresponding_node = client.find_successor(SuccessorRequest(key_id = str(key_value), 
+                                                                     recursive = None if mode is None else mode == 'recursive',
+                                                                     read = factor <= 1, # successor replicas are found from the owner
+                                                                     university = university))
             
-        with grpc.insecure_channel(corresponding_node.ip_addr+":50051") as channel:
-            client = DataTransferStub(channel)
-            data = client.get_data(RangeQueryRequest(university = university, max_awards = awards))       
-            dict_data = MessageToDict(data, including_default_value_fields = True)  
+        data = view.get_data(corresponding_node.ip_addr, RangeQueryRequest(university = university, max_awards = awards), 
+                             factor = factor, timeout = timeout)       
+        dict_data = MessageToDict(data, including_default_value_fields = True)  
             
         with console.status("[bold light_steel_blue1]"f"Searching at {university} for computer scientists with at least {awards} awards. [bold green]Processing..."):
             sleep(0.9)
@@ -101,16 +112,15 @@ def findFT(node_ip: str):
     
     try:
         
-        with grpc.insecure_channel(node_ip+":50051") as channel:
-            chordprot_pb2_grpc = import_module(".chordprot_pb2_grpc", package = "protobufs.generated")
-            DataTransferStub = getattr(chordprot_pb2_grpc, "DataTransferStub")
-            client = DataTransferStub(channel)
-            data = client.get_finger_table(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()) 
-            dict_data = MessageToDict(data, including_default_value_fields = True)  
+        chordprot_pb2_grpc = import_module(".chordprot_pb2_grpc", package = "protobufs.generated")
+        DataTransferStub = getattr(chordprot_pb2_grpc, "DataTransferStub")
+        client = _ring_view().stub(node_ip, DataTransferStub)
+        data = client.get_finger_table(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()) 
+        dict_data = MessageToDict(data, including_default_value_fields = True)  
 
         with console.status("[bold light_steel_blue1]"f"Searching for the finger table of node {node}. [bold green]Processing..."):
             sleep(0.9)
-            table = Table(title=f"\nFinger Table of node {node}", box = box.ROUNDED, show_lines = True)
+            table = Table(title=f"\nFinger Table of node {node}(routing state version {dict_data['version']})", box = box.ROUNDED, show_lines = True)
             table.add_column("start", justify = "left", style = "navajo_white3", no_wrap = True)
             table.add_column("int.", justify = "left", style = "pale_turquoise4", no_wrap = True)
             table.add_column("successor", justify = "left", style = "light_steel_blue1", no_wrap = True)
@@ -142,11 +152,9 @@ def FindSuccessor(node_ip: str):
     node = hash(node_ip)
     
     try:
-        with grpc.insecure_channel(node_ip+":50051") as channel:
-            chordprot_pb2_grpc = import_module(".chordprot_pb2_grpc", package = "protobufs.generated")
-            ChordStub = getattr(chordprot_pb2_grpc, "ChordStub")
-            client = ChordStub(channel)
-            data = client.get_successor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()) 
+        chordprot_pb2_grpc = import_module(".chordprot_pb2_grpc", package = "protobufs.generated")
+        client = _ring_view().stub(node_ip)
+        data = client.get_successor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()) 
             
     
         with console.status("[bold light_steel_blue1]"f"Searching for the successor of node {node}. [bold green]Processing..."):
@@ -179,11 +187,9 @@ def FindPredecessor(node_ip: str):
     node = hash(node_ip)
     
     try:
-        with grpc.insecure_channel(node_ip+":50051") as channel:
-            chordprot_pb2_grpc = import_module(".chordprot_pb2_grpc", package = "protobufs.generated")
-            ChordStub = getattr(chordprot_pb2_grpc, "ChordStub")
-            client = ChordStub(channel)
-            data = client.get_predecessor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()) 
+        chordprot_pb2_grpc = import_module(".chordprot_pb2_grpc", package = "protobufs.generated")
+        client = _ring_view().stub(node_ip)
+        data = client.get_predecessor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()) 
             
     
         with console.status("[bold light_steel_blue1]"f"Searching for the predecessor of node {node}. [bold green]Processing..."):
@@ -201,7 +207,75 @@ def FindPredecessor(node_ip: str):
         error_console.print(f"Fatal Error during transimission:""[bold red] <Invalid IP address!>[/bold red]")
     except Exception:
         error_console.print(f"An unexpected error occurred.")
-    
+
+
+@cli.command()
+@click.option('--node_ip', type=str, metavar='NODE_IP_ADDRESS', help ='The IP address of the node whose trace you want to view.')
+@click.option('--since', type=int, default=0, metavar='SEQ', help ='Show only the events after this sequence number.')
+@click.option('--limit', type=int, default=50, metavar='NUM_EVENTS', help ='The maximum number of (most recent) events to show, 0 for all.')
+@click.option('--level', type=click.Choice(['debug', 'info', 'warning', 'error', 'off']), default=None, help ='Change the trace level of the node first.')
+def trace(node_ip: str, since: int, limit: int, level: str = None):
+    """
+    Takes an IP address and shows the events buffered by the tracer of that node.
+
+    """
+    console = Console()
+    error_console = Console(stderr = True, style = "red")
+    node = hash(node_ip)
+
+    try:
+        chordprot_pb2 = import_module(".chordprot_pb2", package = "protobufs.generated")
+        client = _ring_view().stub(node_ip)
+        request = chordprot_pb2.TraceRequest(since = since, limit = limit, level = level) if level else chordprot_pb2.TraceRequest(since = since, limit = limit)
+        data = client.get_trace(request)
+
+        table = Table(title=f"\nTrace of node {node}(level {data.level})", box = box.ROUNDED)
+        table.add_column("seq", justify = "right", style = "navajo_white3", no_wrap = True)
+        table.add_column("time", justify = "left", style = "pale_turquoise4", no_wrap = True)
+        table.add_column("level", justify = "left", style = "light_steel_blue1", no_wrap = True)
+        table.add_column("event", justify = "left", style = "sandy_brown", no_wrap = True)
+        table.add_column("fields", justify = "left", style = "navajo_white3")
+        for event in data.events:
+            table.add_row(str(event.seq), f"{event.timestamp:.3f}", event.level, event.name,
+                          " ".join(f"{key}={value}" for key, value in sorted(event.fields.items())))
+        console.print(table)
+
+    except grpc.RpcError as e:
+        error_console.print("Fatal Error during transimission.")
+        print(e)
+    except Exception:
+        error_console.print("An unexpected error occurred.")
+
+
+@cli.command()
+@click.option('--node_ip', type=str, metavar='NODE_IP_ADDRESS', help ='The IP address of the node whose query cache you want to view.')
+def cacheStats(node_ip: str):
+    """
+    Takes an IP address and shows the counters of the query cache of that node.
+
+    """
+    console = Console()
+    error_console = Console(stderr = True, style = "red")
+    node = hash(node_ip)
+
+    try:
+        chordprot_pb2_grpc = import_module(".chordprot_pb2_grpc", package = "protobufs.generated")
+        client = _ring_view().stub(node_ip)
+        data = client.get_cache_stats(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty())
+
+        table = Table(title=f"\nQuery cache of node {node}", box = box.ROUNDED)
+        for column in ("hits", "misses", "evictions", "entries", "capacity", "replica hits", "replicas", "hot keys"):
+            table.add_column(column, justify = "center", style = "navajo_white3", no_wrap = True)
+        table.add_row(str(data.hits), str(data.misses), str(data.evictions), str(data.entries), str(data.capacity),
+                      str(data.replica_hits), str(data.replicas), str(data.hot_keys))
+        console.print(table)
+
+    except grpc.RpcError as e:
+        error_console.print("Fatal Error during transimission.")
+        print(e)
+    except Exception:
+        error_console.print("An unexpected error occurred.")
+
 
 @cli.command()
 def join():
@@ -229,7 +303,14 @@ def join():
             },
             entrypoint =  ["/usr/bin/watchexec","-f","chordNode.py","-c","-r", "--","python3 ./chordNode.py"],
             environment = {
-                "FT_SIZE" : f"{project_config['compose']['variables']['IDENT_SPACE_EXP']}"
+                "FT_SIZE" : f"{project_config['compose']['variables']['IDENT_SPACE_EXP']}",
+                "LOOKUP_MODE" : f"{project_config['compose']['variables']['LOOKUP_MODE']}",
+                "SERVER_MODE" : f"{project_config['compose']['variables']['SERVER_MODE']}",
+                "JOIN_MODE" : f"{project_config['compose']['variables']['JOIN_MODE']}",
+                "DB_ENGINE" : f"{project_config['compose']['variables']['DB_ENGINE']}",
+                "DB_SHARDS" : f"{project_config['compose']['variables']['DB_SHARDS']}",
+                "REPLICATION_FACTOR" : f"{project_config['compose']['variables']['REPLICATION_FACTOR']}",
+                "TRACE_LEVEL" : f"{project_config['compose']['variables']['TRACE_LEVEL']}"
             }
         )
        
@@ -243,16 +324,15 @@ def join():
             sleep(2)
           
              
-            arbitrary_node = network[randint(0, len(network) - 1)]
-            with grpc.insecure_channel(str(jnode_ip_address)+":50051") as channel:
-                chordprot_pb2 = import_module(".chordprot_pb2", package = "protobufs.generated")
-                chordprot_pb2_grpc = import_module(".chordprot_pb2_grpc", package = "protobufs.generated")
- 
-                ChordStub = getattr(chordprot_pb2_grpc, "ChordStub")
-                JoinRequest = getattr(chordprot_pb2, "JoinRequest")
-                client = ChordStub(channel)
-                client.join(JoinRequest(ip_addr = str(arbitrary_node[1]) , transfer_data = True))
-                console.print(f"[bold green]Successful join of node chord-chordNode-{len(network)+1} at chord network...")
+            arbitrary_node = random.choice(_ring_nodes())
+            chordprot_pb2 = import_module(".chordprot_pb2", package = "protobufs.generated")
+            JoinRequest = getattr(chordprot_pb2, "JoinRequest")
+            view = _ring_view()
+            client = view.stub(str(jnode_ip_address))
+            client.join(JoinRequest(ip_addr = str(arbitrary_node[1]) , transfer_data = True))
+            view.refresh([str(jnode_ip_address)])
+            view.save(project_config['ring_view_file'])
+            console.print(f"[bold green]Successful join of node chord-chordNode-{len(network)+1} at chord network...")
     except KeyError as e:
         print(f"key error: {e}")
     except grpc.RpcError as e:
@@ -290,12 +370,12 @@ def leave(node_ip = None):
     with console.status("[bold light_steel_blue1]"f"Beginning leave sequence for node with IP address: {leaving_node_ip}. [bold green]Processing..."):
         sleep(2)
         try: 
-            with grpc.insecure_channel(leaving_node_ip +":50051") as channel:
-                chordprot_pb2_grpc = import_module(".chordprot_pb2_grpc", package = "protobufs.generated")
-                ChordStub = getattr(chordprot_pb2_grpc, "ChordStub")
-                client = ChordStub(channel)
-                client.leave(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty())
-                
+            chordprot_pb2_grpc = import_module(".chordprot_pb2_grpc", package = "protobufs.generated")
+            view = _ring_view()
+            client = view.stub(leaving_node_ip)
+            client.leave(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty())
+            view.discard(leaving_node_ip)
+            view.save(project_config['ring_view_file'])
             
             chord_net.disconnect(random_container)
             random_container.stop()
@@ -351,23 +431,52 @@ def hash(data, modulus = project_config['compose']['variables']['IDENT_SPACE_EXP
         '''
         _hash_
         ======
-        Computes the SHA-256 hash and returns it as an integer. 
+        Computes the SHA-256 hash and returns it as an identifier on the Chord ring. 
 
         Args:
           data: The data to be hashed.
+          modulus: The exponent m of the identifier space [0, 2^m).
         
         Note:
           This method takes input data, encodes it in UTF-8, computes the SHA-256 hash
-          and returns the hash value as an integer.
+          and reduces it modulo 2^m through the shared ring arithmetic(ChordRing).
 
         Returns:
-          int: The integer representation of the SHA-256 hash.
+          int: The identifier of the data on the Chord ring.
 
         '''
-        sha256 = hashlib.sha256()
-        sha256.update(data.encode('utf-8'))
-        return int(sha256.hexdigest(), 16) % (2**int(modulus))    
+        return ChordRing(int(modulus)).hash(data)    
+    
+
+_view = None
+
+def _ring_view() -> RingView:
+    '''
+    Returns the ring view of the process, which reuses its channels across all the calls of the process.
+    '''
+    global _view
+    if _view is None:
+        _view = RingView(ChordRing(project_config['compose']['variables']['IDENT_SPACE_EXP']),
+                         import_module(".chordprot_pb2", package = "protobufs.generated"),
+                         import_module(".chordprot_pb2_grpc", package = "protobufs.generated"))
+    return _view
+
+
+def _ring_nodes():
+    '''
+    Returns the (node_id, ip_addr) pairs of the ring's nodes from the cached ring view. 
     
+    The view is refreshed by walking the ring from the nodes persisted at the ring view file,
+    while the Docker network is inspected only when none of them is reachable.
+    '''
+    view = _ring_view()
+    refreshed_at = view.refreshed_at
+    if len(view.nodes(RingView.load(project_config['ring_view_file']))) == 0:
+        view.refresh([node_ip for _, node_ip in _dnet_inspect()])
+    if view.refreshed_at != refreshed_at:
+        view.save(project_config['ring_view_file'])
+    return view.members
+
 
 def _dnet_inspect():
         client = docker.from_env()
@@ -0,0 +1,847 @@
+import asyncio
+import grpc
+import os
+from functools import wraps
+
+from generatedStubs.chordprot_pb2 import (
+    JoinRequest,
+    JoinResponse,
+    SuccessorRequest,
+    SuccessorResponse,
+    setPredecessorRequest,
+    FingerUpdateRequest,
+    FixFingerRequest,
+    SuccessorsRequest,
+    SuccessorsResponse,
+    KeyGroup,
+    FingerUpdatesRequest,
+    DataTransferResponse,
+    ReplicaInvalidation,
+    ReplicaRelease
+)
+
+import generatedStubs.chordprot_pb2_grpc as chordprot_pb2_grpc
+from typing import Dict, Tuple
+from chordNode import ChordNode
+from hopsCounter import AioHopsCounterInterceptor
+from localStub import AioLocalStub
+from tracer import DEBUG, INFO
+from channelPool import AioChannelPool, SERVER_KEEPALIVE_OPTIONS
+from successorReplicas import AioSuccessorReplicas
+
+
+def _inline_(method):
+    '''
+    Serves a ChordNode method, which neither blocks nor calls other nodes, directly on the event loop.
+    '''
+    @wraps(method)
+    async def handler(self, request, context):
+        return method(self, request, context)
+    return handler
+
+
+def _offloaded_(method):
+    '''
+    Serves a ChordNode method, which blocks on the local database, on a worker thread, keeping the event loop responsive.
+    '''
+    @wraps(method)
+    async def handler(self, request, context):
+        return await asyncio.to_thread(method, self, request, context)
+    return handler
+
+
+async def _drain_(iterator):
+    '''
+    Iterates a blocking iterator, e.g. a generator reading the local database, advancing it on a worker thread.
+    '''
+    while (item := await asyncio.to_thread(next, iterator, None)) is not None:
+        yield item
+
+
+def _streamed_(method):
+    '''
+    Serves a ChordNode method streaming its responses out of the local database, producing each response on a worker thread.
+    '''
+    @wraps(method)
+    async def handler(self, request, context):
+        async for response in _drain_(method(self, request, context)):
+            yield response
+    return handler
+
+
+class AioChordNode(ChordNode):
+    '''
+    A Chord network node served by an asyncio gRPC server(grpc.aio).
+
+    The routing logic is the one of ChordNode. The methods calling other nodes are coroutines awaiting async stubs,
+    so a request waiting on an outbound call(a forwarded lookup, a recursive update_finger_table() chain)
+    suspends instead of holding one of a fixed number of worker threads. One event loop thus keeps hundreds
+    of routed requests in flight.
+
+    The server is selected at startup through SERVER_MODE('thread' or 'aio').
+
+    '''
+
+    def __init__(self) -> None:
+        '''
+        __init__
+        ========
+
+        Initializes a Chord network node, as ChordNode does, with the asyncio counterparts of the hops counter,
+        the local stubs, the channel pool and the successor replicas.
+
+        Returns:
+          None
+
+        '''
+        super().__init__()
+        self.hopCounter = AioHopsCounterInterceptor(self.tracer)
+        self.local_stubs = {chordprot_pb2_grpc.ChordStub: AioLocalStub(self, self.hopCounter),
+                            chordprot_pb2_grpc.DataTransferStub: AioLocalStub(self, self.hopCounter, "chordprot.DataTransfer")}
+        self.channels = AioChannelPool(max_size = int(os.environ.get("CHANNEL_POOL_SIZE", 64)),
+                                       idle_timeout = float(os.environ.get("CHANNEL_IDLE_TIMEOUT", 300)))
+        self.successor_replicas = AioSuccessorReplicas(self.ring, self.successor_replicas.factor, 
+                                                       self.successor_replicas.period, self._replica_engine_)
+
+
+    def serve(self) -> None:
+        '''
+        serve
+        =====
+
+        Starting the operation of the asyncio server - container and waiting for the (possible) incoming requests.
+
+        Returns:
+          None
+
+        '''
+        asyncio.run(self._serve_())
+
+
+    async def _serve_(self) -> None:
+        server = grpc.aio.server(interceptors = [self.hopCounter], options = SERVER_KEEPALIVE_OPTIONS)
+        chordprot_pb2_grpc.add_ChordServicer_to_server(self, server)
+        chordprot_pb2_grpc.add_DataTransferServicer_to_server(self, server)
+        server.add_insecure_port('[::]:50051')
+        await server.start()
+        if self.tracer.info:
+            self.tracer.event(INFO, "serve", ip_addr = self.ip_addr, server = "aio")
+        if self.join_mode == "stabilize":
+            self.maintenance = [asyncio.create_task(self._maintain_(task, period)) for task, period in self._maintenance_tasks_()]
+        if self.hot_keys.rate > 0:
+            self.replication = asyncio.create_task(self._maintain_(self.replicate_hot_keys, self.hot_keys.period))
+        if self.successor_replicas.factor > 1:
+            self.replica_sync = asyncio.create_task(self._maintain_(self.sync_replicas, self.successor_replicas.period))
+        await server.wait_for_termination()
+
+
+    async def join(self, request: JoinRequest, context) -> JoinResponse:
+        '''
+        join
+        ====
+
+        Asynchronous counterpart of ChordNode.join().
+
+        '''
+        with self.channels.counting() as counter:
+            await self._join_(request)
+        return JoinResponse(num_rpcs = counter.calls)
+
+
+    async def _join_(self, request: JoinRequest) -> None:
+        '''
+        Asynchronous counterpart of ChordNode._join_().
+        '''
+        if not self._join_start_(request):
+            return
+        if self.join_mode == "stabilize":
+            await self._join_successor_(request.ip_addr)
+            self._join_routed_()
+        else:
+            await self.init_finger_table(request.ip_addr)
+            self._join_routed_()
+            await self.update_others()
+        self.hopCounter.reset_hops()
+        if(request.transfer_data):
+            try:
+                await self._pull_data_()
+            except grpc.RpcError as e:
+                self.logger.error(f"Error occured during the gRPC call: {e}")
+            except Exception as e:
+                self.logger.error(f"Error occured: {e}")
+        if self.successor_replicas.factor > 1:
+            try:
+                await self.sync_replicas()
+            except grpc.RpcError as e:
+                self.logger.warning(f"Syncing the successor replicas of the joining node failed: {e}")
+
+
+    async def _pull_data_(self) -> None:
+        '''
+        Asynchronous counterpart of ChordNode._pull_data_().
+        '''
+        await asyncio.to_thread(self._pull_start_)
+        if self.chordDb.sharded:
+            await self._pull_shards_()
+        else:
+            await self._pull_handoff_()
+        self._pulled_()
+
+
+    async def _pull_handoff_(self) -> None:
+        '''
+        Asynchronous counterpart of ChordNode._pull_handoff_().
+        '''
+        source = self.successor
+        client = self.__establish_comm__(source, chordprot_pb2_grpc.DataTransferStub)
+        for attempt in range(self.handoff_retries + 1):
+            try:
+                request = await asyncio.to_thread(self._handoff_request_, source)
+                async for chunk in client.stream_data(request):
+                    ack = await asyncio.to_thread(self._pulled_chunk_, chunk, source, request)
+                    if ack is not None:
+                        await client.ack_data(ack)
+                return
+            except grpc.RpcError as e:
+                self._resume_handoff_(attempt, source, e)
+
+
+    async def _push_handoff_(self) -> None:
+        '''
+        Asynchronous counterpart of ChordNode._push_handoff_().
+        '''
+        await asyncio.to_thread(self.chordDb.write_disk)
+        client = self.__establish_comm__(self.successor, chordprot_pb2_grpc.DataTransferStub)
+        for attempt in range(self.handoff_retries + 1):
+            try:
+                async for ack in client.handoff(_drain_(self._chunks_())):
+                    await asyncio.to_thread(self.chordDb.acknowledge, upto = ack.upto)
+                break
+            except grpc.RpcError as e:
+                self._resume_handoff_(attempt, self.ip_addr, e)
+        leftover = await asyncio.to_thread(self._leaving_data_)
+        if len(leftover.data) > 0:
+            await client.store(leftover)
+
+
+    async def _pull_shards_(self) -> None:
+        '''
+        Asynchronous counterpart of ChordNode._pull_shards_().
+        '''
+        source = self.successor
+        client = self.__establish_comm__(source, chordprot_pb2_grpc.DataTransferStub)
+        request = self._shard_request_()
+        for attempt in range(self.handoff_retries + 1):
+            staged = dict()
+            try:
+                async for piece in client.pull_shards(request):
+                    await asyncio.to_thread(self._stage_piece_, piece, staged)
+                break
+            except grpc.RpcError as e:
+                await asyncio.to_thread(self._discard_staged_, staged)
+                self._resume_handoff_(attempt, source, e)
+        await client.release_shards(await asyncio.to_thread(self._shard_release_, request, staged))
+
+
+    async def _push_shards_(self) -> None:
+        '''
+        Asynchronous counterpart of ChordNode._push_shards_().
+        '''
+        await asyncio.to_thread(self.chordDb.write_disk)
+        client = self.__establish_comm__(self.successor, chordprot_pb2_grpc.DataTransferStub)
+        for attempt in range(self.handoff_retries + 1):
+            exported = await asyncio.to_thread(self.chordDb.export)
+            try:
+                await client.push_shards(_drain_(self._shard_pieces_(exported)))
+                break
+            except grpc.RpcError as e:
+                self._resume_handoff_(attempt, self.ip_addr, e)
+        await asyncio.to_thread(self._release_exported_, exported)
+        leftover = await asyncio.to_thread(self._leaving_data_)
+        if len(leftover.data) > 0:
+            await client.store(leftover)
+
+
+    async def push_shards(self, request_iterator, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        '''
+        push_shards
+        ===========
+
+        Asynchronous counterpart of ChordNode.push_shards().
+
+        '''
+        staged = dict()
+        try:
+            await asyncio.to_thread(self._merge_start_)
+            async for piece in request_iterator:
+                await asyncio.to_thread(self._stage_piece_, piece, staged)
+            await asyncio.to_thread(self._merge_shards_, staged)
+        except Exception as e:
+            self._merge_failed_(e, context)
+        finally:
+            await asyncio.to_thread(self._discard_staged_, staged)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    async def handoff(self, request_iterator, context):
+        '''
+        handoff
+        =======
+
+        Asynchronous counterpart of ChordNode.handoff().
+
+        '''
+        await asyncio.to_thread(self.chordDb.write_disk)
+        try:
+            async for chunk in request_iterator:
+                ack = await asyncio.to_thread(self._handed_chunk_, chunk)
+                if ack is not None:
+                    yield ack
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+
+
+    async def _join_successor_(self, ip_addr: str) -> None:
+        '''
+        Asynchronous counterpart of ChordNode._join_successor_().
+        '''
+        successor = await self.__establish_comm__(ip_addr).find_successor(SuccessorRequest(key_id = str(self._own_key())))
+        self._publish_({0: (int(successor.node_id), successor.ip_addr)}, predecessor = None, successor = successor.ip_addr)
+        await self.__establish_comm__(self.successor).notify(setPredecessorRequest(ip_addr = self.ip_addr))
+
+
+    async def leave(self, request, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        '''
+        leave
+        =====
+
+        Asynchronous counterpart of ChordNode.leave().
+
+        '''
+        if self._leaving_alone_():
+            await asyncio.to_thread(self._leave_alone_)
+            return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+        try:
+            await self.__establish_comm__(self.successor).set_predecessor(setPredecessorRequest(ip_addr = self.predecessor))
+            await self.__establish_comm__(self.predecessor).set_successor(setPredecessorRequest(ip_addr = self.successor))
+            await self._push_data_()
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "fix_others", node_id = self._own_key())
+            await self.fix_others()
+            await asyncio.to_thread(self._left_)
+            self.channels.close()
+        except grpc.RpcError as e:
+            self.logger.error(f"Error during transmission occured: {e}")
+        except Exception as e:
+            self.logger.error(f"An error occurred during the leave of node {self._own_key()}: {e}")
+
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    async def _push_data_(self) -> None:
+        '''
+        Asynchronous counterpart of ChordNode._push_data_().
+        '''
+        if self.chordDb.sharded:
+            await self._push_shards_()
+        else:
+            await self._push_handoff_()
+
+
+    async def init_finger_table(self, ip_addr: str) -> None:
+        '''
+        init_finger_table
+        =================
+
+        Asynchronous counterpart of ChordNode.init_finger_table().
+
+        '''
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "init_finger_table", node_id = self._own_key())
+        try:
+            contact = self.__establish_comm__(ip_addr)
+            self._init_successor_(await contact.find_successor(SuccessorRequest(key_id = str(self.FT.FT[0][0]))))
+            client = self.__establish_comm__(self.successor)
+            self.predecessor = (await client.get_predecessor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty())).ip_addr
+            await client.set_predecessor(setPredecessorRequest(ip_addr = self.ip_addr))
+            await self.__establish_comm__(self.predecessor).set_successor(setPredecessorRequest(ip_addr = self.ip_addr))
+
+            fingers = list(self.FT.FT)
+            for i in range(len(fingers)-1):
+                if not self._init_finger_(fingers, i):
+                    successor = await contact.find_successor(SuccessorRequest(key_id = str(fingers[i+1][0])))
+                    fingers[i+1] = (fingers[i+1][0], int(successor.node_id), successor.ip_addr)
+            self._init_fingers_(fingers)
+        except grpc.RpcError as e:
+            self.logger.error(f"Error occured during the gRPC calls at init_finger_table(): {e}")
+
+
+    async def update_others(self) -> Dict[int, object]:
+        '''
+        update_others
+        =============
+
+        Asynchronous counterpart of ChordNode.update_others().
+
+        '''
+        join_rq = JoinRequest(ip_addr = self.ip_addr)
+
+        async def update_finger_tables(ip_addr, indices):
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "update_others", target_id = self._hash_(ip_addr), indices = indices)
+            await self.__establish_comm__(ip_addr).update_finger_tables(FingerUpdatesRequest(join_req = join_rq, indices = indices))
+
+        return await self._batch_others_(update_finger_tables)
+
+
+    async def update_finger_table(self, request, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        '''
+        update_finger_table
+        ===================
+
+        Asynchronous counterpart of ChordNode.update_finger_table().
+
+        '''
+        if self._update_finger_(request):
+            p = self.predecessor
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "update_finger_table", forward_to = p, joining = request.join_req.ip_addr, index = request.index)
+            await self.__establish_comm__(p).update_finger_table(request)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    async def update_finger_tables(self, request: FingerUpdatesRequest, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        '''
+        update_finger_tables
+        ====================
+
+        Asynchronous counterpart of ChordNode.update_finger_tables().
+
+        '''
+        updated = [i for i in request.indices if self._update_finger_(FingerUpdateRequest(join_req = request.join_req, index = i))]
+        if len(updated) > 0:
+            p = self.predecessor
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "update_finger_tables", forward_to = p, joining = request.join_req.ip_addr, indices = updated)
+            await self.__establish_comm__(p).update_finger_tables(FingerUpdatesRequest(join_req = request.join_req, indices = updated))
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    async def fix_others(self) -> Dict[int, object]:
+        '''
+        fix_others
+        ==========
+
+        Asynchronous counterpart of ChordNode.fix_others().
+
+        '''
+        join_rq = JoinRequest(ip_addr = self.ip_addr)
+
+        async def fix_finger_tables(ip_addr, indices):
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "fix_others", target_id = self._hash_(ip_addr), indices = indices)
+            await self.__establish_comm__(ip_addr).fix_finger_tables(FingerUpdatesRequest(join_req = join_rq, successor_ip_addr = self.successor, indices = indices))
+
+        return await self._batch_others_(fix_finger_tables)
+
+
+    async def fix_finger_table(self, request, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        '''
+        fix_finger_table
+        ================
+
+        Asynchronous counterpart of ChordNode.fix_finger_table().
+
+        '''
+        if self._fix_finger_(request):
+            p = self.predecessor
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "fix_finger_table", forward_to = p, leaving = request.join_req.ip_addr, index = request.index)
+            await self.__establish_comm__(p).fix_finger_table(request)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    async def fix_finger_tables(self, request: FingerUpdatesRequest, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        '''
+        fix_finger_tables
+        =================
+
+        Asynchronous counterpart of ChordNode.fix_finger_tables().
+
+        '''
+        fixed = [i for i in request.indices if self._fix_finger_(FixFingerRequest(join_req = request.join_req, successor_ip_addr = request.successor_ip_addr, index = i))]
+        if len(fixed) > 0:
+            p = self.predecessor
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "fix_finger_tables", forward_to = p, leaving = request.join_req.ip_addr, indices = fixed)
+            await self.__establish_comm__(p).fix_finger_tables(FingerUpdatesRequest(join_req = request.join_req, successor_ip_addr = request.successor_ip_addr, indices = fixed))
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    async def _index_target_(self, i: int) -> str:
+        '''
+        Asynchronous counterpart of ChordNode._index_target_().
+        '''
+        key_id, target = self._index_key_(i)
+        if target is not None:
+            return target
+        return self._index_found_(i, key_id, await self.find_predecessor(key_id))
+
+
+    async def _batch_others_(self, send) -> Dict[int, object]:
+        '''
+        Asynchronous counterpart of ChordNode._batch_others_().
+        '''
+        targets = await self._fan_out_(self._index_target_, range(len(self.FT.FT)))
+        groups = dict()
+        for i, target in targets.items():
+            if not isinstance(target, Exception):
+                groups.setdefault(target, list()).append(i)
+
+        sent = await self._fan_out_(lambda ip_addr: send(ip_addr, groups[ip_addr]), list(groups))
+        return {i: sent[target] if not isinstance(target, Exception) and isinstance(sent[target], Exception) else target
+                for i, target in targets.items()}
+
+
+    async def _fan_out_(self, task, keys) -> Dict[object, object]:
+        '''
+        Asynchronous counterpart of ChordNode._fan_out_(): the keys run as coroutines, bounded by a semaphore.
+        '''
+        semaphore = asyncio.Semaphore(self.fanout)
+
+        async def run(key):
+            async with semaphore:
+                return await task(key)
+
+        keys = list(keys)
+        results = await asyncio.gather(*map(run, keys), return_exceptions = True)
+        return self._collect_(dict(zip(keys, results)))
+
+
+    async def find_successor(self, request: SuccessorRequest, context) -> SuccessorResponse:
+        '''
+        find_successor
+        ==============
+
+        Asynchronous counterpart of ChordNode.find_successor().
+
+        '''
+        try:
+            university = self._read_university_(request)
+            if self._recursive_(request):
+                return await self.find_successor_recursive(int(request.key_id), university)
+            if (replica := self._replica_owner_(int(request.key_id), university)) is not None:
+                return replica
+
+            return self._found_(request, await self._route_(int(request.key_id), owner_only = True, university = university))
+        except grpc.RpcError as e:
+            self.logger.error(f"Error in find successor: {e}")
+
+
+    async def find_successor_recursive(self, key_id: int, university: str = None) -> SuccessorResponse:
+        '''
+        find_successor_recursive
+        ========================
+
+        Asynchronous counterpart of ChordNode.find_successor_recursive().
+
+        '''
+        owner, finger = self._next_hop_(key_id, university)
+        if owner is not None:
+            return owner
+        return await self.__establish_comm__(finger[2]).find_successor(SuccessorRequest(key_id = str(key_id), recursive = True, 
+                                                                                        read = university is not None, university = university))
+
+
+    async def find_successors(self, request: SuccessorsRequest, context) -> SuccessorsResponse:
+        '''
+        find_successors
+        ===============
+
+        Asynchronous counterpart of ChordNode.find_successors(). The steps of every round run as coroutines on the event loop.
+
+        '''
+        owners, groups = self._partition_keys_(request.key_ids)
+        if request.step:
+            return SuccessorsResponse(owners = owners, forwarded = [KeyGroup(ip_addr = ip_addr, key_ids = key_ids) for ip_addr, key_ids in groups.items()])
+
+        unresolved = list()
+        while len(groups) > 0:
+            steps = await self._fan_out_(lambda ip_addr: self.__establish_comm__(ip_addr).find_successors(SuccessorsRequest(key_ids = groups[ip_addr], step = True)),
+                                         list(groups))
+            groups = self._merge_steps_(owners, unresolved, groups, steps)
+
+        return SuccessorsResponse(owners = owners, unresolved = unresolved)
+
+
+    async def find_predecessor(self, key_id: int) -> str:
+        '''
+        find_predecessor
+        ================
+
+        Asynchronous counterpart of ChordNode.find_predecessor().
+
+        '''
+        return (await self._route_(key_id))[0]
+
+
+    async def _route_(self, key_id: int, owner_only: bool = False, university: str = None) -> Tuple[str, int, str]:
+        '''
+        _route_
+        =======
+
+        Asynchronous counterpart of ChordNode._route_().
+
+        '''
+        result, mirror_node = self._route_start_(key_id, owner_only)
+        while result is None:
+            closest_preceding_finger_res = await self.__establish_comm__(mirror_node[0]).closest_preceding_finger(SuccessorRequest(key_id = str(key_id), 
+                                                                                                                                   read = university is not None, 
+                                                                                                                                   university = university))
+            result, mirror_node = self._route_step_(mirror_node, closest_preceding_finger_res, key_id, owner_only)
+        return result
+
+
+    async def stabilize(self) -> None:
+        '''
+        stabilize
+        =========
+
+        Asynchronous counterpart of ChordNode.stabilize().
+
+        '''
+        self._adopt_successor_(await self.__establish_comm__(self.successor).get_predecessor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()))
+        await self.__establish_comm__(self.successor).notify(setPredecessorRequest(ip_addr = self.ip_addr))
+
+
+    async def fix_fingers(self) -> None:
+        '''
+        fix_fingers
+        ===========
+
+        Asynchronous counterpart of ChordNode.fix_fingers().
+
+        '''
+        i = self._next_finger_()
+        if i > 0:
+            _, node_id, node_ip = await self._route_(self.FT.FT[i][0], owner_only = True)
+            self._publish_({i: (node_id, node_ip)})
+
+
+    async def check_predecessor(self) -> None:
+        '''
+        check_predecessor
+        =================
+
+        Asynchronous counterpart of ChordNode.check_predecessor().
+
+        '''
+        predecessor = self.predecessor
+        if predecessor is None or predecessor == self.ip_addr:
+            return
+        try:
+            await self.__establish_comm__(predecessor).get_successor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty(),
+                                                                     timeout = self.check_predecessor_period)
+        except grpc.RpcError as e:
+            self.logger.warning(f"Predecessor {predecessor} has failed: {e}")
+            self._drop_predecessor_(predecessor)
+
+
+    async def get_data(self, request, context):
+        '''
+        get_data
+        ========
+
+        Asynchronous counterpart of ChordNode.get_data(). Queries answered by the node are served on a worker thread.
+
+        '''
+        try:
+            replica, owner, database = self._query_start_(request)
+            if replica is not None:
+                return replica
+            if owner is None and database is None:
+                owner, database = self._query_step_(await self.find_successor(SuccessorRequest(key_id = str(self.ring.hash(request.university))), context))
+            if owner is not None:
+                return await self.__establish_comm__(owner, chordprot_pb2_grpc.DataTransferStub).get_data(request)
+            return await asyncio.to_thread(self._query_, request, database)
+        except Exception as e:
+            self.logger.error(f"Error occured during retrieval of range query response data: {e}")
+            return DataTransferResponse()
+
+
+    async def replicate_hot_keys(self) -> None:
+        '''
+        replicate_hot_keys
+        ==================
+
+        Asynchronous counterpart of ChordNode.replicate_hot_keys().
+
+        '''
+        for university, version, holders in self.hot_keys.invalidations():
+            for holder in holders:
+                try:
+                    await self.__establish_comm__(holder, chordprot_pb2_grpc.DataTransferStub).invalidate_replica(ReplicaInvalidation(university = university, version = version))
+                except grpc.RpcError as e:
+                    self.logger.warning(f"Invalidating the replica of {university} at {holder} failed: {e}")
+
+        for university in self.hot_keys.sample():
+            key_id, holders = self.ring.hash(university), list()
+            wanted = self._holders_step_(holders, self.predecessor)
+            for i in range(self.ring.exponent):
+                if not wanted:
+                    break
+                wanted = self._holders_step_(holders, await self.find_predecessor((key_id - 2**i) % self.ring.size))
+            if not holders:
+                continue
+            replica = await asyncio.to_thread(self._replica_, university, key_id, self.hot_keys.replicating(university, holders))
+            for holder in holders:
+                try:
+                    await self.__establish_comm__(holder, chordprot_pb2_grpc.DataTransferStub).replicate(replica)
+                except grpc.RpcError as e:
+                    self.logger.warning(f"Replicating {university} to {holder} failed: {e}")
+            self._replicated_(replica, holders)
+
+
+    async def store(self, request, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        '''
+        store
+        =====
+
+        Asynchronous counterpart of ChordNode.store(). The records are stored on a worker thread and pipelined on the event loop.
+
+        '''
+        if self.successor_replicas.factor <= 1:
+            await asyncio.to_thread(self._store_request_, request, context)
+            return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+        await self.successor_replicas.enter()
+        try:
+            if await asyncio.to_thread(self._store_request_, request, context):
+                await self._pipeline_(request.data)
+        finally:
+            await self.successor_replicas.exit()
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    async def _pipeline_(self, data) -> None:
+        '''
+        Asynchronous counterpart of ChordNode._pipeline_().
+        '''
+        chain = self.successor_replicas.chain
+        if not chain:
+            return
+        try:
+            await self.__establish_comm__(chain[0], chordprot_pb2_grpc.DataTransferStub).store_replica(self._replica_write_(data, chain))
+        except grpc.RpcError as e:
+            self._pipeline_failed_(chain, e)
+
+
+    async def store_replica(self, request, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        '''
+        store_replica
+        =============
+
+        Asynchronous counterpart of ChordNode.store_replica().
+
+        '''
+        try:
+            await asyncio.to_thread(self._store_replica_, request)
+            if request.chain:
+                await self.__establish_comm__(request.chain[0], chordprot_pb2_grpc.DataTransferStub).store_replica(self._forwarded_write_(request))
+        except Exception as e:
+            self._store_replica_failed_(request, e, context)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    async def sync_replica(self, request_iterator, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        '''
+        sync_replica
+        ============
+
+        Asynchronous counterpart of ChordNode.sync_replica().
+
+        '''
+        staged = None
+        try:
+            async for chunk in request_iterator:
+                staged = await asyncio.to_thread(self._stage_replica_, chunk, staged)
+        except Exception as e:
+            await asyncio.to_thread(self._sync_replica_failed_, staged, e, context)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    async def sync_replicas(self) -> None:
+        '''
+        sync_replicas
+        =============
+
+        Asynchronous counterpart of ChordNode.sync_replicas(). The data of the node is read on a worker thread.
+
+        '''
+        if self.FT.predecessor is None:
+            return
+        chain = await self._successor_chain_()
+        await asyncio.to_thread(self.chordDb.write_disk)
+        await self.successor_replicas.enter(True)
+        try:
+            start, targets, released = self._sync_plan_(chain)
+            for ip_addr in targets:
+                await self.__establish_comm__(ip_addr, chordprot_pb2_grpc.DataTransferStub).sync_replica(_drain_(self._replica_chunks_(start)))
+            for ip_addr in released:
+                try:
+                    await self.__establish_comm__(ip_addr, chordprot_pb2_grpc.DataTransferStub).release_replica(ReplicaRelease(owner_ip_addr = self.ip_addr))
+                except grpc.RpcError as e:
+                    self.logger.warning(f"Releasing the replica held by {ip_addr} failed: {e}")
+            self.successor_replicas.synced(chain, start)
+        finally:
+            await self.successor_replicas.exit(True)
+        await asyncio.to_thread(self._synced_, chain, targets, released)
+
+
+    async def _successor_chain_(self):
+        '''
+        Asynchronous counterpart of ChordNode._successor_chain_().
+        '''
+        chain, ip_addr = list(), self.successor
+        while self._chain_step_(chain, ip_addr):
+            ip_addr = (await self.__establish_comm__(ip_addr).get_successor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty())).ip_addr
+        return chain
+
+
+    async def _maintain_(self, task, period: float) -> None:
+        '''
+        Asynchronous counterpart of ChordNode._maintain_(), run as a task on the event loop.
+        '''
+        while True:
+            await asyncio.sleep(period)
+            if self.successor is None:
+                continue
+            try:
+                await task()
+            except grpc.RpcError as e:
+                self.logger.warning(f"Maintenance task {task.__name__} failed: {e}")
+            except Exception as e:
+                self.logger.error(f"Error occured during maintenance task {task.__name__}: {e}")
+
+
+    notify = _inline_(ChordNode.notify)
+    install_routing_state = _inline_(ChordNode.install_routing_state)
+    closest_preceding_finger = _inline_(ChordNode.closest_preceding_finger)
+    get_successor = _inline_(ChordNode.get_successor)
+    get_predecessor = _inline_(ChordNode.get_predecessor)
+    set_successor = _inline_(ChordNode.set_successor)
+    set_predecessor = _inline_(ChordNode.set_predecessor)
+    get_finger_table = _inline_(ChordNode.get_finger_table)
+    clear_hops = _inline_(ChordNode.clear_hops)
+    get_trace = _inline_(ChordNode.get_trace)
+    get_cache_stats = _inline_(ChordNode.get_cache_stats)
+
+    request_data = _offloaded_(ChordNode.request_data)
+    ack_data = _offloaded_(ChordNode.ack_data)
+    stream_data = _streamed_(ChordNode.stream_data)
+    release_shards = _offloaded_(ChordNode.release_shards)
+    pull_shards = _streamed_(ChordNode.pull_shards)
+    replicate = _offloaded_(ChordNode.replicate)
+    invalidate_replica = _inline_(ChordNode.invalidate_replica)
+    release_replica = _offloaded_(ChordNode.release_replica)
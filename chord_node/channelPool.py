@@ -0,0 +1,341 @@
+import asyncio
+import grpc
+import logging
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import monotonic
+
+
+KEEPALIVE_OPTIONS = [
+    ("grpc.keepalive_time_ms", 60000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+# server side counterpart of KEEPALIVE_OPTIONS, accepting the pings of pooled channels
+SERVER_KEEPALIVE_OPTIONS = [
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.min_recv_ping_interval_without_data_ms", 30000),
+    ("grpc.http2.max_ping_strikes", 0),
+]
+
+
+class CallCounter:
+    '''
+    The number of calls issued through a pool within a ChannelPool.counting() block.
+    '''
+
+    def __init__(self):
+        self.calls = 0
+
+
+# the counter of the calls of the current context, shared with the threads and the tasks it spawns along with the context
+_counter = ContextVar("call_counter", default = None)
+
+
+class PooledChannel:
+    '''
+    A pooled channel to one peer, together with the stubs created on it.
+
+    Attributes:
+        ip_addr(str): The IP address of the peer.
+        channel(grpc.Channel): The channel to the peer.
+        stubs(dict): The stubs created on the channel, keyed by stub class.
+        last_used(float): The monotonic time of the last checkout.
+        in_flight(int): The number of calls currently using the channel.
+        retired(bool): Whether the channel has left the pool and must be closed once idle.
+
+    '''
+
+    def __init__(self, ip_addr, channel):
+        self.ip_addr = ip_addr
+        self.channel = channel
+        self.stubs = dict()
+        self.last_used = monotonic()
+        self.in_flight = 0
+        self.retired = False
+
+    def stub(self, stub_class):
+        if stub_class not in self.stubs:
+            self.stubs[stub_class] = stub_class(self.channel)
+        return self.stubs[stub_class]
+
+
+class PooledStub:
+    '''
+    A stub bound to a peer address rather than to a channel.
+
+    Every call checks the current channel to the peer out of the pool, so a stub stays valid
+    when its channel is evicted. Calls failing with UNAVAILABLE evict the channel, and the next
+    call reconnects. A call streaming its responses holds the channel until it terminates.
+
+    '''
+
+    def __init__(self, pool, ip_addr, stub_class):
+        self._pool = pool
+        self._ip_addr = ip_addr
+        self._stub_class = stub_class
+
+    def __getattr__(self, method):
+
+        def call(*args, **kwargs):
+            entry = self._pool._checkout(self._ip_addr)
+            streaming = False
+            try:
+                response = getattr(entry.stub(self._stub_class), method)(*args, **kwargs)
+                if isinstance(response, Iterator):
+                    # released once the call terminates, consumed or not: an abandoned call is cancelled when collected
+                    streaming = True
+                    response.add_done_callback(lambda done: self._done_(entry, done))
+                return response
+            except grpc.RpcError as e:
+                if e.code() == grpc.StatusCode.UNAVAILABLE:
+                    self._pool._retire(entry)
+                raise
+            finally:
+                if not streaming:
+                    self._pool._release(entry)
+
+        return call
+
+    def _done_(self, entry, call):
+        if call.code() == grpc.StatusCode.UNAVAILABLE:
+            self._pool._retire(entry)
+        self._pool._release(entry)
+
+
+class ChannelPool:
+    '''
+    Thread-safe pool of gRPC channels, keyed by peer IP address.
+
+    Channels are kept open with keepalive pings and reused across calls. The pool holds at most max_size
+    channels: opening one more evicts the least recently used channel. Channels unused for longer than
+    idle_timeout seconds are evicted as well. An evicted channel is closed once its in-flight calls complete.
+
+    Attributes:
+        port(int): The port the peers serve on.
+        max_size(int): The maximum number of pooled channels.
+        idle_timeout(float): The number of seconds after which an unused channel is evicted.
+        options(list): The channel arguments of the pooled channels.
+        calls(int): The number of calls issued through the pool.
+
+    Note:
+      calls counts the calls of every thread of the process. The calls of one operation are counted
+      with counting(), e.g. the ones of a join while the maintenance tasks of the node keep calling other nodes.
+
+    '''
+
+    stub_type = PooledStub
+
+    def __init__(self, port = 50051, max_size = 64, idle_timeout = 300.0, options = KEEPALIVE_OPTIONS):
+        self.port = port
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.options = options
+        self.channels = OrderedDict()
+        self.calls = 0
+        self.lock = Lock()
+        self.logger = logging.getLogger(__name__)
+
+
+    def stub(self, ip_addr: str, stub_class) -> PooledStub:
+        '''
+        stub
+        ====
+
+        Returns a stub of the given class for the peer at ip_addr, backed by the pooled channel to that peer.
+
+        '''
+        return self.stub_type(self, str(ip_addr), stub_class)
+
+
+    @contextmanager
+    def counting(self):
+        '''
+        counting
+        ========
+
+        Counts the calls issued through the pool by the body, and by the threads and the tasks it runs in a copy of its context.
+
+        Yields:
+            CallCounter: The counter of the calls of the body.
+
+        '''
+        counter = CallCounter()
+        token = _counter.set(counter)
+        try:
+            yield counter
+        finally:
+            _counter.reset(token)
+
+
+    def evict(self, ip_addr: str) -> None:
+        '''
+        Removes the channel to ip_addr from the pool, e.g. when the peer has left the network.
+        '''
+        with self.lock:
+            entry = self.channels.get(str(ip_addr))
+        if entry is not None:
+            self._retire(entry)
+
+
+    def ready(self, ip_addr: str, timeout: float = None) -> bool:
+        '''
+        Waits until the channel to ip_addr is connected, e.g. until a freshly started peer serves requests.
+
+        Returns:
+            bool: True if the peer became reachable within timeout seconds, False otherwise.
+        '''
+        entry = self._checkout(str(ip_addr))
+        try:
+            grpc.channel_ready_future(entry.channel).result(timeout = timeout)
+            return True
+        except grpc.FutureTimeoutError:
+            return False
+        finally:
+            self._release(entry)
+
+
+    def close(self) -> None:
+        '''
+        Evicts every channel of the pool.
+        '''
+        with self.lock:
+            entries = list(self.channels.values())
+        for entry in entries:
+            self._retire(entry)
+
+
+    def _checkout(self, ip_addr: str) -> PooledChannel:
+        stale = list()
+        with self.lock:
+            now = monotonic()
+            entry = self.channels.get(ip_addr)
+            if entry is None:
+                entry = PooledChannel(ip_addr, self._open_(ip_addr))
+                self.channels[ip_addr] = entry
+            self.channels.move_to_end(ip_addr)
+            entry.last_used = now
+            entry.in_flight += 1
+            self.calls += 1
+            counter = _counter.get()
+            if counter is not None:
+                counter.calls += 1
+
+            for other in self.channels.values():
+                if now - other.last_used <= self.idle_timeout:
+                    break # the channels are ordered by last use
+                stale.append(other)
+            overflow = len(self.channels) - len(stale) - self.max_size
+            if overflow > 0:
+                stale.extend(list(self.channels.values())[len(stale):len(stale) + overflow])
+
+        for other in stale:
+            self.logger.debug(f"Evicting channel to {other.ip_addr}.")
+            self._retire(other)
+        return entry
+
+
+    def _release(self, entry: PooledChannel) -> None:
+        with self.lock:
+            entry.in_flight -= 1
+            close = entry.retired and entry.in_flight == 0
+        if close:
+            self._close_(entry)
+
+
+    def _retire(self, entry: PooledChannel) -> None:
+        with self.lock:
+            if entry.retired:
+                return
+            entry.retired = True
+            if self.channels.get(entry.ip_addr) is entry:
+                del self.channels[entry.ip_addr]
+            close = entry.in_flight == 0
+        if close:
+            self._close_(entry)
+
+
+    def _open_(self, ip_addr: str):
+        return grpc.insecure_channel(f"{ip_addr}:{self.port}", options = self.options)
+
+
+    def _close_(self, entry: PooledChannel) -> None:
+        entry.channel.close()
+
+
+class AioPooledStub(PooledStub):
+    '''
+    The asyncio counterpart of PooledStub: every unary call is a coroutine awaiting a grpc.aio stub,
+    and every call streaming its responses an asynchronous iterator over them. The status of a grpc.aio call
+    is a coroutine, so a terminated streaming call is released by a task awaiting it.
+    '''
+
+    def __getattr__(self, method):
+
+        def call(*args, **kwargs):
+            entry = self._pool._checkout(self._ip_addr)
+            try:
+                response = getattr(entry.stub(self._stub_class), method)(*args, **kwargs)
+            except BaseException:
+                self._pool._release(entry)
+                raise
+            if hasattr(response, "__aiter__"):
+                response.add_done_callback(lambda done: self._done_(entry, done))
+                return response
+            return self._unary_(entry, response)
+
+        return call
+
+    async def _unary_(self, entry, response):
+        try:
+            return await response
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.UNAVAILABLE:
+                self._pool._retire(entry)
+            raise
+        finally:
+            self._pool._release(entry)
+
+    def _done_(self, entry, call):
+        task = asyncio.get_running_loop().create_task(self._finished_(entry, call))
+        self._pool.releasing.add(task) # keeps the task alive until the channel is released
+        task.add_done_callback(self._pool.releasing.discard)
+
+    async def _finished_(self, entry, call):
+        try:
+            if await call.code() == grpc.StatusCode.UNAVAILABLE:
+                self._pool._retire(entry)
+        finally:
+            self._pool._release(entry)
+
+
+class AioChannelPool(ChannelPool):
+    '''
+    Pool of grpc.aio channels, used by the asyncio node server.
+
+    The eviction policy is the one of ChannelPool. Channels must be opened on the event loop that uses them,
+    and closing a channel is a coroutine, so evicted channels are closed by tasks scheduled on the running loop.
+
+    '''
+
+    stub_type = AioPooledStub
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.closing = set()
+        self.releasing = set()
+
+
+    def _open_(self, ip_addr: str):
+        return grpc.aio.insecure_channel(f"{ip_addr}:{self.port}", options = self.options)
+
+
+    def _close_(self, entry: PooledChannel) -> None:
+        task = asyncio.get_running_loop().create_task(entry.channel.close())
+        self.closing.add(task) # keeps the task alive until the channel is closed
+        task.add_done_callback(self.closing.discard)
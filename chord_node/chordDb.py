@@ -1,29 +1,51 @@
 import sqlite3
 import os
 import logging
-from typing import List, Dict
+from concurrent.futures import Future
+from queue import Queue, Empty
+from threading import Thread, Lock, local
+from urllib.parse import quote
+from typing import List, Dict, Tuple
+from chordRing import ChordRing
+from tracer import Tracer, DEBUG
+from storageEngine import StorageEngine
 from subprocess import (
     run, 
     CalledProcessError
 )
 
 
-class chordDb:
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+SCHEMA_VERSION = 4
+
+
+class chordDb(StorageEngine):
     '''
     Database management for each Chord node.
 
     This class handles the initialization and connection of the SQLite database used by each Chord node.
     It verifies the existence of a previous database -its name based on the node's hostname- and either 
     connects to it or creates a new one if none is found.
+    
+    Reads(fetch_data) run on a read-only connection of the calling thread, opened on its first query. 
+    Writes(store_data, fetch_and_delete_data) are queued to a single writer thread owning the only 
+    writable connection, which commits the store requests queued meanwhile as one transaction.
 
     Attributes:
         db_name(str): The name of the database file.
-        connection(sqlite3.Connection): The SQLite database connection.
-        cursor(sqlite3.Cursor): The SQLite database cursor.
+        connection(sqlite3.Connection): The writable SQLite database connection, used by the writer thread only.
+        cursor(sqlite3.Cursor): The cursor of the writable connection.
+        writes(Queue): The write requests awaiting the writer thread, as (operation, argument, Future) tasks.
+        group_commit(int): The maximum number of store requests committed together(DB_GROUP_COMMIT).
+        tracer(Tracer): The tracer recording the database events, usually the one of the node.
+        synchronous(str): The 'synchronous' level of the connections(DB_SYNCHRONOUS: OFF, NORMAL, FULL or EXTRA).
+        cache_size(int): The page cache of a connection, in KiB(DB_CACHE_SIZE).
+        defer_indexes(int): The number of records from which store_data() drops the indexes of the table during 
+        the load and rebuilds them after it(DB_DEFER_INDEXES, 0 never defers).
     
     '''
     
-    def __init__(self):
+    def __init__(self, tracer = None, db_name = None):
         '''
         __init__ 
         ========
@@ -40,24 +62,43 @@ class chordDb:
             connection(sqlite3.Connection): The SQLite database connection.
             cursor(sqlite3.Cursor): The SQLite database cursor.
 
+        Args:
+            tracer(Tracer): The tracer recording the database events. A tracer configured through the 
+            TRACE_* environment variables is created if none is given.
+            db_name(str): The name of the database file, e.g. of a shard(see shardedDb). It defaults to 
+            one named after the node's hostname.
+
         Raises:
             sqlite3.Error: If there is an error during the database connection.
+            ValueError: If DB_SYNCHRONOUS isn't a 'synchronous' level of SQLite.
 
         '''
-        logging.basicConfig(level = logging.DEBUG)
+        logging.basicConfig(level = os.environ.get("LOG_LEVEL", "INFO").upper())
         self.logger = logging.getLogger(__name__)
+        self.tracer = tracer if tracer is not None else Tracer.from_env()
+        self.synchronous = os.environ.get("DB_SYNCHRONOUS", "NORMAL").upper()
+        if self.synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Unknown DB_SYNCHRONOUS level '{self.synchronous}', expected one of {', '.join(SYNCHRONOUS_LEVELS)}.")
+        self.cache_size = int(os.environ.get("DB_CACHE_SIZE", 16384))
+        self.defer_indexes = int(os.environ.get("DB_DEFER_INDEXES", 100000))
+        self.group_commit = max(1, int(os.environ.get("DB_GROUP_COMMIT", 64)))
+        self.lock = Lock()
+        self.readers = local()
+        self.reader_connections = list()
+        self.generation = 0
+        self.connection = None
+        self.cursor = None
         try:
             
-            hostname = run("hostname -I", shell = True, capture_output = True, text = True).stdout.strip()
-            self.db_name = f"{hostname}_chord.db"
+            if db_name is None:
+                hostname = run("hostname -I", shell = True, capture_output = True, text = True).stdout.strip()
+                db_name = f"{hostname}_chord.db"
+            self.db_name = db_name
             if os.path.exists(os.path.join("./Data", self.db_name)):
                 self.logger.debug(f"Previous Db file found. Connecting to the database...")
-                self.connection = sqlite3.connect(os.path.join("./Data", self.db_name), check_same_thread = False)
-                self.cursor = self.connection.cursor()
+                self.write_disk()
             else:  
                 self.logger.debug(f"Previous Db file not found. Creating the database...")
-                self.connection = None
-                self.cursor = None
                 
             self.logger.debug(f"Successfully connected to the database.")
             
@@ -70,34 +111,460 @@ class chordDb:
         write_disk
         ==========
         
-        This method establishes a new connection to the corresponding SQLite database
-        and updates the 'connection' and 'cursor' attributes of the chordDb object
-        to point to the appropriate database.
+        This method opens the corresponding SQLite database, creating it if needed, and starts 
+        its writer thread. It does nothing if the database is already open.
             
         Returns:
             None
         '''
         
-        print(f"Entering write_disk method. Connecting to database...")
-        self.connection = sqlite3.connect(os.path.join("./Data", self.db_name), check_same_thread = False)
+        with self.lock:
+            if self.connection is not None:
+                return
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "write_disk", db_name = self.db_name)
+            self._connect_()
+            self.generation += 1
+            self.writes = Queue()
+            Thread(target = self._write_loop_, args = (self.writes,), name = "chordDb-writer", daemon = True).start()
+
+
+    def _connect_(self) -> None:
+        '''
+        Opens the connection to the database file, tunes it for bulk writes and prepares the schema.
+
+        Note:
+          The database is journaled in WAL mode, so readers don't block the writer and a commit appends to the log 
+          instead of rewriting pages. With the default synchronous = NORMAL a commit no longer waits for an fsync, 
+          at the risk of losing the latest transactions(not of corrupting the database) on a power loss.
+        '''
+        self.connection = sqlite3.connect(os.path.join("./Data", self.db_name), check_same_thread = False, isolation_level = None)
         self.cursor = self.connection.cursor()
+        self.cursor.execute("PRAGMA journal_mode = WAL")
+        self.cursor.execute(f"PRAGMA synchronous = {self.synchronous}")
+        self.cursor.execute(f"PRAGMA cache_size = {-abs(self.cache_size)}")
+        self.cursor.execute("PRAGMA temp_store = MEMORY")
+        self._create_table_()
+        self.token = self.cursor.execute("SELECT token FROM instance").fetchone()[0]
  
 
-    def store_data(self, data_records)-> bool: 
+    def _create_table_(self) -> None:
+        '''
+        _create_table_
+        ==============
+        
+        Creates the 'data_records' table if it doesn't exist and migrates it to SCHEMA_VERSION.
+        
+        Note:
+          Hash values span up to 256 bits, beyond the range of an SQLite INTEGER, so they are stored 
+          as fixed-width hex text(see ChordRing.key_repr) whose ordering matches the numeric one. 
+          The version of the schema is kept in the 'user_version' of the database file, so files 
+          written by earlier nodes are migrated step by step when opened(see _migrate_).
+        
+        Returns:
+          None
+        '''
+        
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        surname TEXT,
+        education TEXT,
+        awards INTEGER,
+        hash_value TEXT)
+        ''')
+        
+        version = self.cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            self._migrate_(version)
+    
+    
+    def _migrate_(self, version: int) -> None:
+        '''
+        _migrate_
+        =========
+        
+        Applies the schema migrations following the given version, each in its own transaction.
+        
+        Note:
+          Version 1 stores hash values as fixed-width hex text, converting in place tables created 
+          with an INTEGER 'hash_value' column. 
+          Version 2 adds an index on (education, awards) covering the columns fetch_data() returns, 
+          and an index on hash_value for the range scans of fetch_and_delete_data(). 
+          Version 3 adds the 'handoff_checkpoints' table, holding the last record id stored from each 
+          source of an unfinished chunked handoff(see store_data). 
+          Version 4 adds the 'instance' table, holding a random token telling this database apart from 
+          the ones created on the node before and after it, as record ids start over in a new database.
+        
+        Args:
+            version(int): The current schema version of the database.
+        
+        Returns:
+          None
+        '''
+        
+        if version < 1:
+            columns = {column[1]: column[2] for column in self.cursor.execute("PRAGMA table_info(data_records)")}
+            if columns.get("hash_value") == "INTEGER":
+                self.logger.debug(f"Converting integer hash values of the database to fixed-width hex...")
+                self.cursor.executescript(f'''
+                BEGIN;
+                ALTER TABLE data_records RENAME TO data_records_old;
+                CREATE TABLE data_records (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                surname TEXT,
+                education TEXT,
+                awards INTEGER,
+                hash_value TEXT);
+                INSERT INTO data_records (id, surname, education, awards, hash_value)
+                SELECT id, surname, education, awards, printf('%0{ChordRing.KEY_WIDTH}x', hash_value) FROM data_records_old;
+                DROP TABLE data_records_old;
+                PRAGMA user_version = 1;
+                COMMIT;
+                ''')
+        
+        if version < 2:
+            self.logger.debug(f"Indexing the database for queries and key handoffs...")
+            self.cursor.executescript('''
+            BEGIN;
+            CREATE INDEX IF NOT EXISTS data_records_education_awards ON data_records (education, awards, surname);
+            CREATE INDEX IF NOT EXISTS data_records_hash_value ON data_records (hash_value);
+            PRAGMA user_version = 2;
+            COMMIT;
+            ''')
+        
+        if version < 3:
+            self.cursor.executescript('''
+            BEGIN;
+            CREATE TABLE IF NOT EXISTS handoff_checkpoints (
+            source TEXT PRIMARY KEY,
+            last_id INTEGER);
+            PRAGMA user_version = 3;
+            COMMIT;
+            ''')
+        
+        if version < 4:
+            self.cursor.executescript('''
+            BEGIN;
+            CREATE TABLE IF NOT EXISTS instance (token TEXT);
+            INSERT INTO instance (token) VALUES (lower(hex(randomblob(8))));
+            PRAGMA user_version = 4;
+            COMMIT;
+            ''')
+    
+    
+    def _drop_indexes_(self) -> List[str]:
+        '''
+        Drops the indexes of the 'data_records' table, within the current transaction, and returns the statements recreating them.
+        '''
+        indexes = self.cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'data_records' AND sql IS NOT NULL").fetchall()
+        for name, _ in indexes:
+            self.cursor.execute(f'DROP INDEX "{name}"')
+        return [sql for _, sql in indexes]
+    
+    
+    def _reader_(self) -> sqlite3.Connection:
+        '''
+        Returns the read-only connection of the calling thread, opening it on the thread's first query 
+        and again after the database has been reopened.
+        '''
+        generation, connection = getattr(self.readers, "connection", (None, None))
+        if generation != self.generation:
+            with self.lock:
+                if self.connection is None:
+                    raise sqlite3.OperationalError("The database isn't open.")
+                connection = sqlite3.connect(f"file:{quote(os.path.join('./Data', self.db_name))}?mode=ro", 
+                                             uri = True, check_same_thread = False)
+                connection.execute(f"PRAGMA cache_size = {-abs(self.cache_size)}")
+                self.reader_connections.append(connection)
+                self.readers.connection = (self.generation, connection)
+        return connection
+    
+    
+    def _submit_(self, operation: str, argument) -> Future:
+        '''
+        Queues a write to the writer thread and returns the Future of its result.
+        '''
+        future = Future()
+        with self.lock:
+            if self.connection is None:
+                raise sqlite3.OperationalError("The database isn't open.")
+            self.writes.put((operation, argument, future))
+        return future
+    
+    
+    def _write_loop_(self, writes: Queue) -> None:
+        '''
+        _write_loop_
+        ============
+        
+        The loop of the writer thread, serving the queued writes in order until the database is closed.
+        
+        Note:
+          A store request is committed together with the store requests queued right behind it, up to 
+          group_commit of them, each within a savepoint so that a failing request is rolled back alone. 
+          The requests of a group are acknowledged once their common commit has succeeded.
+        '''
+        pending = None
+        while True:
+            task = pending if pending is not None else writes.get()
+            pending = None
+            if task[0] == "extract":
+                if self._extract_(*task[1:]):
+                    break
+                continue
+            if task[0] != "store":
+                getattr(self, f"_{task[0]}_")(*task[1:]) # acknowledge, export, merge
+                continue
+            
+            group = [task]
+            while len(group) < self.group_commit:
+                try:
+                    task = writes.get_nowait()
+                except Empty:
+                    break
+                if task[0] != "store":
+                    pending = task
+                    break
+                group.append(task)
+            self._store_group_(group)
+        
+        while not writes.empty(): # the writes queued before the database was closed
+            writes.get_nowait()[2].set_exception(sqlite3.OperationalError("The database has been closed."))
+    
+    
+    def _store_group_(self, group: List[tuple]) -> None:
+        '''
+        Inserts the records of a group of store requests within one transaction and resolves their Futures.
+        '''
+        results = []
+        try:
+            self.cursor.execute("BEGIN")
+            for _, (data_records, source, last), _ in group:
+                self.cursor.execute("SAVEPOINT store_request")
+                try:
+                    self._insert_(data_records, source, last)
+                    self.cursor.execute("RELEASE store_request")
+                    results.append(True)
+                except Exception as error:
+                    self.logger.error(f"Error while storing data: {error}")
+                    self.cursor.execute("ROLLBACK TO store_request")
+                    self.cursor.execute("RELEASE store_request")
+                    results.append(False)
+            self.cursor.execute("COMMIT")
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "group_commit", requests = len(group), records = sum(len(task[1][0]) for task in group))
+        except sqlite3.Error as error:
+            self.logger.error(f"Error while committing data: {error}")
+            if self.connection.in_transaction:
+                self.cursor.execute("ROLLBACK")
+            results = [False] * len(group)
+        for (_, _, future), result in zip(group, results):
+            future.set_result(result)
+    
+    
+    def _insert_(self, data_records: List[Dict[str, any]], source: str = None, last: bool = False) -> int:
+        '''
+        Inserts data records within the current transaction and returns the number of rebuilt indexes.
+        The records of a chunked handoff from source skip the ones stored already and advance its checkpoint.
+        '''
+        if source is not None:
+            checkpoint = self.cursor.execute("SELECT last_id FROM handoff_checkpoints WHERE source = ?", (source,)).fetchone()
+            data_records = [record for record in data_records if record['Id'] > (checkpoint[0] if checkpoint else 0)]
+            if last:
+                self.cursor.execute("DELETE FROM handoff_checkpoints WHERE source = ?", (source,))
+            elif data_records:
+                self.cursor.execute("INSERT OR REPLACE INTO handoff_checkpoints (source, last_id) VALUES (?, ?)", (source, data_records[-1]['Id']))
+        
+        indexes = self._drop_indexes_() if 0 < self.defer_indexes <= len(data_records) else []
+        self.cursor.executemany("INSERT INTO data_records (surname, education, awards, hash_value) VALUES (?, ?, ?, ?)",
+                                ((record['Surname'], record['Education'], record['Awards'], ChordRing.key_repr(record['Hash'])) 
+                                 for record in data_records))
+        for index in indexes:
+            self.cursor.execute(index)
+        return len(indexes)
+    
+    
+    def _extract_(self, key_range, future: Future) -> bool:
+        '''
+        _extract_
+        =========
+        
+        Fetches and deletes the records of a handoff on the writer thread, resolving future with them.
+        
+        Args:
+            key_range(Tuple[int, int]): The ring interval (start, end] of the hash values handed over, None for all of them.
+            future(Future): The Future of the handoff.
+        
+        Returns:
+            bool: True if the database has been closed and deleted(key_range is None), False otherwise.
+        '''
+        try:
+            if key_range is None: # eq the node leaves
+                self.cursor.execute("SELECT surname, education, awards, hash_value FROM data_records")
+            else:
+                condition, arguments = self._range_condition_(key_range)
+                self.cursor.execute("BEGIN")
+                self.cursor.execute("SELECT surname, education, awards, hash_value FROM data_records where " + condition, arguments)
+            columns = [column[0] for column in self.cursor.description]
+            data = [self._decode_(dict(zip(columns, row))) for row in self.cursor.fetchall()]
+            self.logger.debug(f"Successfully fetched data from the database.")
+            
+            if key_range is not None:
+                self.cursor.execute("DELETE FROM data_records where " + condition, arguments)
+                self.cursor.execute("COMMIT")
+                future.set_result(data)
+                return False
+        except Exception as error:
+            if self.connection.in_transaction:
+                self.cursor.execute("ROLLBACK")
+            future.set_exception(error)
+            return False
+        
+        self._close_()
+        future.set_result(data)
+        return True
+    
+    
+    def _acknowledge_(self, handoff: tuple, future: Future) -> None:
+        '''
+        Deletes the records of a chunked handoff acknowledged by the receiver, resolving future with their number.
+        '''
+        key_range, upto = handoff
+        try:
+            if key_range is None:
+                self.cursor.execute("DELETE FROM data_records where id <= ?", (upto,))
+            else:
+                condition, arguments = self._range_condition_(key_range)
+                self.cursor.execute("DELETE FROM data_records where id <= ? and " + condition, (upto,) + arguments)
+            future.set_result(self.cursor.rowcount)
+        except Exception as error:
+            future.set_exception(error)
+    
+    
+    def _export_(self, export: tuple, future: Future) -> None:
+        '''
+        Copies the records of a file handoff to a new database file, resolving future with the id of the last one.
+        '''
+        path, key_range = export
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+            condition, arguments = ("", ()) if key_range is None else self._range_condition_(key_range)
+            condition = condition and " where " + condition
+            upto = self.cursor.execute("SELECT max(id) FROM data_records" + condition, arguments).fetchone()[0] or 0
+            self.cursor.execute("ATTACH DATABASE ? AS export", (path,))
+            try:
+                self.cursor.execute("CREATE TABLE export.data_records AS SELECT id, surname, education, awards, hash_value FROM main.data_records" 
+                                    + (condition or " where 1") + " and id <= ?", arguments + (upto,))
+            finally:
+                self.cursor.execute("DETACH DATABASE export")
+            future.set_result(upto)
+        except Exception as error:
+            future.set_exception(error)
+    
+    
+    def _merge_(self, merge: tuple, future: Future) -> None:
+        '''
+        Inserts the records of a database file handed over by source and deletes the file, resolving future with their number.
+        '''
+        path, source = merge
+        try:
+            self.cursor.execute("ATTACH DATABASE ? AS incoming", (path,))
+            try:
+                self.cursor.execute("BEGIN")
+                checkpoint = self.cursor.execute("SELECT last_id FROM main.handoff_checkpoints WHERE source = ?", (source,)).fetchone()
+                checkpoint = checkpoint[0] if checkpoint else 0
+                self.cursor.execute("INSERT INTO main.data_records (surname, education, awards, hash_value) "
+                                    "SELECT surname, education, awards, hash_value FROM incoming.data_records where id > ? ORDER BY id", (checkpoint,))
+                merged = self.cursor.rowcount
+                upto = self.cursor.execute("SELECT max(id) FROM incoming.data_records").fetchone()[0] or 0
+                self.cursor.execute("INSERT OR REPLACE INTO main.handoff_checkpoints (source, last_id) VALUES (?, ?)", (source, max(upto, checkpoint)))
+                self.cursor.execute("COMMIT")
+            except Exception:
+                if self.connection.in_transaction:
+                    self.cursor.execute("ROLLBACK")
+                raise
+            finally:
+                self.cursor.execute("DETACH DATABASE incoming")
+            os.remove(path)
+            future.set_result(merged)
+        except Exception as error:
+            future.set_exception(error)
+    
+    
+    @staticmethod
+    def _range_condition_(key_range, column = "hash_value") -> Tuple[str, tuple]:
+        '''
+        Returns the condition selecting the hash values of column lying in the ring interval (start, end] of key_range, 
+        wrapping around zero if start > end(see ChordRing.in_range), and its arguments.
+        '''
+        start, end = map(ChordRing.key_repr, key_range)
+        if start <= end:
+            return f"({column} > ? and {column} <= ?)", (start, end)
+        return f"({column} > ? or {column} <= ?)", (start, end)
+    
+    
+    def _close_(self) -> None:
+        '''
+        Closes the connections to the database and deletes its files.
+        '''
+        with self.lock:
+            for connection in self.reader_connections:
+                connection.close()
+            self.reader_connections.clear()
+            self.generation += 1
+            self.connection.close() # checkpoints the write-ahead log
+            self.connection = None
+            self.cursor = None
+        
+        path = os.path.join('./Data', self.db_name)
+        result = run(f"rm -f '{path}' '{path}-wal' '{path}-shm'", 
+                     shell = True, 
+                     capture_output = True, 
+                     text = True)
+
+        if result.returncode == 0: 
+            self.logger.debug(f"Successfully deleted database before leave.")
+        else:
+            self.logger.error(f"Error occurred on deletion of databse with code: {result.returncode}")
+            self.logger.error(f"Error: {result.stderr}")
+    
+    
+    def _decode_(self, record: Dict[str, any]) -> Dict[str, any]:
+        '''
+        Converts the stored hex representation of a record's hash value back to an integer.
+        '''
+        record['hash_value'] = ChordRing.key_value(record['hash_value'])
+        return record
+    
+    
+    def store_data(self, data_records, source = None, last = False)-> bool: 
         '''
         store_data
         ==========
         
         Stores data records in the SQLite database.
 
-        This method creates a table named 'data_records' in the database if it doesn't exist.
-        It then inserts the provided data records into the table.
+        This method inserts the provided data records into the 'data_records' table, prepared when the 
+        connection was opened, with a single executemany(). The insertion is queued to the writer thread,
+        which commits it together with the concurrent store requests, and the method returns once it's committed.
         If the 'data_records' list is empty, a warning is logged, and the method returns True 
         storing naturally nothing in the database.
         
+        Loads of at least DB_DEFER_INDEXES records drop the indexes of the table first and rebuild them 
+        once the records are in, which is cheaper than updating them row by row.
+        
+        The chunks of a handoff(see fetch_chunk) are stored along with a checkpoint, the last record id 
+        of the source stored, in the same transaction. Records up to the checkpoint are skipped, so a chunk 
+        sent again after an interruption is stored once. The last chunk removes the checkpoint.
+        
         Args:
             data_records (list): A list of dictionaries representing data records.
                                  Each dictionary should have keys: 'Surname', 'Education', 'Awards', and 'Hash'.
+            source (str, optional): The node handing the records over in chunks, in which case records also have 
+                                    the key 'Id', their ascending id in the database of source. Default is None.
+            last (bool, optional): Whether this is the last chunk of the handoff from source. Default is False.
         
         Raises:
             sqlite3.Error: If there is an error during the database transaction.
@@ -108,31 +575,20 @@ class chordDb:
 
         '''
 
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS data_records (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        surname TEXT,
-        education TEXT,
-        awards INTEGER,
-        hash_value INTEGER)
-        ''')
-        
-        if len(data_records) == 0:
+        if len(data_records) == 0 and source is None:
             self.logger.warning(f"No data to store in the database.")
             return True
         
         try:
           
-          for record in data_records:
-            self.cursor.execute("INSERT INTO data_records (surname, education, awards, hash_value) VALUES (?, ?, ?, ?)",\
-                              (record['Surname'], record['Education'], record['Awards'], record['Hash']))
-
-          self.connection.commit()
-          self.logger.debug(f"Successfully stored data in the database.")
-          return True
+          if self._submit_("store", (data_records, source, last)).result():
+            if self.tracer.debug:
+              self.tracer.event(DEBUG, "store_data", records = len(data_records))
+            self.logger.debug(f"Successfully stored data in the database.")
+            return True
+          return False
         except sqlite3.Error as error:
             self.logger.error(f"Error while storing data: {error}")
-            self.connection.rollback() # rollbacks the transaction if an error occurs.
             return False
         except Exception as e:
             self.logger.error(f"Error while storing data: {e}")
@@ -148,7 +604,8 @@ class chordDb:
 
         This method retrieves records from the 'data_records' table in the SQLite database
         where the 'university' column matches the specified university and the 'awards' column
-        is equal to or greater than the provided awards threshold.
+        is equal to or greater than the provided awards threshold. The query runs on the read-only 
+        connection of the calling thread, concurrently with the queries of other threads and the writer.
 
         Args:
             education(str): The university to filter the records.
@@ -164,10 +621,11 @@ class chordDb:
         '''
         
         try:
-            print(f"Fetching data from database...")
-            self.cursor.execute("SELECT surname, education, awards FROM data_records where education = ? and awards >= ?", (education, awards_threshold,))
-            columns = [column[0] for column in self.cursor.description]
-            data = [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "fetch_data", education = education, awards_threshold = awards_threshold)
+            cursor = self._reader_().execute("SELECT surname, education, awards FROM data_records where education = ? and awards >= ?", (education, awards_threshold,))
+            columns = [column[0] for column in cursor.description]
+            data = [dict(zip(columns, row)) for row in cursor.fetchall()]
             self.logger.debug(f"Successfully fetched data from the database.")
             return data
 
@@ -176,20 +634,22 @@ class chordDb:
             return []
     
     
-    def fetch_and_delete_data(self, threshold = None)-> List[Dict[str, any]]: #threshold is eq to the joining node hash value
+    def fetch_and_delete_data(self, key_range = None)-> List[Dict[str, any]]: #key_range is eq to the range of the joining node
         '''
         fetch_and_delete_data
         =====================
         
-        Fetches and deletes data from the SQLite database based on a specified threshold.
+        Fetches and deletes data from the SQLite database based on a specified range of hash values.
 
         This method retrieves records from the 'data_records' table in the SQLite database
-        based on the provided threshold. If the threshold parameter is None, it fetches and deletes all records
-        hold in the corresponding node's database. In all other case, the method fetches and deletes records 
-        having 'hash_value' less than or equal to the threshold.
+        based on the provided range. If the key_range parameter is None, it fetches and deletes all records
+        hold in the corresponding node's database, and deletes the database itself. In all other case, the method 
+        fetches and deletes records having a 'hash_value' in the ring interval (start, end] of key_range, within one transaction. 
+        Both run on the writer thread, after the writes queued before them.
 
         Args:
-            threshold (int, optional): The hash value threshold. Default is None.
+            key_range (Tuple[int, int], optional): The (start, end] ring interval of the hash values, e.g. the 
+                                                   (predecessor, node] range of a joining node. Default is None.
         
          Raises:
             sqlite3.Error: If there is an error during the database query or deletion.
@@ -200,52 +660,137 @@ class chordDb:
         
         '''
         
-        if threshold is None: # eq the node leaves
-            try:
-                print(f"Fetching data from database...")
-                self.cursor.execute("SELECT surname, education, awards, hash_value FROM data_records")
-                columns = [column[0] for column in self.cursor.description]
-                data = [dict(zip(columns, row)) for row in self.cursor.fetchall()]
-                self.logger.debug(f"Successfully fetched data from the database.")
-                
-                result = run(f"rm {os.path.join('./Data', self.db_name)}", 
-                             shell = True, 
-                             capture_output = True, 
-                             text = True)
-
-                if result.returncode == 0: 
-                    self.logger.debug(f"Successfully deleted database before leave.")
-                else:
-                    self.logger.error(f"Error occurred on deletion of databse with code: {result.returncode}")
-                    self.logger.error(f"Error: {result.stderr}")
-
-                return data
-
-            except sqlite3.Error as error:
-                self.logger.error(f"Error while fetching and deleting data: {error}")
-                self.connection.rollback()
-                return []
-            except Exception as e:
-                self.logger.error(f"Error while fetching and deleting data: {e}")
-                return []
-        else: # eq a new node joins(new predecessor of current node)
-            try:
-                print(f"Fetching data from database...")
-                self.cursor.execute("SELECT surname, education, awards, hash_value FROM data_records where hash_value <= ?", (threshold,))
-                columns = [column[0] for column in self.cursor.description]
-                data = [dict(zip(columns, row)) for row in self.cursor.fetchall()]
-                self.logger.debug(f"Successfully fetched data from the database.")
-                
-                try:
-                    self.cursor.execute("DELETE FROM data_records where hash_value <= ?", (threshold,))
-                    self.connection.commit()
-                except sqlite3.Error as error:
-                    self.logger.error(f"Error while deleting data: {error}")
-                    self.connection.rollback()
-                return data
-
-            except sqlite3.Error as error:
-                self.logger.error(f"Error while fetching and deleting data: {error}")
-                return [] 
-    
-       
\ No newline at end of file
+        try:
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "fetch_and_delete_data", key_range = key_range)
+            return self._submit_("extract", key_range).result()
+        
+        except sqlite3.Error as error:
+            self.logger.error(f"Error while fetching and deleting data: {error}")
+            return []
+        except Exception as e:
+            self.logger.error(f"Error while fetching and deleting data: {e}")
+            return []
+    
+    
+    def fetch_chunk(self, key_range = None, after = 0, limit = 1000)-> List[Dict[str, any]]:
+        '''
+        fetch_chunk
+        ===========
+        
+        Fetches the next chunk of a handoff, without deleting it.
+
+        This method retrieves, in the order of their ids, up to limit records with an id greater than after, 
+        and a 'hash_value' in the ring interval key_range unless it's None. A handoff reads its chunks 
+        one after the other, passing the id of the last record read as after, and deletes them only once the 
+        receiver has acknowledged them(see acknowledge). Each chunk is a query of its own, so no read 
+        transaction is held open across the handoff and records stored meanwhile are handed over as well.
+
+        Args:
+            key_range (Tuple[int, int], optional): The (start, end] ring interval of the hash values. Default is None.
+            after (int, optional): The id of the last record already read. Default is 0.
+            limit (int, optional): The maximum number of records fetched. Default is 1000.
+        
+        Raises:
+            sqlite3.Error: If there is an error during the database query.
+
+        Returns:
+            List[Dict[str, any]]: A list of dictionaries representing the fetched data records, along with their 'id'.
+                                  An empty list is returned once the handoff is complete.
+        
+        '''
+        
+        # the unary + keeps the query on the rowid, walking the table once across all the chunks of a handoff
+        query = "SELECT id, surname, education, awards, hash_value FROM data_records where id > ?"
+        arguments = (after,)
+        if key_range is not None:
+            condition, bounds = self._range_condition_(key_range, "+hash_value")
+            query += " and " + condition
+            arguments += bounds
+        cursor = self._reader_().execute(query + " ORDER BY id LIMIT ?", arguments + (limit,))
+        columns = [column[0] for column in cursor.description]
+        return [self._decode_(dict(zip(columns, row))) for row in cursor.fetchall()]
+    
+    
+    def acknowledge(self, key_range = None, upto = 0)-> int:
+        '''
+        acknowledge
+        ===========
+        
+        Deletes the records of a handoff acknowledged by the receiver, i.e. the records with an id up to upto 
+        and a 'hash_value' in the ring interval key_range, unless it's None.
+
+        Raises:
+            sqlite3.Error: If there is an error during the deletion.
+
+        Returns:
+            int: The number of deleted records.
+        
+        '''
+        
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "acknowledge", key_range = key_range, upto = upto)
+        return self._submit_("acknowledge", (key_range, upto)).result()
+    
+    
+    def checkpoint(self, source)-> int:
+        '''
+        Returns the last record id stored from source by an unfinished handoff, 0 if there's none.
+        '''
+        row = self._reader_().execute("SELECT last_id FROM handoff_checkpoints WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else 0
+    
+    
+    def export(self, path, key_range = None)-> int:
+        '''
+        export
+        ======
+        
+        Copies the records with a 'hash_value' in the ring interval key_range(all if None) to a new 
+        database file, whose bytes are handed over instead of the records(see shardedDb).
+
+        The copy holds the records stored up to the export, with their ids. They stay in the database until 
+        the receiver has merged the file and they're acknowledged(see acknowledge). 
+
+        Args:
+            path (str): The path of the new database file, replaced if it exists.
+            key_range (Tuple[int, int], optional): The (start, end] ring interval of the hash values. Default is None.
+        
+        Raises:
+            sqlite3.Error: If there is an error during the copy.
+
+        Returns:
+            int: The id of the last record copied, 0 if there's none.
+        
+        '''
+        
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "export", path = path, key_range = key_range)
+        return self._submit_("export", (path, key_range)).result()
+    
+    
+    def merge(self, path, source)-> int:
+        '''
+        merge
+        =====
+        
+        Inserts the records of a database file created by export() on another node, and deletes the file.
+
+        The id of the last record of the file is kept as the checkpoint of source in the same transaction, and records 
+        up to the checkpoint are skipped, so a file handed over again after an interruption is merged once.
+
+        Args:
+            path (str): The path of the database file.
+            source (str): The exporting database, as the address of its node and its token.
+        
+        Raises:
+            sqlite3.Error: If there is an error during the insertion.
+
+        Returns:
+            int: The number of merged records.
+        
+        '''
+        
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "merge", path = path, source = source)
+        return self._submit_("merge", (path, source)).result()
@@ -1,8 +1,10 @@
 from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 import grpc
 
 from generatedStubs.chordprot_pb2 import (
     JoinRequest,
+    JoinResponse,
     SuccessorRequest,
     SuccessorResponse,
     setPredecessorRequest,
@@ -15,26 +17,57 @@ from generatedStubs.chordprot_pb2 import (
     FingerTableResponse,
     FingerTableRecord,
     HopsResponse,
-    CompScientistData
+    CompScientistData,
+    ClosestFingerResponse,
+    SuccessorsRequest,
+    SuccessorsResponse,
+    KeyOwner,
+    KeyGroup,
+    RoutingState,
+    FingerUpdatesRequest,
+    TraceRequest,
+    TraceResponse,
+    TraceEvent,
+    HandoffRequest,
+    DataChunk,
+    HandoffAck,
+    ShardRequest,
+    ShardChunk,
+    ShardRelease,
+    CacheStats,
+    KeyReplica,
+    ReplicaInvalidation,
+    ReplicaChunk,
+    ReplicaRelease
 ) 
  
 import generatedStubs.chordprot_pb2_grpc as chordprot_pb2_grpc
-from dataclasses import dataclass, field
-from typing import List,Tuple
+from dataclasses import dataclass, field, replace
+from typing import Dict,List,Tuple
 from subprocess import (
     run, 
     CalledProcessError
 )
 import os
+import tempfile
 import logging
-import hashlib
-from itertools import chain
 # from multiprocessing import Process 
 from time import sleep
+from threading import Thread, RLock
 import signal
 from google.protobuf.json_format import MessageToDict
 from chordDb import chordDb
+from shardedDb import shardedDb
+from memoryDb import memoryDb
+from queryCache import QueryCache
+from hotKeys import HotKeys, Replicas
+from successorReplicas import SuccessorReplicas
+from storageEngine import StorageEngine
+from chordRing import ChordRing
 from hopsCounter import HopsCounterInterceptor
+from localStub import LocalStub
+from tracer import Tracer, DEBUG, INFO, WARNING, LEVEL_NAMES
+from channelPool import ChannelPool, SERVER_KEEPALIVE_OPTIONS
 
 class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransferServicer):
     '''
@@ -43,24 +76,45 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
     and as a server (receiving requests).    
     
     '''
-    @dataclass
+    @dataclass(frozen = True)
     class FingerTable:
         '''
-        Data class modeling the finger table of a Chord network node.
+        Immutable snapshot of the routing state of a Chord network node: its finger table, successor and predecessor.
+
+        A published snapshot is never modified. Writers derive the next version through replace() and publish it by swapping 
+        the node's reference(see ChordNode._publish_()), so a reader holding a snapshot sees one consistent routing state 
+        without taking a lock.
 
         Attributes:
           hashed_ip_addr (int): The hashed IP address of the node.
-          FT (List[Tuple[int, int, str]]): The finger table entries, each represented as a tuple.
+          ring (ChordRing): The identifier space the node lives in.
+          FT (Tuple[Tuple[int, int, str], ...]): The finger table entries (start, node, node_ip).
+          successor (str): The IP address of the successor node.
+          predecessor (str): The IP address of the predecessor node.
+          version (int): The number of routing state changes the node has published.
+          successor_id, predecessor_id (int): The identifiers of the successor and the predecessor, stored alongside their addresses.
+          index (Tuple[List[int], List[int]]): Finger nodes sorted by distance from the node, used by closest_preceding().
         
         '''
         
         hashed_ip_addr: int
-        FT: List[Tuple[int, int, str]] = field(init=False)
+        ring: ChordRing
+        FT: Tuple[Tuple[int, int, str], ...] = None
+        successor: str = None
+        predecessor: str = None
+        version: int = 0
+        successor_id: int = field(init=False)
+        predecessor_id: int = field(init=False)
+        index: Tuple[List[int], List[int]] = field(init=False, repr=False, compare=False)
         
         def __post_init__(self) -> None:
-            self.__key__()
+            if self.FT is None:
+                object.__setattr__(self, "FT", self.__key__())
+            object.__setattr__(self, "successor_id", self.ring.node_id(self.successor) if self.successor is not None else None)
+            object.__setattr__(self, "predecessor_id", self.ring.node_id(self.predecessor) if self.predecessor is not None else None)
+            object.__setattr__(self, "index", self.ring.finger_index(self.hashed_ip_addr, self.FT))
 
-        def __key__(self) -> List[Tuple[int, int, str]]:
+        def __key__(self) -> Tuple[Tuple[int, int, str], ...]:
             '''
             __key__
             =======
@@ -68,14 +122,55 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
             Initialize the finger table based on the hashed IP address of the corresponding node.
 
             Returns:
-              List[Tuple[int, int, str]]: The initialized finger table(FT), including 
+              Tuple[Tuple[int, int, str], ...]: The initialized finger table(FT), including 
               the correct values for the 'start' field of the entries in the FT.
             
             '''
-            ft_size = int(os.environ.get("FT_SIZE", 7))
-            #careful loop around chord ring with modulo when overflowing the total number of possible key values(2^FT_SIZE).
-            self.FT = [((self.hashed_ip_addr % (2**ft_size) + 2**i) % (2**ft_size) , 0, "") for i in range(ft_size)]
+            return tuple((start, 0, "") for start in self.ring.finger_starts(self.hashed_ip_addr))
+
+        def replace(self, entries: Dict[int, Tuple[int, str]] = None, **changes) -> "ChordNode.FingerTable":
+            '''
+            replace
+            =======
+            
+            Derives the next version of the snapshot, leaving the current one untouched.
+
+            Args:
+              entries(Dict[int, Tuple[int, str]]): The new successor information(.node | .node_ip_address) of fingers, keyed by finger position.
+              changes: The new values of other attributes, e.g. successor or predecessor.
+            
+            Returns:
+              ChordNode.FingerTable: The new snapshot, with its version incremented.
+            
+            '''
+            FT = self.FT
+            if entries:
+                FT = tuple((entry[0], *entries[i]) if i in entries else entry for i, entry in enumerate(self.FT))
+            return replace(self, FT = FT, version = self.version + 1, **changes)
+
+        def closest_preceding(self, key_id: int) -> Tuple[int, int, str]:
+            '''
+            closest_preceding
+            =================
+            
+            Returns the finger table entry that most closely precedes key_id, or None if no finger lies 
+            between the node and key_id.
+            
+            '''
+            i = self.ring.closest_preceding(self.hashed_ip_addr, key_id, self.index)
+            return self.FT[i] if i >= 0 else None
+
+        def covering(self, key_id: int) -> Tuple[int, int, str]:
+            '''
+            covering
+            ========
+            
+            Returns the finger table entry whose interval [start, next start) contains key_id, or None if 
+            key_id is the node's own key.
             
+            '''
+            i = self.ring.finger_covering(self.hashed_ip_addr, key_id)
+            return self.FT[i] if i >= 0 else None
       
 
     def __init__(self) -> None:
@@ -92,9 +187,35 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
 
         Attributes:
           ip_addr(str): The IP address of the node.
-          FT(FingerTable): The finger table of the node.
-          successor(str): The successor node in the Chord ring.
-          predecessor(str): The predecessor node in the Chord ring.
+          ring(ChordRing): The identifier space, of size 2^FT_SIZE.
+          node_id(int): The identifier of the node on the ring.
+          FT(FingerTable): The published snapshot of the node's routing state.
+          successor(str): The successor node in the Chord ring, read from(and published to) FT.
+          predecessor(str): The predecessor node in the Chord ring, read from(and published to) FT.
+          routing_lock(RLock): Serializes the writers of the routing state. Readers don't take it.
+          lookup_mode(str): The default routing mode of find_successor(), 'iterative' or 'recursive'.
+          join_mode(str): How joins update the routing state: 'eager'(update_others()) or 'stabilize'(periodic background maintenance).
+          trust_fingers(bool): Whether finger entries are assumed up to date, letting lookups stop at the finger bracketing a key. 
+          Unset in stabilization mode, where fingers may lag behind joins.
+          stabilize_period, fix_fingers_period, check_predecessor_period(float): The periods, in seconds, of the maintenance tasks
+          run in stabilization mode(STABILIZE_PERIOD, FIX_FINGERS_PERIOD, CHECK_PREDECESSOR_PERIOD).
+          next_finger(int): The finger refreshed by the latest fix_fingers() call.
+          fanout(int): The maximum number of finger indices update_others() and fix_others() process concurrently(FANOUT_PARALLELISM).
+          handoff_chunk(int): The number of records per chunk of the key handoffs of joins and leaves(HANDOFF_CHUNK_SIZE).
+          handoff_retries(int): The number of times an interrupted key handoff is resumed(HANDOFF_RETRIES).
+          handoff_piece(int): The number of bytes per piece of the shard files handed over(HANDOFF_PIECE_SIZE).
+          chordDb(StorageEngine): The storage of the node, selected through DB_ENGINE: a SQLite database(chordDb, 'sqlite'), 
+          split into DB_SHARDS identifier-range shard files if above 1(shardedDb), or an in-memory one(memoryDb, 'memory').
+          query_cache(QueryCache): The responses of the latest get_data() queries, by university and awards threshold(QUERY_CACHE_SIZE entries).
+          hot_keys(HotKeys): The request rates of the keys of the node and the replicas of the hot ones(HOT_KEY_RATE, HOT_KEY_PERIOD, 
+          HOT_KEY_TTL, HOT_KEY_FANOUT).
+          replicas(Replicas): The replicas of the hot keys of other nodes held by the node.
+          successor_replicas(SuccessorReplicas): The copies of the data of the node held by its successors, and the ones of the 
+          data of its predecessors held by the node(REPLICATION_FACTOR, REPLICA_SYNC_PERIOD).
+          tracer(Tracer): The events of the node, its database and its hops counter(TRACE_LEVEL, TRACE_SAMPLE_RATE, TRACE_BUFFER_SIZE, TRACE_ECHO), 
+          served by get_trace().
+          local_stubs(dict): The stubs serving, in-process, the calls the node addresses to itself, keyed by stub class.
+          channels(ChannelPool): The pool of reusable channels to the other nodes(CHANNEL_POOL_SIZE, CHANNEL_IDLE_TIMEOUT).
         
         
         Note: 
@@ -110,17 +231,77 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
             self.ip_addr = result.stdout.strip()
         except CalledProcessError as e:
             print(f"Error occured: {e}")
-        self.FT = self.FingerTable(self._hash_(self.ip_addr))
-
-        self.successor = None
-        self.predecessor = None
-        self.chordDb = chordDb()
-        self.stub = None
-        self.hopCounter = HopsCounterInterceptor()
-        logging.basicConfig(level = logging.DEBUG)
+        self.ring = ChordRing(int(os.environ.get("FT_SIZE", 7)))
+        self.node_id = self.ring.node_id(self.ip_addr)
+        self.FT = self.FingerTable(self.node_id, self.ring)
+        self.routing_lock = RLock()
+
+        self.lookup_mode = os.environ.get("LOOKUP_MODE", "iterative")
+        self.join_mode = os.environ.get("JOIN_MODE", "eager")
+        self.trust_fingers = self.join_mode != "stabilize"
+        self.stabilize_period = float(os.environ.get("STABILIZE_PERIOD", 0.5))
+        self.fix_fingers_period = float(os.environ.get("FIX_FINGERS_PERIOD", 0.5))
+        self.check_predecessor_period = float(os.environ.get("CHECK_PREDECESSOR_PERIOD", 2.0))
+        self.next_finger = 0
+        self.fanout = max(1, int(os.environ.get("FANOUT_PARALLELISM", 4)))
+        self.handoff_chunk = max(1, int(os.environ.get("HANDOFF_CHUNK_SIZE", 1000)))
+        self.handoff_retries = int(os.environ.get("HANDOFF_RETRIES", 3))
+        self.handoff_piece = max(1, int(os.environ.get("HANDOFF_PIECE_SIZE", 1 << 20)))
+        self.tracer = Tracer.from_env()
+        engine = os.environ.get("DB_ENGINE", "sqlite").lower()
+        shards = int(os.environ.get("DB_SHARDS", 1))
+        if engine not in ("sqlite", "memory"):
+            raise ValueError(f"Unknown DB_ENGINE '{engine}', expected sqlite or memory.")
+        if engine == "memory":
+            if shards > 1:
+                raise ValueError("DB_SHARDS hands over SQLite shard files and requires DB_ENGINE=sqlite.")
+            self.chordDb = memoryDb(tracer = self.tracer)
+        else:
+            self.chordDb = shardedDb(self.ring, shards, tracer = self.tracer) if shards > 1 else chordDb(tracer = self.tracer)
+        self.query_cache = QueryCache(self.ring, int(os.environ.get("QUERY_CACHE_SIZE", 256)))
+        self.hot_keys = HotKeys(rate = float(os.environ.get("HOT_KEY_RATE", 0)), period = float(os.environ.get("HOT_KEY_PERIOD", 1.0)),
+                                ttl = float(os.environ.get("HOT_KEY_TTL", 30.0)), fanout = int(os.environ.get("HOT_KEY_FANOUT", 4)))
+        self.replicas = Replicas()
+        self.successor_replicas = SuccessorReplicas(self.ring, int(os.environ.get("REPLICATION_FACTOR", 1)), 
+                                                    float(os.environ.get("REPLICA_SYNC_PERIOD", 2.0)), self._replica_engine_)
+        self.hopCounter = HopsCounterInterceptor(self.tracer)
+        self.local_stubs = {chordprot_pb2_grpc.ChordStub: LocalStub(self, self.hopCounter),
+                            chordprot_pb2_grpc.DataTransferStub: LocalStub(self, self.hopCounter, "chordprot.DataTransfer")}
+        self.channels = ChannelPool(max_size = int(os.environ.get("CHANNEL_POOL_SIZE", 64)),
+                                    idle_timeout = float(os.environ.get("CHANNEL_IDLE_TIMEOUT", 300)))
+        logging.basicConfig(level = os.environ.get("LOG_LEVEL", "INFO").upper())
         self.logger = logging.getLogger(__name__)
         
 
+    successor = property(lambda self: self.FT.successor, lambda self, ip_addr: self._publish_(successor = ip_addr))
+    predecessor = property(lambda self: self.FT.predecessor, lambda self, ip_addr: self._publish_(predecessor = ip_addr))
+
+
+    def _publish_(self, entries: Dict[int, Tuple[int, str]] = None, **changes) -> FingerTable:
+        '''
+        _publish_
+        =========
+        
+        Publishes the next version of the routing state, copying the current snapshot with the given changes.
+
+        Args:
+          entries(Dict[int, Tuple[int, str]]): The new (node, node_ip) of fingers, keyed by finger position.
+          changes: The new successor and/or predecessor.
+
+        Note:
+          Writers are serialized by routing_lock, while the new snapshot becomes visible to readers through 
+          a single reference assignment. A writer whose change depends on the current state(e.g. _update_finger_()) 
+          holds routing_lock across the check and the call to _publish_().
+        
+        Returns:
+          FingerTable: The published snapshot.
+        
+        '''
+        with self.routing_lock:
+            self.FT = self.FT.replace(entries, **changes)
+            return self.FT
+
+
     def serve(self) -> None:
         '''
         serve
@@ -132,16 +313,24 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
           None
           
         '''
-        server = grpc.server(ThreadPoolExecutor(max_workers=4), interceptors = [self.hopCounter])
+        server = grpc.server(ThreadPoolExecutor(max_workers = int(os.environ.get("SERVER_WORKERS", 16))), interceptors = [self.hopCounter], options = SERVER_KEEPALIVE_OPTIONS)
         chordprot_pb2_grpc.add_ChordServicer_to_server(self, server)
         chordprot_pb2_grpc.add_DataTransferServicer_to_server(self,server)
         server.add_insecure_port('[::]:50051')
         server.start()
-        print(f"Server(IP Address: {self.ip_addr}) started!")
+        if self.tracer.info:
+            self.tracer.event(INFO, "serve", ip_addr = self.ip_addr, server = "thread")
+        if self.join_mode == "stabilize":
+            for task, period in self._maintenance_tasks_():
+                Thread(target = self._maintain_, args = (task, period), daemon = True).start()
+        if self.hot_keys.rate > 0:
+            Thread(target = self._maintain_, args = (self.replicate_hot_keys, self.hot_keys.period), daemon = True).start()
+        if self.successor_replicas.factor > 1:
+            Thread(target = self._maintain_, args = (self.sync_replicas, self.successor_replicas.period), daemon = True).start()
         server.wait_for_termination()
 
 
-    def join(self, request: JoinRequest, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+    def join(self, request: JoinRequest, context) -> JoinResponse:
         '''
         join
         ====
@@ -161,56 +350,120 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
           context: The context object for the gRPC call.
 
         Returns:
-          chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response. 
+          JoinResponse: The number of gRPC calls the node sent to other nodes while joining. 
 
         Note:
           If the 'init' flag is set to True in the request(indicating that the new node is the first one joining the network), 
           the joining node then initializes its finger table and sets itself as the predecessor and successor. Otherwise, it initializes the finger table,
           updates its predecessor and successor and calls update_others() in order to 'notify' existing nodes about the new node.
            
+          In stabilization mode(JOIN_MODE = 'stabilize') the joining node only looks up its successor and notifies it, so join 
+          returns after O(log N) calls and many nodes may join concurrently. The predecessors, the fingers and the finger tables 
+          of the other nodes converge in the background through stabilize(), fix_fingers() and check_predecessor().
+           
           If the 'transfer_data' flag is set(== True) in the request(meaning that the joining node was not part of the initial network), 
           it transfers the appropriate data(condition: joining's node.predecessor hash value < data's hash value <= joining's node hash value) 
           from the successor to the joining node to ensure consistent data distribution across the Chord ring.
           
+          The reported calls are the ones of the join itself, counted by the channel pool in its context: the calls sent 
+          meanwhile by the maintenance tasks or by other handlers of the node aren't.
+          
         '''
-        if(request.init):
-            print(f"Hash value of init_node: {self._own_key()}")
-            for i in range(len(self.FT.FT)):
-                self.FT.FT[i] = (self.FT.FT[i][0], self._own_key(), self.ip_addr)
-            self.predecessor = self.ip_addr
-            self.successor = self.ip_addr
-            self.logger.debug(f"Finger Table(FT) of init_node after init_finger_table(): \n {self.FT}")
-            return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+        with self.channels.counting() as counter:
+            self._join_(request)
+        return JoinResponse(num_rpcs = counter.calls)
+
+
+    def _join_(self, request: JoinRequest) -> None:
+        '''
+        Joins the node to the ring, see join().
+        '''
+        if not self._join_start_(request):
+            return
+        if self.join_mode == "stabilize":
+            self._join_successor_(request.ip_addr)
+            self._join_routed_()
         else:
-            print(f"Hash value of joining_node: {self._own_key()}")
             self.init_finger_table(request.ip_addr) # passing ip address
-            self.logger.debug(f"Finger Table(FT) of joining_node after init_finger_table(): {self.FT}")
-            print(f"Predecessor of joining_node after init_finger_table(): IP Address -> {self.predecessor}, Hash Value -> {self._hash_(self.predecessor) % (2**len(self.FT.FT))}")
-            print(f"Successor of joining_node after init_finger_table(): IP Address -> {self.successor}, Hash Value -> {self._hash_(self.successor) % (2**len(self.FT.FT))}")
-            self.logger.debug(f"Proceeding with the call to update_others().")
+            self._join_routed_()
             self.update_others()
-            self.hopCounter.reset_hops()
-            if(request.transfer_data):
-              try:
-                  print(f"The joininig_node is not a part of the initial Chord network ring. A potential transfer of data from the successor is required.")
-                  self.chordDb.write_disk()
-                  with grpc.insecure_channel(self.successor+":50051") as server:
-                      client = chordprot_pb2_grpc.DataTransferStub(server)
-                      node_data = client.request_data(JoiningNodeKeyRequest(node_id = self._own_key())) 
-                      node_data = MessageToDict(node_data, including_default_value_fields = True)
-                      
-                      if self.chordDb.store_data(node_data['data']):
-                          self.logger.info(f"Success on transfering data from successor to joining node: {self._own_key()}.")
-                      else:
-                          raise grpc.RpcError(code = grpc.StatusCode.NOT_FOUND, details = "Error on storing data to joining node.")
-                      
-                      print(f"Successful completion of join().")    
-              except grpc.RpcError as e:
-                  self.logger.error(f"Error occured during the gRPC call: {e}")
-              except Exception as e:
-                  self.logger.error(f"Error occured: {e}")
-            return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
-          
+        self.hopCounter.reset_hops()
+        if(request.transfer_data):
+          try:
+              self._pull_data_()
+          except grpc.RpcError as e:
+              self.logger.error(f"Error occured during the gRPC call: {e}")
+          except Exception as e:
+              self.logger.error(f"Error occured: {e}")
+        if self.successor_replicas.factor > 1:
+          try:
+              self.sync_replicas()
+          except grpc.RpcError as e:
+              self.logger.warning(f"Syncing the successor replicas of the joining node failed: {e}")
+
+
+    def _join_start_(self, request: JoinRequest) -> bool:
+      '''
+      Starts a join: makes the node a ring of its own if it's the first one(init), otherwise traces the join.
+
+      Returns:
+        bool: True if the node joins an existing ring, i.e. it looks up its place in it next.
+      '''
+      if(request.init):
+          self._join_as_first_()
+          return False
+      if self.tracer.info:
+          self.tracer.event(INFO, "join", node_id = self._own_key(), join_mode = self.join_mode)
+      return True
+
+
+    def _join_routed_(self) -> None:
+      '''
+      Traces the routing state of a joining node once it has found its place in the ring, before the other nodes are updated.
+      '''
+      routing = self.FT
+      if self.join_mode == "stabilize":
+          if self.tracer.info:
+              self.tracer.event(INFO, "join", successor = routing.successor, successor_id = routing.successor_id, converging = True)
+          return
+      if self.tracer.debug:
+          self.tracer.event(DEBUG, "routing_state", routing = routing)
+      if self.tracer.info:
+          self.tracer.event(INFO, "init_finger_table", predecessor = routing.predecessor, predecessor_id = routing.predecessor_id,
+                            successor = routing.successor, successor_id = routing.successor_id)
+      if self.tracer.debug:
+          self.tracer.event(DEBUG, "update_others", node_id = self._own_key())
+
+
+    def _pull_data_(self) -> None:
+      '''
+      Pulls the data of a joining node from its successor, as the files of the shards holding it if the database is sharded.
+      '''
+      self._pull_start_()
+      if self.chordDb.sharded:
+          self._pull_shards_()
+      else:
+          self._pull_handoff_()
+      self._pulled_()
+
+
+    def _pull_start_(self) -> None:
+      '''
+      Traces the request of the data of a joining node and opens its database.
+      '''
+      if self.tracer.info:
+          self.tracer.event(INFO, "request_data", successor = self.successor)
+      self.chordDb.write_disk()
+
+
+    def _pulled_(self) -> None:
+      '''
+      Traces the end of the transfer of the data of a joining node.
+      '''
+      self.logger.info(f"Success on transfering data from successor to joining node: {self._own_key()}.")
+      if self.tracer.info:
+          self.tracer.event(INFO, "joined", node_id = self._own_key())
+
     
     def leave(self, request, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
       '''
@@ -238,46 +491,411 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
   
       '''
       #case1: the node that will leave is on its own in the network
-      if self.predecessor == self._own_key and self._own_key == self.successor:
-        print(f"The leaving node is the only node in the network.") 
-        self.predecessor = None
-        self.successor = None
-        self.FT = None
-        try:
-          self.chordDb.fetch_and_delete_data()
-        except  Exception as e:
-          self.logger.error(f"An error occurred during the leave of node {self._own_key()}.")
+      if self._leaving_alone_():
+        self._leave_alone_()
         return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
       
       else: 
         #case2: there are at least two nodes in the network
-        print(f"The are at least two nodes in the network.") 
         try:
           self.__establish_comm__(self.successor).set_predecessor(setPredecessorRequest(ip_addr = self.predecessor))  #successor.predecessor = self.predecessor
           self.__establish_comm__(self.predecessor).set_successor(setPredecessorRequest(ip_addr = self.successor)) #predecessor.successor = self.successor 
-          leaving_node_data = self.chordDb.fetch_and_delete_data()
-          with grpc.insecure_channel(self.successor+":50051") as channel:
-                     client = chordprot_pb2_grpc.DataTransferStub(channel)
-                     dt = map(lambda scientist: CompScientistData(Surname = scientist.get("surname"),
-                                                             Education = scientist.get("education"),
-                                                             Awards = scientist.get("awards"),
-                                                             Hash = scientist.get("hash_value")), leaving_node_data)
-
-                     client.store(DataTransferRequest(data = dt)) #transfer data from leaving node to leaving node's successor
-          self.logger.debug(f"Proceeding with the call to fix_others().")
+          self._push_data_() #transfer data from leaving node to leaving node's successor
+          if self.tracer.debug:
+              self.tracer.event(DEBUG, "fix_others", node_id = self._own_key())
           self.fix_others() #updating the finger tables of nodes affected by the leave of current node
-          self.successor = None #clear the successor value of leaving node
-          self.predecessor = None #clear the predecessor value of leaving node
-          self.FT = None #clear the finger table's values of leaving node
-          print(f"Successful completion of leave().")
+          self._left_()
+          self.channels.close() #release the pooled channels of leaving node
         
         except grpc.RpcError as e:
             self.logger.error(f"Error during transmission occured: {e}")   
         except  Exception as e:
-          self.logger.error(f"An error occurred during the leave of node {self._own_key()}.")
+          self.logger.error(f"An error occurred during the leave of node {self._own_key()}: {e}")
         
         return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
-           
+
+
+    def _leaving_alone_(self) -> bool:
+      '''
+      Traces the leave of the node, returning whether it's the only node of the ring.
+      '''
+      routing = self.FT
+      alone = routing.predecessor == self.ip_addr and self.ip_addr == routing.successor
+      if self.tracer.info:
+          self.tracer.event(INFO, "leave", node_id = self._own_key(), alone = alone)
+      return alone
+
+
+    def _leave_alone_(self) -> None:
+      '''
+      Clears the routing state and the data of the last node of the ring, which leaves it.
+      '''
+      self._clear_routing_state_()
+      try:
+        self.chordDb.fetch_and_delete_data()
+        self.successor_replicas.clear()
+        self._invalidate_()
+      except  Exception as e:
+        self.logger.error(f"An error occurred during the leave of node {self._own_key()}: {e}")
+
+
+    def _push_data_(self) -> None:
+      '''
+      Pushes the data of a leaving node to its successor, as the files of its shards if the database is sharded.
+      '''
+      if self.chordDb.sharded:
+          self._push_shards_()
+      else:
+          self._push_handoff_()
+
+
+    def _left_(self) -> None:
+      '''
+      Clears the routing state and the successor replicas of a node which has left the ring. The successor of the node 
+      syncs the data it took over to its own chain.
+      '''
+      self._clear_routing_state_()
+      self.successor_replicas.clear()
+      if self.tracer.info:
+          self.tracer.event(INFO, "left", node_id = self._own_key())
+
+
+    def _join_as_first_(self) -> None:
+      '''
+      Makes the node a ring of its own: every finger, the successor and the predecessor point to the node itself.
+      '''
+      if self.tracer.info:
+          self.tracer.event(INFO, "join_as_first", node_id = self._own_key())
+      self._publish_({i: (self._own_key(), self.ip_addr) for i in range(len(self.FT.FT))}, 
+                     predecessor = self.ip_addr, successor = self.ip_addr)
+      if self.tracer.debug:
+          self.tracer.event(DEBUG, "routing_state", routing = self.FT)
+
+
+    def _join_successor_(self, ip_addr: str) -> None:
+      '''
+      Stabilization mode join: looks up the successor of the node through the node at ip_addr and notifies it.
+      The predecessor stays unknown until a node notifies the joining node.
+      '''
+      successor = self.__establish_comm__(ip_addr).find_successor(SuccessorRequest(key_id = str(self._own_key())))
+      self._publish_({0: (int(successor.node_id), successor.ip_addr)}, predecessor = None, successor = successor.ip_addr)
+      self.__establish_comm__(self.successor).notify(setPredecessorRequest(ip_addr = self.ip_addr))
+
+
+    def _joining_range_(self) -> Tuple[int, int]:
+      '''
+      Returns the range of keys a joining node takes over from its successor, (predecessor, node]. In stabilization mode the 
+      predecessor may still be unknown, and the range starts at the successor: the keys of the successor outside (node, successor].
+      '''
+      routing = self.FT
+      return routing.predecessor_id if routing.predecessor is not None else routing.successor_id, self._own_key()
+
+
+    @staticmethod
+    def _handed_range_(request) -> Tuple[int, int]:
+      '''
+      Returns the range of keys of the joining node of a handoff request, (start_id, node_id].
+      '''
+      return int(request.start_id), int(request.node_id)
+
+
+    def _pull_handoff_(self) -> None:
+      '''
+      _pull_handoff_
+      ==============
+      
+      Pulls the data of a joining node from its successor, in chunks of HANDOFF_CHUNK_SIZE records.
+      
+      Note:
+        Every chunk is stored along with a checkpoint, the id of its last record in the database of the successor, 
+        and then acknowledged, so that the successor deletes it. An interrupted handoff is resumed, up to HANDOFF_RETRIES 
+        times, from the checkpoint: the successor first deletes the records up to it and streams the ones following it.
+
+      Raises:
+        grpc.RpcError: If the handoff is still interrupted after the last retry.
+      '''
+      source = self.successor
+      client = self.__establish_comm__(source, chordprot_pb2_grpc.DataTransferStub)
+      for attempt in range(self.handoff_retries + 1):
+          try:
+              request = self._handoff_request_(source)
+              for chunk in client.stream_data(request):
+                  ack = self._pulled_chunk_(chunk, source, request)
+                  if ack is not None:
+                      client.ack_data(ack)
+              return
+          except grpc.RpcError as e:
+              self._resume_handoff_(attempt, source, e)
+
+
+    def _handoff_request_(self, source: str) -> HandoffRequest:
+      '''
+      Requests the data of a joining node from source, its successor, following the checkpoint of the handoff.
+      '''
+      start, end = self._joining_range_()
+      return HandoffRequest(node_id = str(end), start_id = str(start), after = self.chordDb.checkpoint(source), chunk_size = self.handoff_chunk)
+
+
+    def _pulled_chunk_(self, chunk: DataChunk, source: str, request: HandoffRequest) -> HandoffAck:
+      '''
+      Stores a chunk pulled from source, returning its acknowledgement(None for the empty last chunk).
+
+      Raises:
+        grpc.RpcError: If the chunk couldn't be stored, so that the handoff is resumed.
+      '''
+      if not self._store_chunk_(chunk, source):
+          raise grpc.RpcError(f"Error on storing data transferred from {source}.")
+      if chunk.ids:
+          return HandoffAck(node_id = request.node_id, start_id = request.start_id, upto = chunk.ids[-1])
+      return None
+
+
+    def _resume_handoff_(self, attempt: int, source: str, error: grpc.RpcError) -> None:
+      '''
+      Traces the resumption of a handoff from source interrupted by error, unless attempt was the last retry.
+
+      Raises:
+        grpc.RpcError: The error of the last attempt.
+      '''
+      if attempt == self.handoff_retries:
+          raise error
+      if self.tracer.warning:
+          self.tracer.event(WARNING, "handoff_resumed", source = source, attempt = attempt + 1, error = error)
+
+
+    def _push_handoff_(self) -> None:
+      '''
+      _push_handoff_
+      ==============
+      
+      Pushes the data of a leaving node to its successor, in chunks of HANDOFF_CHUNK_SIZE records, and deletes the database.
+      
+      Note:
+        The successor acknowledges every chunk once it's stored, and only then the chunk is deleted. An interrupted handoff 
+        is resumed, up to HANDOFF_RETRIES times, by streaming the records not acknowledged yet. The successor skips the ones 
+        it had stored already, by its checkpoint of the handoff. Records stored after the last chunk are sent in one store().
+
+      Raises:
+        grpc.RpcError: If the handoff is still interrupted after the last retry.
+      '''
+      self.chordDb.write_disk() # a node holding no data may have never opened its database
+      client = self.__establish_comm__(self.successor, chordprot_pb2_grpc.DataTransferStub)
+      for attempt in range(self.handoff_retries + 1):
+          try:
+              for ack in client.handoff(self._chunks_()):
+                  self.chordDb.acknowledge(upto = ack.upto)
+              break
+          except grpc.RpcError as e:
+              self._resume_handoff_(attempt, self.ip_addr, e)
+      leftover = self._leaving_data_()
+      if len(leftover.data) > 0:
+          client.store(leftover)
+
+
+    def _pull_shards_(self) -> None:
+      '''
+      _pull_shards_
+      =============
+      
+      Pulls the data of a joining node from its successor as the files of the shards holding it(see shardedDb).
+      
+      Note:
+        The files are staged next to the shards, merged once all of them have arrived and then released, so that 
+        the successor deletes the merged records. An interrupted transfer is started over, up to HANDOFF_RETRIES 
+        times, as the records stay on the successor until released.
+
+      Raises:
+        grpc.RpcError: If the transfer is still interrupted after the last retry.
+      '''
+      source = self.successor
+      client = self.__establish_comm__(source, chordprot_pb2_grpc.DataTransferStub)
+      request = self._shard_request_()
+      for attempt in range(self.handoff_retries + 1):
+          staged = dict()
+          try:
+              for piece in client.pull_shards(request):
+                  self._stage_piece_(piece, staged)
+              break
+          except grpc.RpcError as e:
+              self._discard_staged_(staged)
+              self._resume_handoff_(attempt, source, e)
+      client.release_shards(self._shard_release_(request, staged))
+
+
+    def _shard_request_(self) -> ShardRequest:
+      '''
+      Requests the files of the shards holding the data of a joining node from its successor.
+      '''
+      start, end = self._joining_range_()
+      return ShardRequest(node_id = str(end), start_id = str(start))
+
+
+    def _shard_release_(self, request: ShardRequest, staged: Dict[int, Tuple[str, str, int]]) -> ShardRelease:
+      '''
+      Merges the staged files of the shards pulled by request, releasing their records on the successor.
+      '''
+      return ShardRelease(node_id = request.node_id, start_id = request.start_id, released = self._merge_shards_(staged))
+
+
+    def _push_shards_(self) -> None:
+      '''
+      _push_shards_
+      =============
+      
+      Pushes the data of a leaving node to its successor as the files of its shards, and deletes the database.
+      
+      Note:
+        The records of the shards are deleted once the successor has merged the files. An interrupted transfer is 
+        started over, up to HANDOFF_RETRIES times, and the successor skips the files it had merged already. Records 
+        stored after the export of the shards are sent in one store().
+
+      Raises:
+        grpc.RpcError: If the transfer is still interrupted after the last retry.
+      '''
+      self.chordDb.write_disk()
+      client = self.__establish_comm__(self.successor, chordprot_pb2_grpc.DataTransferStub)
+      for attempt in range(self.handoff_retries + 1):
+          exported = self.chordDb.export()
+          try:
+              client.push_shards(self._shard_pieces_(exported))
+              break
+          except grpc.RpcError as e:
+              self._resume_handoff_(attempt, self.ip_addr, e)
+      self._release_exported_(exported)
+      leftover = self._leaving_data_()
+      if len(leftover.data) > 0:
+          client.store(leftover)
+
+
+    def _release_exported_(self, exported: List[Tuple[int, str, int, str]]) -> None:
+      '''
+      Deletes the records of the exported shards(see shardedDb.export), once merged by the successor.
+      '''
+      for index, _, upto, _ in exported:
+          self.chordDb.acknowledge_shard(index, upto = upto)
+
+
+    def _shard_pieces_(self, exported: List[Tuple[int, str, int, str]]):
+      '''
+      Yields the exported files of shards(see shardedDb.export) as ShardChunks of HANDOFF_PIECE_SIZE bytes, deleting each file 
+      once sent, and the ones left if the transfer is interrupted.
+      '''
+      try:
+          for index, path, upto, source in exported:
+              with open(path, "rb") as file:
+                  while piece := file.read(self.handoff_piece):
+                      yield ShardChunk(shard = index, content = piece, source = source, upto = upto, shards = len(self.chordDb.shards))
+              os.remove(path)
+      finally:
+          for _, path, _, _ in exported:
+              if os.path.exists(path):
+                  os.remove(path)
+
+
+    def _stage_piece_(self, piece: ShardChunk, staged: Dict[int, Tuple[str, str, int]]) -> None:
+      '''
+      Appends a piece of the file of a shard to its staged copy, recording the new copies in staged.
+
+      Raises:
+        ValueError: If the sending node splits the identifier space into a different number of shards.
+      '''
+      if piece.shards != len(self.chordDb.shards):
+          raise ValueError(f"Shards of {piece.shards} ranges can't be merged into {len(self.chordDb.shards)} shards, DB_SHARDS differs.")
+      if piece.shard not in staged:
+          # a file of its own per transfer, as concurrent joins may pull the same shard
+          descriptor, path = tempfile.mkstemp(suffix = ".incoming", prefix = f"{self.chordDb.shards[piece.shard].db_name}.", dir = "./Data")
+          os.close(descriptor)
+          staged[piece.shard] = (path, piece.source, piece.upto)
+      with open(staged[piece.shard][0], "ab") as file:
+          file.write(piece.content)
+
+
+    def _discard_staged_(self, staged: Dict[int, Tuple[str, str, int]]) -> None:
+      '''
+      Deletes the staged files of an interrupted transfer, the ones not merged yet.
+      '''
+      for path, _, _ in staged.values():
+          if os.path.exists(path):
+              os.remove(path)
+
+
+    def _merge_shards_(self, staged: Dict[int, Tuple[str, str, int]]) -> Dict[int, int]:
+      '''
+      Merges the staged files into their shards, returning the id of the last exported record of each.
+      '''
+      for index, (path, source, _) in staged.items():
+          self.chordDb.merge(index, path, source)
+      self._invalidate_(covered = lambda key: self.chordDb.shard_of(key) in staged)
+      self.successor_replicas.dirty = True
+      return {index: upto for index, (_, _, upto) in staged.items()}
+
+
+    def _chunks_(self, key_range: Tuple[int, int] = None, after: int = 0, chunk_size: int = None):
+      '''
+      Yields the records with a hash value in the ring interval key_range(all if None) and an id greater than after, 
+      as DataChunks of chunk_size records, followed by an empty last chunk.
+      '''
+      chunk_size = chunk_size or self.handoff_chunk
+      records = self.chordDb.fetch_chunk(key_range, after, chunk_size)
+      while records:
+          yield DataChunk(data = map(lambda scientist: CompScientistData(Surname = scientist.get("surname"),
+                                                                        Education = scientist.get("education"),
+                                                                        Awards = scientist.get("awards"),
+                                                                        Hash = str(scientist.get("hash_value"))), records),
+                          ids = [scientist.get("id") for scientist in records], source = self.ip_addr)
+          records = self.chordDb.fetch_chunk(key_range, records[-1].get("id"), chunk_size)
+      yield DataChunk(source = self.ip_addr, last = True)
+
+
+    def _store_chunk_(self, chunk: DataChunk, source: str) -> bool:
+      '''
+      Stores a chunk handed over by source, along with its checkpoint.
+      '''
+      records = [{'Surname': scientist.Surname, 'Education': scientist.Education, 'Awards': scientist.Awards, 
+                  'Hash': int(scientist.Hash), 'Id': id} for scientist, id in zip(chunk.data, chunk.ids)]
+      stored = self.chordDb.store_data(records, source = source, last = chunk.last)
+      self._invalidate_(records = [(scientist.Education, scientist.Awards) for scientist in chunk.data])
+      self.successor_replicas.dirty = True
+      return stored
+
+
+    def _invalidate_(self, records: List[Tuple[str, int]] = None, covered = None) -> None:
+      '''
+      Invalidates the cached queries and the replicas of the hot keys derived from data of the node which changed: the data
+      of the given (university, awards) records, of the universities whose key is covered, or all of it if neither is given.
+      '''
+      if records is not None:
+          self.query_cache.invalidate_records(records)
+          self.hot_keys.changed({university for university, _ in records})
+      elif covered is not None:
+          self.query_cache.invalidate_keys(covered)
+          self.hot_keys.changed(covered = lambda university: covered(self.ring.hash(university)))
+      else:
+          self.query_cache.clear()
+          self.hot_keys.changed()
+
+
+    def _leaving_data_(self) -> DataTransferRequest:
+      '''
+      Removes the data of a leaving node from its database and packs it for its successor.
+      '''
+      leaving_node_data = self.chordDb.fetch_and_delete_data()
+      self._invalidate_()
+      dt = map(lambda scientist: CompScientistData(Surname = scientist.get("surname"),
+                                              Education = scientist.get("education"),
+                                              Awards = scientist.get("awards"),
+                                              Hash = str(scientist.get("hash_value"))), leaving_node_data)
+      return DataTransferRequest(data = dt)
+
+
+    def _clear_routing_state_(self) -> None:
+      '''
+      Clears the successor, the predecessor and the finger table of a leaving node, by publishing an empty routing state.
+      '''
+      with self.routing_lock:
+          self.FT = self.FingerTable(self._own_key(), self.ring, version = self.FT.version + 1)
+
+
     def request_data(self, request: JoiningNodeKeyRequest, context) -> DataTransferResponse:
         """
         request_data
@@ -286,7 +904,7 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
         Responds to a data transfer request from a joining node.
 
         Args:
-          request (JoiningNodeKeyRequest): gRPC request containing the joining node's key.
+          request (JoiningNodeKeyRequest): gRPC request containing the joining node's key and the start of its range.
           context: The context object for the gRPC call.
 
         Note:
@@ -302,129 +920,569 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
         """
       
         try:
-          joining_node_data = self.chordDb.fetch_and_delete_data(threshold = int(request.node_id))
-          print(f"The data corresponding to the joining node(node {request.node_id}) has been successfully retrieved from the local database of node {self._own_key()}.")
+          joining_node_data = self.chordDb.fetch_and_delete_data(key_range = self._handed_range_(request))
+          self._invalidate_(records = [(scientist.get("education"), scientist.get("awards")) for scientist in joining_node_data])
+          if self.tracer.info:
+              self.tracer.event(INFO, "request_data", joining_node_id = request.node_id, records = len(joining_node_data))
           dt = map(lambda scientist: CompScientistData(Surname = scientist.get("surname"),
                                                           Education = scientist.get("education"),
                                                           Awards = scientist.get("awards"),
-                                                          Hash = scientist.get("hash_value")),joining_node_data)
+                                                          Hash = str(scientist.get("hash_value"))),joining_node_data)
           return DataTransferResponse(data = dt)
         except  Exception as e:
             self.logger.error(f"Error occured during retrieval of joining node data: {e}")
             response = DataTransferResponse()
             return response
     
-    def get_data(self, request: RangeQueryRequest, context) -> DataTransferResponse:
+    def stream_data(self, request: HandoffRequest, context):
         """
-        get_data
-        ========
-        
-        Retrieves data from the local database based on a range query.
+        stream_data
+        ===========
         
-        The function queries the local database for scientists with the specified university and awards threshold(minimum number of awards).
-        The retrieved data is then transferred as a response to the requested node.
+        Streams the data of a joining node to it, in chunks.
 
         Args:
-          request (RangeQueryRequest): gRPC request containing information(university, minimum number of awards) about the range query.
+          request (HandoffRequest): gRPC request containing the range of the joining node, the checkpoint of an interrupted 
+          handoff and the number of records per chunk.
           context: The context object for the gRPC call.
 
-        Raises:
-          Exception: If an error occurs during the retrieval of range query response data.
+        Note:
+          The records are read straight from the local database, chunk by chunk, and stay there until the joining 
+          node acknowledges them(see ack_data). Resuming from a checkpoint acknowledges the records up to it.
         
-         Returns:
-          DataTransferResponse: The response containing data that matches the range query criteria.
+        Returns:
+          Iterator[DataChunk]: The chunks of the data, the last one being empty and marked as last.
+        
+        """
+        
+        key_range = self._handed_range_(request)
+        if self.tracer.info:
+            self.tracer.event(INFO, "stream_data", joining_node_id = request.node_id, start_id = request.start_id, after = request.after)
+        if request.after > 0:
+            self.chordDb.acknowledge(key_range, request.after)
+            self._invalidate_(covered = lambda key: ChordRing.in_range(key_range, key))
+        yield from self._chunks_(key_range, request.after, request.chunk_size)
+
 
+    def ack_data(self, request: HandoffAck, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        """
+        Deletes the chunks of a handoff acknowledged by the joining node.
         """
-      
         try:
-          range_query_response_data = self.chordDb.fetch_data(education = request.university, 
-                                                              awards_threshold =  int(request.max_awards))
-          print(f"The data corresponding to the requested range query has been successfully retrieved from the local database of node {self._own_key()}.")
-          dt = map(lambda scientist: CompScientistData(Surname = scientist.get("surname"),
-                                                          Education = scientist.get("education"),
-                                                          Awards = scientist.get("awards")
-                                                          ), range_query_response_data)
-          return DataTransferResponse(data = dt)
-        except  Exception as e:
-            self.logger.error(f"Error occured during retrieval of range query response data: {e}")
-            response = DataTransferResponse()
-            return response
-          
-    def get_finger_table(self, request, context)-> FingerTableResponse:
-      '''
-      get_finger_table
-      ================
-      
-      Retrieves the finger table and returns it as a response.
+            key_range = self._handed_range_(request)
+            self.chordDb.acknowledge(key_range, request.upto)
+            self._invalidate_(covered = lambda key: ChordRing.in_range(key_range, key))
+        except Exception as e:
+            self.logger.error(f"Error while deleting handed over data: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
 
-      Parameters:
-        request: The request object containing any necessary information.
-        context: The context of the gRPC call.
 
-      Returns:
-        A FingerTableResponse containing the finger table data.
-      
-      '''
-      ft_records = [FingerTableRecord(start = entry[0], node = entry[1], node_ip = entry[2]) for entry in self.FT.FT]
-      return FingerTableResponse(data = ft_records)
-        
-    def init_finger_table(self, ip_addr: str) -> None:
-        '''
-        init_finger_table   
-        =================
+    def handoff(self, request_iterator, context):
+        """
+        handoff
+        =======
         
-        Calculates the values of the node and node_ip_address fields of the finger table's entries
-        by making gRPC calls to other nodes in the Chord network.
+        Stores the data of a leaving predecessor, streamed in chunks, acknowledging each stored chunk.
 
         Args:
-          ip_addr(str): The IP address of the node to contact for starting the initialization of the finger table.
-
-        Note:
-          This method updates the finger table entries based on information retrieved from other nodes
-          in the Chord network. It also updates the successor and predecessor information for the node.
-          Additionally, it updates the successor of its predecessor and the predecessor of its successor.
-
-        Raises:
-          grpc.RpcError: If an error occurs during the gRPC calls.
-          
+          request_iterator (Iterator[DataChunk]): The chunks of the leaving node's data.
+          context: The context object for the gRPC call.
+        
         Returns:
-          None
-
-        '''
+          Iterator[HandoffAck]: The acknowledgements of the stored chunks.
+        
+        """
         
-        print(f"Node {self._own_key()} enters the init_finger_table().")
+        self.chordDb.write_disk()
         try:
-            successor = self.__establish_comm__(ip_addr).find_successor(SuccessorRequest(key_id = self.FT.FT[0][0]))
-            self.logger.debug(f"Finger[1].start : {self.FT.FT[0][0]}")
-            key_id, succ_ip_addr = successor.node_id , successor.ip_addr
-            print(f"Returned node from find_successor() call: {key_id} | {succ_ip_addr}.")
-            self.FT.FT[0] = (self.FT.FT[0][0], key_id, succ_ip_addr)
+            for chunk in request_iterator:
+                ack = self._handed_chunk_(chunk)
+                if ack is not None:
+                    yield ack
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
 
-            self.successor = self.FT.FT[0][2] 
-            client = self.__establish_comm__(self.successor)
-            self.predecessor =  client.get_predecessor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()).ip_addr
+
+    def _handed_chunk_(self, chunk: DataChunk) -> HandoffAck:
+        '''
+        Stores a chunk handed over by a leaving predecessor, returning its acknowledgement(None for the empty last chunk).
+
+        Raises:
+          ValueError: If the chunk couldn't be stored, which ends the handoff.
+        '''
+        if not self._store_chunk_(chunk, chunk.source):
+            raise ValueError("Error on storing data of leaving node.")
+        if chunk.last and self.tracer.info:
+            self.tracer.event(INFO, "handoff", source = chunk.source)
+        return HandoffAck(upto = chunk.ids[-1]) if chunk.ids else None
+
+
+    def pull_shards(self, request: ShardRequest, context):
+        """
+        pull_shards
+        ===========
+        
+        Streams the data of a joining node to it, as the files of the shards holding it(see shardedDb.export).
+
+        Args:
+          request (ShardRequest): gRPC request containing the range of the joining node.
+          context: The context object for the gRPC call.
+
+        Note:
+          The records stay in the shards until the joining node releases them(see release_shards).
+        
+        Returns:
+          Iterator[ShardChunk]: The pieces of the exported files.
+        
+        """
+        
+        if not self.chordDb.sharded:
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details("The database of the node isn't sharded.")
+            return
+        if self.tracer.info:
+            self.tracer.event(INFO, "pull_shards", joining_node_id = request.node_id, start_id = request.start_id)
+        yield from self._shard_pieces_(self.chordDb.export(self._handed_range_(request)))
+
+
+    def release_shards(self, request: ShardRelease, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        """
+        Deletes the records of the shards merged by the joining node.
+        """
+        try:
+            key_range = self._handed_range_(request)
+            for index, upto in request.released.items():
+                self.chordDb.acknowledge_shard(index, key_range, upto)
+            self._invalidate_(covered = lambda key: ChordRing.in_range(key_range, key))
+        except Exception as e:
+            self.logger.error(f"Error while deleting handed over data: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    def push_shards(self, request_iterator, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        """
+        push_shards
+        ===========
+        
+        Merges the files of the shards of a leaving predecessor, streamed in pieces, into the node's shards.
+
+        Args:
+          request_iterator (Iterator[ShardChunk]): The pieces of the leaving node's shard files.
+          context: The context object for the gRPC call.
+        
+        Returns:
+          chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response, once the files are merged.
+        
+        """
+        
+        staged = dict()
+        try:
+            self._merge_start_()
+            for piece in request_iterator:
+                self._stage_piece_(piece, staged)
+            self._merge_shards_(staged)
+        except Exception as e:
+            self._merge_failed_(e, context)
+        finally:
+            self._discard_staged_(staged)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    def _merge_start_(self) -> None:
+        '''
+        Opens the database of a node about to merge the shards of its leaving predecessor.
+
+        Raises:
+          ValueError: If the database of the node isn't sharded.
+        '''
+        if not self.chordDb.sharded:
+            raise ValueError("The database of the node isn't sharded.")
+        self.chordDb.write_disk()
+
+
+    def _merge_failed_(self, error: Exception, context) -> None:
+        '''
+        Fails a push_shards() call: a ValueError is a precondition the pushed shards don't meet(see _stage_piece_), 
+        any other error an internal one.
+        '''
+        self.logger.error(f"Error on merging shards of leaving node: {error}")
+        if isinstance(error, ValueError):
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details(str(error))
+        else:
+            context.set_code(grpc.StatusCode.INTERNAL)
+
+
+    def get_data(self, request: RangeQueryRequest, context) -> DataTransferResponse:
+        """
+        get_data
+        ========
+        
+        Retrieves data from the local database based on a range query.
+        
+        The function queries the local database for scientists with the specified university and awards threshold(minimum number of awards).
+        The retrieved data is then transferred as a response to the requested node. Responses are cached(see QueryCache), and a query 
+        answered by the cache, for its own threshold or a lower one of the same university, doesn't reach the database.
+        
+        A node holding a live replica of the university, a hot key of another node(see HotKeys), answers from the replica instead.
+        If its replica expired or was invalidated after a lookup stopped at the node, the query is forwarded to the owner.
+        With successor replication(see SuccessorReplicas) the node also answers the queries of the keys of its predecessors
+        it holds replicas of, and forwards the ones of keys it holds no replica of to their owner. If the lookup of the owner
+        ends at the node itself, e.g. while its predecessor is being updated, it answers from its own database.
+
+        Args:
+          request (RangeQueryRequest): gRPC request containing information(university, minimum number of awards) about the range query.
+          context: The context object for the gRPC call.
+
+        Raises:
+          Exception: If an error occurs during the retrieval of range query response data.
+        
+         Returns:
+          DataTransferResponse: The response containing data that matches the range query criteria.
+
+        """
+      
+        try:
+          replica, owner, database = self._query_start_(request)
+          if replica is not None:
+              return replica
+          if owner is None and database is None:
+              owner, database = self._query_step_(self.find_successor(SuccessorRequest(key_id = str(self.ring.hash(request.university))), context))
+          if owner is not None:
+              return self.__establish_comm__(owner, chordprot_pb2_grpc.DataTransferStub).get_data(request)
+          return self._query_(request, database)
+        except  Exception as e:
+            self.logger.error(f"Error occured during retrieval of range query response data: {e}")
+            response = DataTransferResponse()
+            return response
+
+
+    def _query_start_(self, request: RangeQueryRequest) -> Tuple[DataTransferResponse, str, StorageEngine]:
+        '''
+        Takes the first step of a range query: answers it from a live replica of its key, or picks the node to forward it to,
+        the owner of an expired replica, or the database to answer it from(see _database_).
+
+        Returns:
+          Tuple[DataTransferResponse, str, StorageEngine]: The answer(or None), the node to forward to(or None) and the database(or None). 
+          If all of them are None, the owner of the key is looked up and passed to _query_step_().
+        '''
+        replica, owner = self.replicas.lookup(request.university, int(request.max_awards))
+        if replica is not None:
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "get_data", university = request.university, max_awards = request.max_awards, records = len(replica.data), replica = True)
+            return replica, None, None
+        if owner is not None:
+            return None, owner, None
+        return None, None, self._database_(request.university)
+
+
+    def _query_step_(self, successor: SuccessorResponse) -> Tuple[str, StorageEngine]:
+        '''
+        Forwards a range query the node holds no data for to successor, the owner of its key, unless the lookup ended 
+        at the node itself, e.g. while its predecessor is being updated, which then answers from its own database.
+
+        Returns:
+          Tuple[str, StorageEngine]: The node to forward the query to(or None) and the database to answer it from(or None).
+        '''
+        if successor.ip_addr != self.ip_addr:
+            return successor.ip_addr, None
+        return None, self.chordDb
+
+
+    def _query_(self, request: RangeQueryRequest, database: StorageEngine) -> DataTransferResponse:
+        '''
+        Answers a range query from the query cache or database, the local one, counting the query towards the request rate 
+        of its key, or the successor replica covering its key(see SuccessorReplicas).
+        '''
+        if database is self.chordDb:
+            self.hot_keys.record(request.university)
+        response = self.query_cache.get(request.university, int(request.max_awards))
+        cached = response is not None
+        if not cached:
+            version = self.query_cache.version
+            range_query_response_data = database.fetch_data(education = request.university, 
+                                                            awards_threshold =  int(request.max_awards))
+            response = self.query_cache.put(request.university, int(request.max_awards), range_query_response_data, version)
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "get_data", university = request.university, max_awards = request.max_awards, records = len(response.data), cached = cached)
+        return response
+
+
+    def replicate(self, request: KeyReplica, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        """
+        Holds the replica of a hot key pushed by its owner, unless a later version of it is held or was invalidated(see Replicas).
+        """
+        if self.replicas.install(request.university, int(request.key_id), request.version, request.ttl, request.owner_ip_addr, request.data):
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "replicate", university = request.university, version = request.version, owner = request.owner_ip_addr)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    def invalidate_replica(self, request: ReplicaInvalidation, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        """
+        Drops the replica of a hot key whose data changed at the owner.
+        """
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "invalidate_replica", university = request.university, version = request.version)
+        self.replicas.invalidate(request.university, request.version)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    def _database_(self, university: str) -> StorageEngine:
+        '''
+        Returns the database holding the records of a university: the node's own if its key lies in the range of the node,
+        otherwise the successor replica covering it. None if successor replication is on and neither holds it, e.g. for 
+        a client whose view of the ring is stale, in which case the query is forwarded to the owner.
+        '''
+        routing = self.FT
+        key_id = self.ring.hash(university)
+        if (self.successor_replicas.factor <= 1 or routing.predecessor in (None, self.ip_addr) 
+            or self.ring.in_half_open(routing.predecessor_id, self._own_key(), key_id)):
+            return self.chordDb
+        return self.successor_replicas.covering(key_id)
+
+
+    def store_replica(self, request: ReplicaChunk, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        """
+        store_replica
+        =============
+
+        Stores records pipelined by their owner into its successor replica(see SuccessorReplicas), and forwards them 
+        to the rest of the chain.
+
+        Args:
+          request (ReplicaChunk): The records, their owner and the successors they are still forwarded to.
+          context: The context object for the gRPC call.
+
+        Note:
+          The call fails if a successor further down the chain can't be reached, so that the owner syncs its chain again.
+
+        Returns:
+          chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response, once the last successor stored the records.
+
+        """
+        try:
+            self._store_replica_(request)
+            if request.chain:
+                self.__establish_comm__(request.chain[0], chordprot_pb2_grpc.DataTransferStub).store_replica(self._forwarded_write_(request))
+        except Exception as e:
+            self._store_replica_failed_(request, e, context)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    def _store_replica_(self, request: ReplicaChunk) -> None:
+        '''
+        Stores records pipelined by their owner into its replica.
+
+        Raises:
+          ValueError: If the records couldn't be stored.
+        '''
+        if not self.successor_replicas.write(request.owner_ip_addr, self._replica_records_(request.data)):
+            raise ValueError(f"Error on storing data pipelined by {request.owner_ip_addr}.")
+        self.query_cache.invalidate_records([(scientist.Education, scientist.Awards) for scientist in request.data])
+
+
+    def _store_replica_failed_(self, request: ReplicaChunk, error: Exception, context) -> None:
+        '''
+        Fails a store_replica() call: an RpcError means the next successor of the chain is unreachable, any other error
+        that the records couldn't be stored.
+        '''
+        if isinstance(error, grpc.RpcError):
+            self.logger.warning(f"Pipelining the data of {request.owner_ip_addr} to {request.chain[0]} failed: {error}")
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            context.set_details(f"Successor replica {request.chain[0]} is unreachable.")
+        else:
+            self.logger.error(f"Error on storing the replica of {request.owner_ip_addr}: {error}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+
+
+    def _forwarded_write_(self, request: ReplicaChunk) -> ReplicaChunk:
+        '''
+        Packs records pipelined to the node for the next successor of their chain.
+        '''
+        return ReplicaChunk(owner_ip_addr = request.owner_ip_addr, start_id = request.start_id, data = request.data, chain = request.chain[1:])
+
+
+    def _replica_records_(self, data) -> List[Dict[str, any]]:
+        '''
+        Converts the CompScientistData of a ReplicaChunk into the records of a storage engine.
+        '''
+        return [{'Surname': scientist.Surname, 'Education': scientist.Education, 'Awards': scientist.Awards, 
+                 'Hash': int(scientist.Hash)} for scientist in data]
+
+
+    def sync_replica(self, request_iterator, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        """
+        sync_replica
+        ============
+
+        Replaces the successor replica of an owner with all of its data, streamed in chunks by a full sync(see sync_replicas).
+
+        Args:
+          request_iterator (Iterator[ReplicaChunk]): The chunks of the owner's data, the last one empty and marked as last.
+          context: The context object for the gRPC call.
+
+        Note:
+          The chunks are staged into a new storage engine, which replaces the replica of the owner once the last chunk 
+          has arrived. An interrupted sync leaves the previous replica in place.
+
+        Returns:
+          chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response, once the replica is replaced.
+
+        """
+        staged = None
+        try:
+            for chunk in request_iterator:
+                staged = self._stage_replica_(chunk, staged)
+        except Exception as e:
+            self._sync_replica_failed_(staged, e, context)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    def _stage_replica_(self, chunk: ReplicaChunk, staged: StorageEngine) -> StorageEngine:
+        '''
+        Stores a chunk of a full sync into the staged replica of its owner, a new one for the first chunk(staged None), 
+        replacing the current replica with it on the last chunk. Returns the staged replica.
+
+        Raises:
+          ValueError: If the chunk couldn't be stored.
+        '''
+        if staged is None:
+            staged = self.successor_replicas.stage(chunk.owner_ip_addr)
+        if chunk.data and not staged.store_data(self._replica_records_(chunk.data)):
+            raise ValueError(f"Error on storing data synced by {chunk.owner_ip_addr}.")
+        if chunk.last:
+            start, owner_id = int(chunk.start_id), self.ring.node_id(chunk.owner_ip_addr)
+            self.successor_replicas.commit(chunk.owner_ip_addr, start, owner_id, staged)
+            self.query_cache.invalidate_keys(lambda key: self.ring.in_half_open(start, owner_id, key))
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "sync_replica", owner = chunk.owner_ip_addr, start_id = start)
+        return staged
+
+
+    def _sync_replica_failed_(self, staged: StorageEngine, error: Exception, context) -> None:
+        '''
+        Fails a sync_replica() call, dropping the staged replica(if any) so that the previous one stays in place.
+        '''
+        self.logger.error(f"Error on syncing a successor replica: {error}")
+        context.set_code(grpc.StatusCode.INTERNAL)
+        if staged is not None:
+            staged.fetch_and_delete_data()
+
+
+    def release_replica(self, request: ReplicaRelease, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        """
+        Drops the successor replica of an owner whose chain the node left.
+        """
+        released = self.successor_replicas.release(request.owner_ip_addr)
+        if released is not None:
+            self.query_cache.invalidate_keys(lambda key: self.ring.in_half_open(*released, key))
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+    
+          
+    def get_finger_table(self, request, context)-> FingerTableResponse:
+      '''
+      get_finger_table
+      ================
+      
+      Retrieves the finger table and returns it as a response.
+
+      Parameters:
+        request: The request object containing any necessary information.
+        context: The context of the gRPC call.
+
+      Returns:
+        A FingerTableResponse containing the finger table data.
+      
+      '''
+      routing = self.FT
+      ft_records = [FingerTableRecord(start = str(entry[0]), node = str(entry[1]), node_ip = entry[2]) for entry in routing.FT]
+      return FingerTableResponse(data = ft_records, version = routing.version)
+        
+    def init_finger_table(self, ip_addr: str) -> None:
+        '''
+        init_finger_table   
+        =================
+        
+        Calculates the values of the node and node_ip_address fields of the finger table's entries
+        by making gRPC calls to other nodes in the Chord network.
+
+        Args:
+          ip_addr(str): The IP address of the node to contact for starting the initialization of the finger table.
+
+        Note:
+          This method updates the finger table entries based on information retrieved from other nodes
+          in the Chord network. It also updates the successor and predecessor information for the node.
+          Additionally, it updates the successor of its predecessor and the predecessor of its successor.
+
+        Raises:
+          grpc.RpcError: If an error occurs during the gRPC calls.
+          
+        Returns:
+          None
+
+        '''
+        
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "init_finger_table", node_id = self._own_key())
+        try:
+            self._init_successor_(self.__establish_comm__(ip_addr).find_successor(SuccessorRequest(key_id = str(self.FT.FT[0][0]))))
+            client = self.__establish_comm__(self.successor)
+            self.predecessor =  client.get_predecessor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()).ip_addr
             client.set_predecessor(setPredecessorRequest(ip_addr = self.ip_addr))
                 
-            #print(f"Predecessor of node {self._own_key()} is: {self.predecessor}  -  {self._hash_(self.predecessor) % (2**len(self.FT.FT))}") 
-            #print(f"Successor of node {self._own_key()} is: {self.successor} - {self._hash_(self.successor) % (2**len(self.FT.FT))}")      
+            #print(f"Predecessor of node {self._own_key()} is: {self.predecessor}  -  {self._hash_(self.predecessor)}") 
+            #print(f"Successor of node {self._own_key()} is: {self.successor} - {self._hash_(self.successor)}")      
                    
             self.__establish_comm__(self.predecessor).set_successor(setPredecessorRequest(ip_addr = self.ip_addr))
                 
         
-            for i in range(len(self.FT.FT)-1):
-                if self._in_between_(self._own_key(),self.FT.FT[i][1],self.FT.FT[i+1][0]):
-                    self.FT.FT[i+1] = (self.FT.FT[i+1][0], self.FT.FT[i][1], self.FT.FT[i][2]) 
-                else:
-                      successor = self.__establish_comm__(ip_addr).find_successor(SuccessorRequest(key_id = self.FT.FT[i+1][0]))
-                      self.FT.FT[i+1] = (self.FT.FT[i+1][0], successor.node_id, successor.ip_addr)
-
-            self.logger.debug(f"The execution of the init_finger_table function has been completed successfully.")
+            fingers = list(self.FT.FT) #built aside and published at once, so readers never see a partial table
+            for i in range(len(fingers)-1):
+                if not self._init_finger_(fingers, i):
+                      successor = self.__establish_comm__(ip_addr).find_successor(SuccessorRequest(key_id = str(fingers[i+1][0])))
+                      fingers[i+1] = (fingers[i+1][0], int(successor.node_id), successor.ip_addr)
+            self._init_fingers_(fingers)
             
         except grpc.RpcError as e:
                 self.logger.error(f"Error occured during the gRPC calls at init_finger_table(): {e}")
+
+
+    def _init_successor_(self, successor: SuccessorResponse) -> None:
+        '''
+        Publishes the successor of a joining node, looked up by init_finger_table(), as its first finger.
+        '''
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "init_finger_table", start = self.FT.FT[0][0], successor_id = successor.node_id, successor = successor.ip_addr)
+        self._publish_({0: (int(successor.node_id), successor.ip_addr)}, successor = successor.ip_addr)
+
+
+    def _init_finger_(self, fingers: List[Tuple[int, int, str]], i: int) -> bool:
+        '''
+        Fills finger i + 1 of the table built by init_finger_table() with finger i, if its start lies in [own key, finger i).
+
+        Returns:
+          bool: False if the successor of the start of finger i + 1 has to be looked up instead.
+        '''
+        if self.ring.in_between(self._own_key(), fingers[i][1], fingers[i+1][0]):
+            fingers[i+1] = (fingers[i+1][0], fingers[i][1], fingers[i][2])
+            return True
+        return False
+
+
+    def _init_fingers_(self, fingers: List[Tuple[int, int, str]]) -> None:
+        '''
+        Publishes the fingers built by init_finger_table() at once.
+        '''
+        self._publish_({i: fingers[i][1:] for i in range(1, len(fingers))})
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "init_finger_table", version = self.FT.version)
     
     
-    def fix_others(self) -> None:
+    def fix_others(self) -> Dict[int, object]:
       '''
       fix_others
       ==========
@@ -439,19 +1497,23 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
           The general rule is:
           -> The successor of node n will become the ith finger.node|.node_ip_address value of node k iff
              {k precedes n by at least 2^(i-1) AND the ith finger.node value on node k is equal to n}
+          
+          The indices are independent, so their chains run concurrently. Indices sent to the same node travel together, 
+          as one fix_finger_tables() batch(see _batch_others_()).
              
       Returns:
-        None
+        Dict[int, object]: The IP address of the node each index was sent to, or the error the index failed with.
       
       '''
-      for i in range(len(self.FT.FT)):
-        print(f"Calling find_predecessor() from fix_others() with key_id: {(self._own_key() - (2**i)) % (2**len(self.FT.FT))}") 
-        ip_addr = self.find_predecessor((self._own_key() - (2**i) + 1) % (2**len(self.FT.FT)))
-        print(f"Returned node from find_predecessor(): {ip_addr} | {self._hash_(ip_addr) % (2**len(self.FT.FT))}")
-        join_rq = JoinRequest(ip_addr = self.ip_addr)
-        print(f"Calling fix_finger_table() from fix_others() on node {self._hash_(ip_addr) % (2**len(self.FT.FT))} with node_id value: {self._own_key()}")
+      join_rq = JoinRequest(ip_addr = self.ip_addr)
+      
+      def fix_finger_tables(ip_addr, indices):
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "fix_others", target_id = self._hash_(ip_addr), indices = indices)
         #tradeoff send bigger messages vs pay the find_successor call in fin_finger_table()
-        self.__establish_comm__(ip_addr).fix_finger_table(FixFingerRequest(join_req = join_rq, successor_ip_addr = self.successor, index = i))  
+        self.__establish_comm__(ip_addr).fix_finger_tables(FingerUpdatesRequest(join_req = join_rq, successor_ip_addr = self.successor, indices = indices))
+      
+      return self._batch_others_(fix_finger_tables)
     
     
     
@@ -479,25 +1541,65 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
         chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response. 
       
       '''
-      s = self._hash_(request.join_req.ip_addr) % (2**len(self.FT.FT))
-      successor_node_id = self._hash_(request.successor_ip_addr) % (2**len(self.FT.FT))
-      print(f"Node {self._own_key()}, calling from node {request.join_req.ip_addr} | {s}, enters the fix_finger_table().")
+      if self._fix_finger_(request):
+        p = self.predecessor
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "fix_finger_table", forward_to = p, leaving = request.join_req.ip_addr, index = request.index)
+        self.__establish_comm__(p).fix_finger_table(request)
       
-      if self.FT.FT[request.index][1] == s:
-        self.logger.debug(f"Finger[i].node updates its value from {self.FT.FT[request.index][1]} to {successor_node_id}.")
-        self.FT.FT[request.index] = (self.FT.FT[request.index][0], successor_node_id, request.successor_ip_addr) 
+      return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    def fix_finger_tables(self, request: FingerUpdatesRequest, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+      '''
+      fix_finger_tables
+      =================
+      
+      Batched fix_finger_table(): fixes several finger indices of the node, for the same departing node, at once.
+
+      Args:
+        request(FingerUpdatesRequest): gRPC request containing the IP address of the departing node, its successor and the finger indices to fix.
+        context: The gRPC context.
+
+      Note:
+        Every index is fixed as fix_finger_table() would fix it. The indices that were fixed are forwarded to the predecessor 
+        in one message, the others end their chain here.
+      
+      Returns:
+        chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response. 
+      
+      '''
+      fixed = [i for i in request.indices if self._fix_finger_(FixFingerRequest(join_req = request.join_req, successor_ip_addr = request.successor_ip_addr, index = i))]
+      if len(fixed) > 0:
         p = self.predecessor
-        join_rq = JoinRequest(ip_addr = request.join_req.ip_addr)
-        print(f"Recursive call to fix_finger_table on node {self._hash_(p) % (2**len(self.FT.FT))} with node_id value: {self._hash_(request.join_req.ip_addr) % (2**len(self.FT.FT))}")
-        self.__establish_comm__(p).fix_finger_table(FixFingerRequest(join_req = join_rq, 
-                                                 successor_ip_addr = request.successor_ip_addr, 
-                                                 index = request.index))
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "fix_finger_tables", forward_to = p, leaving = request.join_req.ip_addr, indices = fixed)
+        self.__establish_comm__(p).fix_finger_tables(FingerUpdatesRequest(join_req = request.join_req, successor_ip_addr = request.successor_ip_addr, indices = fixed))
       
       return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    def _fix_finger_(self, request: FixFingerRequest) -> bool:
+      '''
+      Replaces the departing node of a fix_finger_table() request by its successor in the corresponding finger.
+
+      Returns:
+        bool: True if the finger was replaced, i.e. the request has to be forwarded to the predecessor.
+      '''
+      s = self._hash_(request.join_req.ip_addr)
+      successor_node_id = self._hash_(request.successor_ip_addr)
+      
+      with self.routing_lock:
+        if self.FT.FT[request.index][1] != s:
+          return False
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "fix_finger", index = request.index, old = s, new = successor_node_id)
+        self._publish_({request.index: (successor_node_id, request.successor_ip_addr)})
+        return True
         
         
             
-    def update_others(self) -> None:
+    def update_others(self) -> Dict[int, object]:
         '''
         update_others
         =============
@@ -515,109 +1617,420 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
           The general rule is:
           -> Node n will become the ith finger.node|.node_ip_address value of node k iff
              {k precedes n by at least 2^(i-1) AND the ith finger.node value on node k succeeds n} 
+          
+          The indices are independent, so their chains run concurrently. Indices sent to the same node travel together, 
+          as one update_finger_tables() batch(see _batch_others_()).
+
+        Returns:
+          Dict[int, object]: The IP address of the node each index was sent to, or the error the index failed with.
+        
+        '''
+        join_rq = JoinRequest(ip_addr = self.ip_addr)
+        
+        def update_finger_tables(ip_addr, indices):
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "update_others", target_id = self._hash_(ip_addr), indices = indices)
+            self.__establish_comm__(ip_addr).update_finger_tables(FingerUpdatesRequest(join_req = join_rq, indices = indices))
+        
+        return self._batch_others_(update_finger_tables)
+
+
+    def _index_target_(self, i: int) -> str:
+        '''
+        Finds the node the ith finger update of update_others()/fix_others() starts from: the predecessor of own key - 2^i + 1.
+        Keys in (predecessor, own key] are resolved locally.
+        '''
+        key_id, target = self._index_key_(i)
+        if target is not None:
+            return target
+        return self._index_found_(i, key_id, self.find_predecessor(key_id))
+
+
+    def _index_key_(self, i: int) -> Tuple[int, str]:
+        '''
+        Returns the key the ith finger update starts from, own key - 2^i + 1, along with the predecessor of the node if 
+        the key lies in (predecessor, own key], None if the predecessor of the key has to be looked up.
+        '''
+        key_id = (self._own_key() - (2**i) + 1) % self.ring.size
+        routing = self.FT
+        if routing.predecessor is not None and self.ring.in_half_open(routing.predecessor_id, self._own_key(), key_id):
+            return key_id, routing.predecessor
+        return key_id, None
+
+
+    def _index_found_(self, i: int, key_id: int, ip_addr: str) -> str:
+        '''
+        Traces the looked up predecessor of key_id, the node the ith finger update starts from, and returns it.
+        '''
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "index_target", index = i, key_id = key_id, target = ip_addr)
+        return ip_addr
+
+
+    def _batch_others_(self, send) -> Dict[int, object]:
+        '''
+        _batch_others_
+        ==============
+        
+        Sends the finger updates of update_others()/fix_others() as one batch per target node.
+
+        Args:
+          send: Called with the IP address of a target node and the finger indices the node receives.
+
+        Note:
+          The target of every finger index is resolved first(_index_target_()). Indices often resolve to the same node, 
+          and their chains then run along the same predecessors, so the indices of every target are sent together 
+          and travel as one message along the chain. The lookups and the batches run concurrently(see _fan_out_()).
+        
+        Returns:
+          Dict[int, object]: The IP address of the node each index was sent to, or the error the index failed with.
+        
+        '''
+        targets = self._fan_out_(self._index_target_, range(len(self.FT.FT)))
+        groups = dict()
+        for i, target in targets.items():
+            if not isinstance(target, Exception):
+                groups.setdefault(target, list()).append(i)
+        
+        sent = self._fan_out_(lambda ip_addr: send(ip_addr, groups[ip_addr]), list(groups))
+        return {i: sent[target] if not isinstance(target, Exception) and isinstance(sent[target], Exception) else target
+                for i, target in targets.items()}
+
+
+    def _fan_out_(self, task, keys) -> Dict[object, object]:
+        '''
+        _fan_out_
+        =========
+        
+        Runs task for every key(a finger index, a target node), with at most FANOUT_PARALLELISM keys in flight.
+
+        Note:
+          A failing key doesn't stop the others. Its error is logged and collected with the results.
+          In the threaded server every hop of a chain holds a worker thread of the node it passes through while it waits 
+          for the next hop, so the fan-out should stay well below SERVER_WORKERS.
+        
+        Returns:
+          Dict[object, object]: The result of task for every key, or the exception it raised.
+        
+        '''
+        with ThreadPoolExecutor(max_workers = self.fanout) as executor:
+            futures = {key: executor.submit(copy_context().run, task, key) for key in keys} # the keys count towards the calls of the caller
+        return self._collect_({key: future.exception() or future.result() for key, future in futures.items()})
+
+
+    def _collect_(self, results: Dict[object, object]) -> Dict[object, object]:
+        '''
+        Logs the keys of a fan-out that failed and returns the results.
+        '''
+        for key, result in results.items():
+            if isinstance(result, Exception):
+                self.logger.error(f"Fan-out failed for {key}: {result}")
+        return results
+            
+            
+    
+    def update_finger_table(self, request, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        '''
+        update_finger_table
+        ===================
+        
+        Updates the finger table entry of the corresponding node based on a gRPC request from other node.
+
+        Args:
+          request: gRPC request containing the IP address of the node that made the request and whose value 
+          will be checked to determine whether a change in the finger table is needed. It also contains the index of the 
+          corresponding entry in the finger table.
+          context: The gRPC context.
+
+        Note:
+          This method is called recursively to ensure the consistency of the finger table across the Chord network.
+          It evaluates the appropriate conditions to determine if an update is necessary and makes appropriate updates to the
+          finger table entry. The recursion continues until the conditions are satisfied or the appropriate finger
+          table entry is updated.
+
+        
+        Returns:
+          chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response.
+        
+        '''
+        if self._update_finger_(request):
+            p = self.predecessor
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "update_finger_table", forward_to = p, joining = request.join_req.ip_addr, index = request.index)
+            self.__establish_comm__(p).update_finger_table(request)
+        
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    def update_finger_tables(self, request: FingerUpdatesRequest, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        '''
+        update_finger_tables
+        ====================
+        
+        Batched update_finger_table(): updates several finger indices of the node, for the same joining node, at once.
+
+        Args:
+          request(FingerUpdatesRequest): gRPC request containing the IP address of the joining node and the finger indices to update.
+          context: The gRPC context.
+
+        Note:
+          Every index is updated as update_finger_table() would update it. The indices that were updated are forwarded to the predecessor 
+          in one message, the others end their chain here.
+        
+        Returns:
+          chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response.
+        
+        '''
+        updated = [i for i in request.indices if self._update_finger_(FingerUpdateRequest(join_req = request.join_req, index = i))]
+        if len(updated) > 0:
+            p = self.predecessor
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "update_finger_tables", forward_to = p, joining = request.join_req.ip_addr, indices = updated)
+            self.__establish_comm__(p).update_finger_tables(FingerUpdatesRequest(join_req = request.join_req, indices = updated))
+        
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    def _update_finger_(self, request: FingerUpdateRequest) -> bool:
+        '''
+        Enters the joining node of an update_finger_table() request into the corresponding finger, if it precedes the current finger node.
+
+        Returns:
+          bool: True if the finger was updated, i.e. the request has to be forwarded to the predecessor.
+        '''
+        s = self._hash_(request.join_req.ip_addr)
+        with self.routing_lock:
+            start, node, _ = self.FT.FT[request.index]
+            
+            if self._own_key() == node:
+                update = self.ring.in_between(start, node, s)
+            else:
+                update = self.ring.in_half_open(self._own_key(), node, s) #WARNING: the open lbound solves the problem of recursive calls.
+            
+            if update:
+                if self.tracer.debug:
+                    self.tracer.event(DEBUG, "update_finger", index = request.index, old = node, new = s)
+                self._publish_({request.index: (s, request.join_req.ip_addr)})
+        return update
+            
+
+    def find_successor(self, request: SuccessorRequest, context) -> SuccessorResponse:
+        '''
+        find_successor
+        ==============
+        
+         Finds the successor node for the given key_id using the Chord protocol algorithm.
+
+         Args:
+           request(SuccessorRequest): gRPC request containing the key_id for which the successor is to be found.
+           context: The context of the gRPC communication.
+
+         Raises:
+           grpc.RpcError: An error that may occur during the gRPC communication.
+
+         Note:
+           In iterative mode this method walks the ring towards the predecessor node of the given key_id(see _route_()).
+           The successor of the predecessor is piggybacked on the last closest_preceding_finger() response, so no 
+           additional get_successor call is needed. The node_id and IP address of the successor node are returned in a
+           SuccessorResponse object.
+           
+           In recursive mode the lookup is forwarded hop by hop through find_successor_recursive(). The mode is taken from
+           the 'recursive' flag of the request and, if unset, from the lookup mode of the node(LOOKUP_MODE).
+           
+           A lookup flagged as 'read', whose caller only reads the data of the university it names, stops at the first node 
+           of its path holding a live replica of that university(see HotKeys), which is returned instead of the owner and 
+           answers get_data() for it. Universities may share a key, so a replica of another one never ends the lookup.
+           
+         Returns:
+           SuccessorResponse: A response containing the node_id and IP address of the successor node.
+      
+        '''
+        try:
+            university = self._read_university_(request)
+            if self._recursive_(request):
+                return self.find_successor_recursive(int(request.key_id), university)
+            if (replica := self._replica_owner_(int(request.key_id), university)) is not None:
+                return replica
+            
+            return self._found_(request, self._route_(int(request.key_id), owner_only = True, university = university))
+        except grpc.RpcError as e:
+            self.logger.error(f"Error in find successor: {e}")
+            
+
+    def _recursive_(self, request: SuccessorRequest) -> bool:
+        '''
+        Returns whether a lookup is recursive, by its 'recursive' flag or, if unset, by the lookup mode of the node.
+        '''
+        return request.recursive if request.HasField("recursive") else self.lookup_mode == "recursive"
+
+
+    def _read_university_(self, request: SuccessorRequest) -> str:
+        '''
+        Returns the university a read lookup reads, None for any other lookup(or a read lookup not naming it), which no replica answers.
+        '''
+        return request.university if request.read and request.university else None
+
+
+    def _replica_owner_(self, key_id: int, university: str) -> SuccessorResponse:
+        '''
+        Answers a read lookup of university, under key_id, with the current node if it holds a live replica of the university, 
+        None otherwise.
+        '''
+        if self.replicas.holds(key_id, university):
+            return SuccessorResponse(node_id = str(self._own_key()), ip_addr = self.ip_addr)
+        return None
+
+
+    def _found_(self, request: SuccessorRequest, route: Tuple[str, int, str]) -> SuccessorResponse:
+        '''
+        Answers an iterative lookup with the successor found by _route_().
+        '''
+        _, successor_id, successor_ip_addr = route
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "find_successor", key_id = request.key_id, successor_id = successor_id)
+        return SuccessorResponse(node_id = str(successor_id), ip_addr = successor_ip_addr)
+
+
+    def find_successor_recursive(self, key_id: int, university: str = None) -> SuccessorResponse:
+        '''
+        find_successor_recursive
+        ========================
+        
+        Finds the successor node for the given key_id by forwarding the lookup through the ring.
+
+        Args:
+          key_id(int): The key_id for which the successor is to be found.
+          university(str): The university read by a read lookup, which may stop at a node holding a replica of it, 
+          returned instead(None for other lookups).
+
+        Note:
+          If key_id lies in (self._own_key(), successor], the successor of the current node owns the key and is returned.
+          Otherwise the request is forwarded, flagged as recursive, to the closest preceding finger of the current node, 
+          which repeats the same step. Each hop costs one find_successor call, instead of the closest_preceding_finger
+          and get_successor round trips an iterative lookup pays from the originating node. 
+          The answer of the owner's predecessor travels back along the chain of forwarded calls.
+
+        Raises:
+          grpc.RpcError: An error that may occur during the forwarding of the request.
+
+        Returns:
+          SuccessorResponse: A response containing the node_id and IP address of the successor node.
+        
+        '''
+        owner, finger = self._next_hop_(key_id, university)
+        if owner is not None:
+            return owner
+        return self.__establish_comm__(finger[2]).find_successor(SuccessorRequest(key_id = str(key_id), recursive = True, 
+                                                                                  read = university is not None, university = university))
+
+
+    def _next_hop_(self, key_id: int, university: str = None) -> Tuple[SuccessorResponse, Tuple[int, int, str]]:
+        '''
+        Takes one step of a recursive lookup: either answers it, if the current node holds a replica of the university read(read lookups), 
+        if the successor of the current node owns key_id or no finger precedes key_id, or picks the closest preceding finger to forward it to.
 
         Returns:
-          None
-        
+          Tuple[SuccessorResponse, Tuple[int, int, str]]: The answer of the lookup(or None) and the finger to forward it to(or None).
         '''
-        for i in range(len(self.FT.FT)):
-            print(f"Calling find_predecessor() from update_others() with key_id: {(self._own_key() - (2**i)) % (2**len(self.FT.FT))}") 
-            #WARNING: the plus one solves the previous problem.
-            ip_addr = self.find_predecessor((self._own_key() - (2**i) + 1) % (2**len(self.FT.FT)))
-            print(f"Returned node from find_predecessor(): {ip_addr} | {self._hash_(ip_addr) % (2**len(self.FT.FT))}")
-            join_rq = JoinRequest(ip_addr = self.ip_addr)
-            print(f"Calling update_finger_table() from update_others() on node {self._hash_(ip_addr) % (2**len(self.FT.FT))} with node_id value: {self._own_key()}")
-            self.__establish_comm__(ip_addr).update_finger_table(FingerUpdateRequest(join_req = join_rq, index = i))
+        if (replica := self._replica_owner_(key_id, university)) is not None:
+            return replica, None
+        routing = self.FT
+        successor_id = routing.successor_id
+        if routing.successor == self.ip_addr or self.ring.in_half_open(self._own_key(), successor_id, key_id):
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "find_successor_recursive", key_id = key_id, successor_id = successor_id)
+            return SuccessorResponse(node_id = str(successor_id), ip_addr = routing.successor), None
+        
+        finger = routing.closest_preceding(key_id)
+        if finger is None:
+            return SuccessorResponse(node_id = str(successor_id), ip_addr = routing.successor), None
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "find_successor_recursive", key_id = key_id, forward_to = finger[1])
+        return None, finger
             
             
-    
-    def update_finger_table(self, request, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+
+    def find_successors(self, request: SuccessorsRequest, context) -> SuccessorsResponse:
         '''
-        update_finger_table
-        ===================
+        find_successors
+        ===============
         
-        Updates the finger table entry of the corresponding node based on a gRPC request from other node.
+        Finds the successor nodes for a batch of key_ids, routing the whole batch through the ring at once.
 
         Args:
-          request: gRPC request containing the IP address of the node that made the request and whose value 
-          will be checked to determine whether a change in the finger table is needed. It also contains the index of the 
-          corresponding entry in the finger table.
-          context: The gRPC context.
+          request(SuccessorsRequest): gRPC request containing the key_ids for which the successors are to be found.
+          context: The context of the gRPC communication.
 
         Note:
-          This method is called recursively to ensure the consistency of the finger table across the Chord network.
-          It evaluates the appropriate conditions to determine if an update is necessary and makes appropriate updates to the
-          finger table entry. The recursion continues until the conditions are satisfied or the appropriate finger
-          table entry is updated.
+          Keys lying in (self._own_key(), successor] or bracketed by a finger entry([finger.start, finger.node]) are resolved locally.
+          The remaining keys are grouped by the closest preceding finger of the current node. 
+          
+          A step request stops there and returns the groups. Otherwise the batch is resolved iteratively from the current node: 
+          every group is sent as a step request to its finger, at most FANOUT_PARALLELISM at once, and the groups they return 
+          are sent in the next round, until every key is resolved. No node waits on another one while serving a step, 
+          so a batch never holds the workers of the nodes it passes through. The keys of a failed step are returned as unresolved.
 
-        
         Returns:
-          chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response.
+          SuccessorsResponse: A response mapping every resolved key_id to the node_id and IP address of its successor node,
+          along with the groups of keys left(step requests) or the unresolved keys.
         
         '''
-        s = self._hash_(request.join_req.ip_addr) % (2**len(self.FT.FT))
-        print(f"Node {self._own_key()}, calling from node {request.join_req.ip_addr} | {s}, enters the update_finger_table().")
-        print(f"Upper bound is: {self.FT.FT[request.index][1]}")
-        #init_condition = self._own_key() ==  s # and not init_condition
-        #if not init_condition:
+        owners, groups = self._partition_keys_(request.key_ids)
+        if request.step:
+            return SuccessorsResponse(owners = owners, forwarded = [KeyGroup(ip_addr = ip_addr, key_ids = key_ids) for ip_addr, key_ids in groups.items()])
         
-        if self._own_key() == self.FT.FT[request.index][1]:
-            if self._in_between_(self.FT.FT[request.index][0], self.FT.FT[request.index][1], s):
-                self.logger.debug(f"Finger[i].node updates its value from {self.FT.FT[request.index][1]} to {s}.")
-                self.FT.FT[request.index] = (self.FT.FT[request.index][0], s, request.join_req.ip_addr) 
-                p = self.predecessor
-                join_rq = JoinRequest(ip_addr = request.join_req.ip_addr)
-                print(f"Recursive call to update_finger_table on node {self._hash_(p) % (2**len(self.FT.FT))} with node_id value: {self._hash_(request.join_req.ip_addr) % (2**len(self.FT.FT))}")
-                self.__establish_comm__(p).update_finger_table(FingerUpdateRequest(join_req = join_rq, index = request.index))
-        
-        
-        elif self._in_between_(self._own_key() + 1, self.FT.FT[request.index][1] + 1, s): #WARNING: the plus one at lbound solves the problem of recursive calls.
-            self.logger.debug(f"Finger[i].node updates its value from {self.FT.FT[request.index][1]} to {s}.")
-            self.FT.FT[request.index] = (self.FT.FT[request.index][0], s, request.join_req.ip_addr) 
-            p = self.predecessor
-            join_rq = JoinRequest(ip_addr = request.join_req.ip_addr)
-            print(f"Recursive call to update_finger_table on node {self._hash_(p) % (2**len(self.FT.FT))} with node_id value: {self._hash_(request.join_req.ip_addr) % (2**len(self.FT.FT))}")
-            self.__establish_comm__(p).update_finger_table(FingerUpdateRequest(join_req = join_rq, index = request.index))
-                
-        
-        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
-            
-
-    def find_successor(self, request: SuccessorRequest, context) -> SuccessorResponse:
-        '''
-        find_successor
-        ==============
+        unresolved = list()
+        while len(groups) > 0:
+            steps = self._fan_out_(lambda ip_addr: self.__establish_comm__(ip_addr).find_successors(SuccessorsRequest(key_ids = groups[ip_addr], step = True)),
+                                   list(groups))
+            groups = self._merge_steps_(owners, unresolved, groups, steps)
         
-         Finds the successor node for the given key_id using the Chord protocol algorithm.
+        return SuccessorsResponse(owners = owners, unresolved = unresolved)
 
-         Args:
-           request(SuccessorRequest): gRPC request containing the key_id for which the successor is to be found.
-           context: The context of the gRPC communication.
 
-         Raises:
-           grpc.RpcError: An error that may occur during the gRPC communication.
+    def _merge_steps_(self, owners: List[KeyOwner], unresolved: List[str], groups: dict, steps: Dict[str, object]) -> dict:
+        '''
+        Merges the responses of a round of find_successors() steps into owners(or unresolved, for the failed steps), 
+        returning the groups of keys of the next round.
+        '''
+        forwarded = dict()
+        for ip_addr, step in steps.items():
+            if isinstance(step, Exception):
+                unresolved.extend(groups[ip_addr])
+                continue
+            owners.extend(step.owners)
+            for group in step.forwarded:
+                forwarded.setdefault(group.ip_addr, list()).extend(group.key_ids)
+        return forwarded
+
+
+    def _partition_keys_(self, key_ids: List[str]) -> Tuple[List[KeyOwner], dict]:
+        '''
+        Splits a batch of key_ids into the keys the current node resolves locally and the keys it forwards.
 
-         Note:
-           This method calls the find_predecessor method to determine the predecessor node for the given key_id.
-           It then establishes a gRPC channel with the predecessor node and retrieves the successor node using
-           the get_successor method. The node_id and IP address of the successor node are returned in a
-           SuccessorResponse object.
-           
-         Returns:
-           SuccessorResponse: A response containing the node_id and IP address of the successor node.
-      
+        Returns:
+          Tuple[List[KeyOwner], dict]: The owners of the locally resolved keys and the remaining key_ids, 
+          grouped by the IP address of the closest preceding finger.
         '''
-        try:
-            print(f"Calling find_predecessor() from find_successor() with key_id: {request.key_id}")
-            pred_ip_addr = self.find_predecessor(request.key_id)
-            print(f"Returned node from find_predecessor(): {pred_ip_addr} | {self._hash_(pred_ip_addr) % (2**len(self.FT.FT))}")
-            successor = self.__establish_comm__(pred_ip_addr).get_successor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()) 
-            print(f"Returned successor node for key_id {request.key_id} is: {self._hash_(successor.ip_addr) % (2**len(self.FT.FT))}")
-            return SuccessorResponse(node_id = successor.node_id, ip_addr = successor.ip_addr)
-        except grpc.RpcError as e:
-            self.logger.error(f"Error in find successor: {e}")
-            
-            
+        routing = self.FT
+        successor_id = routing.successor_id
+        owners = list()
+        groups = dict()
+        for key_id in map(int, set(key_ids)):
+            entry = routing.covering(key_id)
+            if routing.successor == self.ip_addr or self.ring.in_half_open(self._own_key(), successor_id, key_id):
+                owners.append(KeyOwner(key_id = str(key_id), node_id = str(successor_id), ip_addr = routing.successor))
+            elif self.trust_fingers and entry is not None and self.ring.in_between(entry[0], entry[1] + 1, key_id):
+                owners.append(KeyOwner(key_id = str(key_id), node_id = str(entry[1]), ip_addr = entry[2]))
+            elif (finger := routing.closest_preceding(key_id)) is not None:
+                groups.setdefault(finger[2], list()).append(str(key_id))
+            else:
+                owners.append(KeyOwner(key_id = str(key_id), node_id = str(successor_id), ip_addr = routing.successor))
+        
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "find_successors", resolved = len(owners), forwarded = sum(map(len, groups.values())), fingers = len(groups))
+        return owners, groups
+      
 
     def find_predecessor(self, key_id: int) -> str:
         '''
@@ -631,8 +2044,7 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
 
         Note:
           This method utilizes the Chord Protocol to find the predecessor node for the specified key_id.
-          It starts by retrieving the successor node and then iteratively finds the closest preceding finger
-          until it identifies the predecessor. The process involves making gRPC calls to other nodes in the network.
+          The actual walk over the ring is performed by _route_().
 
           If the network has only one node, the method returns the current node's IP address as the predecessor.
        
@@ -640,45 +2052,105 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
           str: The IP address of the predecessor node.
         
         '''     
-        successor = self.__establish_comm__(self.ip_addr).get_successor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()) 
+        return self._route_(key_id)[0]
 
-        mirror_node = (self.ip_addr, self._own_key(), successor.node_id)
-        mirror_node_copy =  tuple(mirror_node)
 
-        #initial condition: If there is only one node in network
-        if successor.node_id == mirror_node[1]:
-         return mirror_node[0]
+    def _route_(self, key_id: int, owner_only: bool = False, university: str = None) -> Tuple[str, int, str]:
+        '''
+        _route_
+        =======
+        
+        Iteratively walks the ring towards the predecessor of the given key_id.
+
+        Args:
+          key_id(int): The key_id for which the predecessor node is to be found.
+          owner_only(bool): Whether the caller only needs the successor of key_id(e.g. find_successor()),
+          which allows the walk to stop as soon as a finger entry brackets the key.
+          university(str): The university read by a read lookup, whose walk may stop at a node holding a replica of it, 
+          returned as the successor(None for other lookups).
+
+        Note:
+          It starts by retrieving the successor node and then iteratively asks the closest preceding finger
+          until it identifies the predecessor. Each closest_preceding_finger() response piggybacks the successor of the 
+          responding node, so one gRPC call per hop suffices to test whether key_id lies in (node, node.successor].
+          
+          The response also carries the finger entry of the responding node whose interval covers key_id. 
+          Since finger.node is the successor of finger.start, a key in [finger.start, finger.node] is owned by finger.node 
+          and, if owner_only is set, the walk skips ahead to it.
+       
+        Returns:
+          Tuple[str, int, str]: The IP address of the predecessor node(None when skipping ahead), 
+          the node_id and the IP address of the successor node of key_id.
+        
+        '''     
+        result, mirror_node = self._route_start_(key_id, owner_only)
+        while result is None:
+            closest_preceding_finger_res = self.__establish_comm__(mirror_node[0]).closest_preceding_finger(SuccessorRequest(key_id = str(key_id), 
+                                                                                                                             read = university is not None, 
+                                                                                                                             university = university)) 
+            result, mirror_node = self._route_step_(mirror_node, closest_preceding_finger_res, key_id, owner_only)
+        
+        return result
+
+
+    def _route_start_(self, key_id: int, owner_only: bool) -> Tuple[Tuple[str, int, str], Tuple[str, int]]:
+        '''
+        Takes the first step of _route_() from the node's own successor and finger table.
 
+        Returns:
+          Tuple[Tuple[str, int, str], Tuple[str, int]]: The result of the walk, if already known(or None), 
+          and the (IP address, node_id) of the node to ask next.
+        '''
+        routing = self.FT
+        mirror_node = (self.ip_addr, self._own_key(), routing.successor_id, routing.successor)
 
-        if not self._in_between_(mirror_node[1] + 1, successor.node_id + 1, key_id):
-            print(f"Calling closest_preceding_finger() from find_predecessor() with key_id: {key_id}")
-            for i in range(len(self.FT.FT)-1,-1,-1):
-              if self._in_between_(self._own_key() + 1, key_id, self.FT.FT[i][1]):
-                print(f"Closest preceding finger() returns {self.FT.FT[i][1]}")
-                mirror_node = (self.FT.FT[i][2], self.FT.FT[i][1])
-                break 
+        #initial condition: If there is only one node in network
+        if mirror_node[2] == mirror_node[1] or self.ring.in_half_open(mirror_node[1], mirror_node[2], key_id):
+            return (mirror_node[0], mirror_node[2], mirror_node[3]), None
         
-        #to evade rpc calls inside loop which may have not been needed.
-        if mirror_node_copy[1] != mirror_node[1]:
-                    mirror_node_resp = self.__establish_comm__(mirror_node[0]).get_successor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()) 
-                    print(f"Returned node from get_successor({mirror_node[1]}) is: {mirror_node_resp.node_id}")
-                    mirror_node = (mirror_node[0], mirror_node[1], mirror_node_resp.node_id)                        
+        if owner_only and self.trust_fingers and (entry := routing.covering(key_id)) is not None and self.ring.in_between(entry[0], entry[1] + 1, key_id):
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "route", key_id = key_id, bracketed_by = entry[1])
+            return (None, entry[1], entry[2]), None
 
+        finger = routing.closest_preceding(key_id)
+        if finger is None:
+            return (mirror_node[0], mirror_node[2], mirror_node[3]), None
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "route", key_id = key_id, hop = finger[1])
+        return None, (finger[2], finger[1])
 
-        while not self._in_between_(mirror_node[1] + 1, mirror_node[2] + 1, key_id):
-                print(f"Calling closest_preceding_finger() from find_predecessor() with key_id: {key_id}")
-                closest_preceding_finger_res = self.__establish_comm__(mirror_node[0]).closest_preceding_finger(SuccessorRequest(key_id = key_id)) 
-                print(f"Closest preceding finger() returns {closest_preceding_finger_res.node_id}")
 
-                mirror_node_succ = self.__establish_comm__(closest_preceding_finger_res.ip_addr).get_successor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()) 
-                print(f"Returned node from get_successor({closest_preceding_finger_res.node_id}) is: {mirror_node_succ.node_id}")
-                mirror_node = (closest_preceding_finger_res.ip_addr, closest_preceding_finger_res.node_id, mirror_node_succ.node_id)
-                   
-        self.logger.debug(f"The execution of find_predecessor() has been completed successfully.")    
-        return mirror_node[0] 
+    def _route_step_(self, mirror_node: Tuple[str, int], closest_preceding_finger_res: ClosestFingerResponse, 
+                     key_id: int, owner_only: bool) -> Tuple[Tuple[str, int, str], Tuple[str, int]]:
+        '''
+        Takes one step of _route_() from the closest_preceding_finger() response of mirror_node.
+
+        Returns:
+          Tuple[Tuple[str, int, str], Tuple[str, int]]: The result of the walk, if reached(or None), 
+          and the (IP address, node_id) of the node to ask next.
+        '''
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "route", key_id = key_id, hop = closest_preceding_finger_res.node_id, asked = mirror_node[1])
+        if closest_preceding_finger_res.replica:
+            return (None, mirror_node[1], mirror_node[0]), None
+        successor_node_id = int(closest_preceding_finger_res.successor_id)
+        if self.ring.in_half_open(mirror_node[1], successor_node_id, key_id):
+            return (mirror_node[0], successor_node_id, closest_preceding_finger_res.successor_ip_addr), None
+        
+        if owner_only and self.trust_fingers:
+            for entry in closest_preceding_finger_res.fingers:
+                if self.ring.in_between(int(entry.start), int(entry.node) + 1, key_id):
+                    if self.tracer.debug:
+                        self.tracer.event(DEBUG, "route", key_id = key_id, bracketed_by = entry.node, asked = mirror_node[1])
+                    return (None, int(entry.node), entry.node_ip), None
+        
+        if int(closest_preceding_finger_res.node_id) == mirror_node[1]: #no finger precedes key_id
+            return (mirror_node[0], successor_node_id, closest_preceding_finger_res.successor_ip_addr), None
+        return None, (closest_preceding_finger_res.ip_addr, int(closest_preceding_finger_res.node_id))
       
 
-    def closest_preceding_finger(self, request: SuccessorRequest, context) -> SuccessorResponse:
+    def closest_preceding_finger(self, request: SuccessorRequest, context) -> ClosestFingerResponse:
         '''
         closest_preceding_finger
         ========================
@@ -691,20 +2163,35 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
 
         Note:
           This method used to identify the closest preceding finger to the specified key_id. 
-          It iterates through the finger table in reverse order and returns the first finger that is in the range 
-          (self._own_key() + 1, request.key_id).
+          It bisects the finger index of the node for the finger furthest from the node that lies in the range 
+          (self._own_key(), request.key_id).
 
           If no such finger is found, it returns the current node as the closest preceding finger.
+          
+          The response piggybacks the successor of the current node and the finger entry whose interval covers key_id, 
+          sparing the caller a separate get_successor() call per hop. For read lookups, it also flags whether the current 
+          node holds a replica of the university read.
 
         Returns:
-          SuccessorResponse: A response containing the node_id and IP address of the closest preceding finger.
+          ClosestFingerResponse: A response containing the node_id and IP address of the closest preceding finger.
 
         '''
-        print(f"Node {self._own_key()} enters the closest_preceding_finger() with key id {request.key_id}")
-        for i in range(len(self.FT.FT)-1,-1,-1):
-            if self._in_between_(self._own_key() + 1, request.key_id, self.FT.FT[i][1]):
-                return SuccessorResponse(node_id = self.FT.FT[i][1], ip_addr = self.FT.FT[i][2])         
-        return SuccessorResponse(node_id = self._own_key(), ip_addr = self.ip_addr)
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "closest_preceding_finger", key_id = request.key_id)
+        key_id = int(request.key_id)
+        routing = self.FT
+        finger = routing.closest_preceding(key_id)
+        if finger is None:
+            finger = (None, self._own_key(), self.ip_addr)
+        
+        entry = routing.covering(key_id)
+        covering = [FingerTableRecord(start = str(entry[0]), node = str(entry[1]), node_ip = entry[2])] if entry is not None else []
+        return ClosestFingerResponse(node_id = str(finger[1]), 
+                                     ip_addr = finger[2],
+                                     successor_id = str(routing.successor_id),
+                                     successor_ip_addr = routing.successor,
+                                     fingers = covering,
+                                     replica = self.replicas.holds(key_id, self._read_university_(request)))
       
             
     def store(self, request: DataTransferRequest, context)-> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
@@ -726,27 +2213,74 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
         code to INVALID_ARGUMENT.
 
         If any exception occurs during the process, an error message is logged.
+
+        With successor replication(REPLICATION_FACTOR above 1) the stored records are then pipelined through the chain 
+        of the node(see SuccessorReplicas), and the method returns once its last successor has stored them.
       
       Returns:
         chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response.
       
       
+      '''
+      if self.successor_replicas.factor <= 1:
+        self._store_request_(request, context)
+      else:
+        with self.successor_replicas.gated():
+          if self._store_request_(request, context):
+            self._pipeline_(request.data)
+      return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty() 
+
+
+    def _store_request_(self, request: DataTransferRequest, context) -> bool:
+      '''
+      Stores the data of a store() request in the node's database, returning whether it was stored.
       '''
       dict_repr = MessageToDict(request, including_default_value_fields = True)
-      print(f"The data sent for storage: {dict_repr}")
+      if self.tracer.debug:
+        self.tracer.event(DEBUG, "store", records = len(request.data))
       
       try:
         
         self.chordDb.write_disk()
-        if self.chordDb.store_data(dict_repr['data']): 
+        stored = self.chordDb.store_data(dict_repr['data'])
+        self._invalidate_(records = [(scientist.get('Education'), scientist.get('Awards', 0)) for scientist in dict_repr['data']])
+        if stored: 
            context.set_code(grpc.StatusCode.OK)
            self.logger.info(f"Successfully stored data to node {self.ip_addr}")
         else: 
           context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+        return stored
       except Exception as e:
           self.logger.error(f"Error while storing data: {e}")
-      
-      return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty() 
+          return False
+
+
+    def _pipeline_(self, data) -> None:
+      '''
+      Forwards records stored by the node to the first successor of its chain, marking the chain for a full sync if it fails.
+      '''
+      chain = self.successor_replicas.chain
+      if not chain:
+          return
+      try:
+          self.__establish_comm__(chain[0], chordprot_pb2_grpc.DataTransferStub).store_replica(self._replica_write_(data, chain))
+      except grpc.RpcError as e:
+          self._pipeline_failed_(chain, e)
+
+
+    def _pipeline_failed_(self, chain: List[str], error: grpc.RpcError) -> None:
+      '''
+      Marks the chain of the node for a full sync, as records couldn't be pipelined through it.
+      '''
+      self.logger.warning(f"Pipelining stored data to {chain[0]} failed: {error}")
+      self.successor_replicas.dirty = True
+
+
+    def _replica_write_(self, data, chain: List[str]) -> ReplicaChunk:
+      '''
+      Packs records of the node for the first successor of chain, to be forwarded to the rest of it.
+      '''
+      return ReplicaChunk(owner_ip_addr = self.ip_addr, start_id = str(self.successor_replicas.start), data = data, chain = chain[1:])
     
         
     def get_successor(self, request, context) -> SuccessorResponse:
@@ -769,7 +2303,8 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
           SuccessorResponse: A response containing the node_id and IP address of the successor node.  
            
         '''
-        return  SuccessorResponse(node_id = self._hash_(self.successor) % (2**len(self.FT.FT)) , ip_addr = self.successor)
+        routing = self.FT
+        return  SuccessorResponse(node_id = str(routing.successor_id) , ip_addr = routing.successor)
       
     
     def get_predecessor(self, request, context) -> SuccessorResponse:
@@ -787,12 +2322,16 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
           This method returns the information about the predecessor of the current node.
           The node_id is calculated based on the hash of the predecessor's IP address and is wrapped around
           the size of the finger table.
+          An empty response is returned while the predecessor is unknown(stabilization mode).
           
         Returns:
           SuccessorResponse: A response containing the node_id and IP address of the predecessor node.
           
         '''
-        return SuccessorResponse(node_id = self._hash_(self.predecessor) % 2**len(self.FT.FT), ip_addr = self.predecessor)
+        routing = self.FT
+        if routing.predecessor is None:
+            return SuccessorResponse()
+        return SuccessorResponse(node_id = str(routing.predecessor_id), ip_addr = routing.predecessor)
       
       
     def set_successor(self, request: setPredecessorRequest, context)-> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
@@ -815,8 +2354,7 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
           chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response.
         
         '''
-        self.successor = request.ip_addr
-        self.FT.FT[0] = (self.FT.FT[0][0], self._hash_(request.ip_addr) % 2**len(self.FT.FT), request.ip_addr)
+        self._publish_({0: (self._hash_(request.ip_addr), request.ip_addr)}, successor = request.ip_addr)
         return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
         
         
@@ -842,55 +2380,375 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
         return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty() 
     
     
-    def _in_between_(self, node_id_lobound, node_id_upbound, key_id) -> bool:
+    def install_routing_state(self, request: RoutingState, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
         '''
-        _in_between_
-        ============
-        Checks if the key_id is in the range between the specified lower and upper bounds.
+        install_routing_state
+        =====================
+        
+        Installs the predecessor, the successor and the finger table computed for the node by a bulk ring builder.
 
         Args:
-          node_id_lobound: The lower bound of the range.
-          node_id_upbound: The upper bound of the range.
-          key_id: The key_id to be checked.
+          request(RoutingState): gRPC request containing the IP addresses of the predecessor and the successor 
+          and the entries of the finger table.
+          context: The context of the gRPC communication.
+          
+        Note:
+          The finger starts are derived by the node itself, so a state whose starts differ(e.g. computed for another 
+          identifier space) is rejected with INVALID_ARGUMENT and the node keeps its current state.
+          
+        Returns:
+          chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response.
+        
+        '''
+        if [int(entry.start) for entry in request.fingers] != [entry[0] for entry in self.FT.FT]:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"The finger starts don't match the ones of node {self._own_key()}.")
+            return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
         
+        routing = self._publish_({i: (int(entry.node), entry.node_ip) for i, entry in enumerate(request.fingers)},
+                                 predecessor = request.predecessor_ip_addr, successor = request.successor_ip_addr)
+        if self.tracer.info:
+            self.tracer.event(INFO, "install_routing_state", version = routing.version, predecessor = routing.predecessor, successor = routing.successor)
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
+
+
+    def notify(self, request: setPredecessorRequest, context) -> chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty():
+        '''
+        notify
+        ======
+        
+        Handles the notification of a node that believes to be the predecessor of the current node.
+
+        Args:
+          request(setPredecessorRequest): gRPC request containing the IP address of the notifying node.
+          context: The context of the gRPC communication.
+          
         Note:
-          This method checks if the key_id falls within the range specified by the lower and upper bounds.
-          The range is considered inclusive at the lower bound and exclusive at the upper bound.
-          The method handles two cases: 
-          1. Basic condition: The lower bound is less than the upper bound and the key_id is in the range.
-          2. Rewind condition: The lower bound is greater than the upper bound and the key_id
-          is in the range after considering the wrap-around of the identifier space.
-      
+          Part of the stabilization protocol(JOIN_MODE = 'stabilize'). The notifying node becomes the predecessor 
+          if the predecessor is unknown or if the notifying node lies between the predecessor and the current node.
+          
         Returns:
-          bool: True if the key_id is in the specified range, False otherwise.
+          chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty: An empty response.
+        
+        '''
+        with self.routing_lock:
+            if self.predecessor is None or self.ring.in_open(self.FT.predecessor_id, self._own_key(), self._hash_(request.ip_addr)):
+                if self.tracer.info:
+                    self.tracer.event(INFO, "notify", predecessor = request.ip_addr)
+                self.predecessor = request.ip_addr
+        return chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()
 
+
+    def stabilize(self) -> None:
         '''
-        basic_condition = node_id_lobound < node_id_upbound and key_id in range(node_id_lobound,node_id_upbound) 
-        rewind_condition = node_id_lobound > node_id_upbound and key_id in chain(range(node_id_lobound, 2**(len(self.FT.FT)) + 1), range(0,node_id_upbound))
+        stabilize
+        =========
         
-        return basic_condition or rewind_condition
-      
+        Verifies the successor of the current node and notifies the successor about the current node.
+
+        Note:
+          If the predecessor of the successor lies between the current node and the successor, it's a node that has joined 
+          in between and becomes the successor. Run every STABILIZE_PERIOD seconds in stabilization mode.
+        
+        Raises:
+          grpc.RpcError: If the successor cannot be reached.
+        
+        '''
+        self._adopt_successor_(self.__establish_comm__(self.successor).get_predecessor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()))
+        self.__establish_comm__(self.successor).notify(setPredecessorRequest(ip_addr = self.ip_addr))
+
+
+    def _adopt_successor_(self, candidate: SuccessorResponse) -> None:
+        '''
+        Makes candidate, the predecessor of the successor, the successor of the current node if it lies between the two.
+        '''
+        with self.routing_lock:
+            if candidate.ip_addr and self.ring.in_open(self._own_key(), self.FT.successor_id, int(candidate.node_id)):
+                if self.tracer.info:
+                    self.tracer.event(INFO, "stabilize", successor = candidate.ip_addr, successor_id = candidate.node_id)
+                self._publish_({0: (int(candidate.node_id), candidate.ip_addr)}, successor = candidate.ip_addr)
+
+
+    def fix_fingers(self) -> None:
+        '''
+        fix_fingers
+        ===========
+        
+        Refreshes the next finger of the finger table, by looking up the successor of its start.
+
+        Note:
+          The fingers are refreshed one per call, in a round robin. The first finger, i.e. the successor, is maintained by stabilize().
+          Run every FIX_FINGERS_PERIOD seconds in stabilization mode.
+        
+        Raises:
+          grpc.RpcError: If the lookup fails.
+        
+        '''
+        i = self._next_finger_()
+        if i > 0:
+            _, node_id, node_ip = self._route_(self.FT.FT[i][0], owner_only = True)
+            self._publish_({i: (node_id, node_ip)})
+
+
+    def _next_finger_(self) -> int:
+        '''
+        Advances next_finger, in a round robin over the fingers except the first one, and returns it(0 if there's a single finger).
+        '''
+        self.next_finger = self.next_finger % (len(self.FT.FT) - 1) + 1 if len(self.FT.FT) > 1 else 0
+        return self.next_finger
+
+
+    def check_predecessor(self) -> None:
+        '''
+        check_predecessor
+        =================
+        
+        Clears the predecessor if it doesn't answer within CHECK_PREDECESSOR_PERIOD seconds, 
+        so that a live node may claim its place through notify(). Run every CHECK_PREDECESSOR_PERIOD seconds in stabilization mode.
+        
+        '''
+        predecessor = self.predecessor
+        if predecessor is None or predecessor == self.ip_addr:
+            return
+        try:
+            self.__establish_comm__(predecessor).get_successor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty(), 
+                                                               timeout = self.check_predecessor_period)
+        except grpc.RpcError as e:
+            self.logger.warning(f"Predecessor {predecessor} has failed: {e}")
+            self._drop_predecessor_(predecessor)
+
+
+    def _drop_predecessor_(self, predecessor: str) -> None:
+        '''
+        Clears the failed predecessor, unless a notify() has replaced it while it was being checked.
+        '''
+        with self.routing_lock:
+            if self.predecessor == predecessor:
+                self.predecessor = None
+
+
+    def _maintenance_tasks_(self) -> List[Tuple[object, float]]:
+        '''
+        Returns the maintenance tasks of stabilization mode, together with their periods.
+        '''
+        return [(self.stabilize, self.stabilize_period),
+                (self.fix_fingers, self.fix_fingers_period),
+                (self.check_predecessor, self.check_predecessor_period)]
+
+
+    def replicate_hot_keys(self) -> None:
+        '''
+        replicate_hot_keys
+        ==================
+        
+        Sends the invalidations of the replicas of changed keys, then replicates the keys of the node which turned hot(see HotKeys).
+
+        Note:
+          A lookup of a key reaches it through the node preceding it or through the nodes whose finger interval covers it, the nodes 
+          preceding key_id - 2^i. A hot key is replicated to its predecessor and then to the nodes preceding key_id - 2^i for 
+          increasing i, up to HOT_KEY_FANOUT distinct nodes, together with its version and HOT_KEY_TTL. Run every HOT_KEY_PERIOD 
+          seconds if HOT_KEY_RATE is set.
+        '''
+        for university, version, holders in self.hot_keys.invalidations():
+            for holder in holders:
+                try:
+                    self.__establish_comm__(holder, chordprot_pb2_grpc.DataTransferStub).invalidate_replica(ReplicaInvalidation(university = university, version = version))
+                except grpc.RpcError as e:
+                    self.logger.warning(f"Invalidating the replica of {university} at {holder} failed: {e}")
+        
+        for university in self.hot_keys.sample():
+            key_id, holders = self.ring.hash(university), list()
+            wanted = self._holders_step_(holders, self.predecessor)
+            for i in range(self.ring.exponent):
+                if not wanted:
+                    break
+                wanted = self._holders_step_(holders, self.find_predecessor((key_id - 2**i) % self.ring.size))
+            if not holders:
+                continue
+            replica = self._replica_(university, key_id, self.hot_keys.replicating(university, holders))
+            for holder in holders:
+                try:
+                    self.__establish_comm__(holder, chordprot_pb2_grpc.DataTransferStub).replicate(replica)
+                except grpc.RpcError as e:
+                    self.logger.warning(f"Replicating {university} to {holder} failed: {e}")
+            self._replicated_(replica, holders)
+
+
+    def _holders_step_(self, holders: List[str], ip_addr: str) -> bool:
+        '''
+        Adds ip_addr, the predecessor of a hot key or a node preceding key_id - 2^i, to the holders of its replicas if 
+        it's another node, returning whether further holders are wanted(fewer than HOT_KEY_FANOUT).
+        '''
+        if ip_addr is not None and ip_addr != self.ip_addr and ip_addr not in holders:
+            holders.append(ip_addr)
+        return len(holders) < self.hot_keys.fanout
+
+
+    def _replicated_(self, replica: KeyReplica, holders: List[str]) -> None:
+        '''
+        Traces the replication of a hot key to its holders.
+        '''
+        if self.tracer.info:
+            self.tracer.event(INFO, "replicate_hot_key", university = replica.university, version = replica.version, holders = holders)
+
+
+    def _replica_(self, university: str, key_id: int, version: int) -> KeyReplica:
+        '''
+        Packs the records of a hot key, read after its version, into a replica.
+        '''
+        data = map(lambda scientist: CompScientistData(Surname = scientist.get("surname"),
+                                                       Education = scientist.get("education"),
+                                                       Awards = scientist.get("awards")), self.chordDb.fetch_data(university))
+        return KeyReplica(key_id = str(key_id), university = university, version = version, ttl = self.hot_keys.ttl,
+                          owner_ip_addr = self.ip_addr, data = data)
+
+
+    def sync_replicas(self) -> None:
+        '''
+        sync_replicas
+        =============
+
+        Keeps the successor replicas of the node's data(see SuccessorReplicas) in step with the ring. Run every 
+        REPLICA_SYNC_PERIOD seconds with REPLICATION_FACTOR above 1, and by a node once it has joined.
+
+        Walks the REPLICATION_FACTOR - 1 successors of the node, streams all of its data to the ones which joined its chain 
+        since the latest sync, or to all of them once its range or its data changed outside store(), and releases the 
+        replicas of the ones which left the chain. Stores wait for the sync, so they are pipelined to the new chain.
+        The replicas the node holds of owners lying inside its own range, i.e. predecessors which left, are dropped.
+
+        Raises:
+          grpc.RpcError: If a successor of the chain can't be synced, in which case the next run syncs it again.
+
+        '''
+        if self.FT.predecessor is None:
+            return
+        chain = self._successor_chain_()
+        self.chordDb.write_disk() # a node holding no data may have never opened its database
+        with self.successor_replicas.gated(exclusive = True):
+            start, targets, released = self._sync_plan_(chain)
+            for ip_addr in targets:
+                self.__establish_comm__(ip_addr, chordprot_pb2_grpc.DataTransferStub).sync_replica(self._replica_chunks_(start))
+            for ip_addr in released:
+                try:
+                    self.__establish_comm__(ip_addr, chordprot_pb2_grpc.DataTransferStub).release_replica(ReplicaRelease(owner_ip_addr = self.ip_addr))
+                except grpc.RpcError as e:
+                    self.logger.warning(f"Releasing the replica held by {ip_addr} failed: {e}")
+            self.successor_replicas.synced(chain, start)
+        self._synced_(chain, targets, released)
+
+
+    def _sync_plan_(self, chain: List[str]) -> Tuple[int, List[str], List[str]]:
+        '''
+        Plans a sync of the successor replicas of the node, once stores are held back(see SuccessorReplicas.plan).
+
+        Returns:
+          Tuple[int, List[str], List[str]]: The start of the range of the node, the successors to sync and the ones to release.
+        '''
+        start = self.FT.predecessor_id
+        return (start, *self.successor_replicas.plan(chain, start))
+
+
+    def _synced_(self, chain: List[str], targets: List[str], released: List[str]) -> None:
+        '''
+        Ends a sync of the successor replicas of the node, dropping the replicas it holds within its own range.
+        '''
+        self._release_own_range_()
+        if (targets or released) and self.tracer.info:
+            self.tracer.event(INFO, "sync_replicas", chain = chain, synced = targets, released = released)
+
+
+    def _successor_chain_(self) -> List[str]:
+        '''
+        Returns the REPLICATION_FACTOR - 1 successors of the node, nearest first, fewer in a smaller ring.
+        '''
+        chain, ip_addr = list(), self.successor
+        while self._chain_step_(chain, ip_addr):
+            ip_addr = self.__establish_comm__(ip_addr).get_successor(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty()).ip_addr
+        return chain
+
+
+    def _chain_step_(self, chain: List[str], ip_addr: str) -> bool:
+        '''
+        Appends ip_addr, the next successor, to the chain of the node unless the walk has come around the ring, 
+        returning whether the successor of ip_addr is looked up next.
+        '''
+        if not ip_addr or ip_addr == self.ip_addr or ip_addr in chain or len(chain) >= self.successor_replicas.factor - 1:
+            return False
+        chain.append(ip_addr)
+        return len(chain) < self.successor_replicas.factor - 1
+
+
+    def _replica_chunks_(self, start: int):
+        '''
+        Yields all the data of the node as ReplicaChunks of HANDOFF_CHUNK_SIZE records for a full sync, followed by an empty last chunk.
+        '''
+        records = self.chordDb.fetch_chunk(None, 0, self.handoff_chunk)
+        while records:
+            yield ReplicaChunk(owner_ip_addr = self.ip_addr, start_id = str(start),
+                               data = map(lambda scientist: CompScientistData(Surname = scientist.get("surname"),
+                                                                             Education = scientist.get("education"),
+                                                                             Awards = scientist.get("awards"),
+                                                                             Hash = str(scientist.get("hash_value"))), records))
+            records = self.chordDb.fetch_chunk(None, records[-1].get("id"), self.handoff_chunk)
+        yield ReplicaChunk(owner_ip_addr = self.ip_addr, start_id = str(start), last = True)
+
+
+    def _release_own_range_(self) -> None:
+        '''
+        Drops the successor replicas of the owners lying inside the range of the node, which it has taken over.
+        '''
+        routing = self.FT
+        if routing.predecessor is not None and self.successor_replicas.release_within(routing.predecessor_id, self._own_key()):
+            self.query_cache.invalidate_keys(lambda key: self.ring.in_half_open(routing.predecessor_id, self._own_key(), key))
+
+
+    def _replica_engine_(self, name: str) -> StorageEngine:
+        '''
+        Returns a new storage engine for a successor replica, of the kind of the node's database(unsharded), replacing
+        any file left under its name by an earlier run.
+        '''
+        memory = isinstance(self.chordDb, memoryDb)
+        db_name = f"{self.ip_addr}_replica.{name}.{'mem' if memory else 'db'}"
+        if os.path.exists(os.path.join("./Data", db_name)):
+            os.remove(os.path.join("./Data", db_name))
+        return memoryDb(tracer = self.tracer, db_name = db_name) if memory else chordDb(tracer = self.tracer, db_name = db_name)
+
+
+    def _maintain_(self, task, period: float) -> None:
+        '''
+        Runs a maintenance task every period seconds, once the node has joined the ring and until it leaves.
+        '''
+        while True:
+            sleep(period)
+            if self.successor is None:
+                continue
+            try:
+                task()
+            except grpc.RpcError as e:
+                self.logger.warning(f"Maintenance task {task.__name__} failed: {e}")
+            except Exception as e:
+                self.logger.error(f"Error occured during maintenance task {task.__name__}: {e}")
+
 
     def _hash_(self, data) -> int:
         '''
         _hash_
         ======
-        Computes the SHA-256 hash and returns it as an integer.
+        Returns the identifier of a node on the Chord ring, given its IP address.
 
         Args:
-          data: The data to be hashed.
+          data: The IP address of the node.
         
         Note:
-          This method takes input data, encodes it in UTF-8, computes the SHA-256 hash
-          and returns the hash value as an integer.
+          The identifier is the SHA-256 hash of the address reduced modulo the size of the identifier space(2^FT_SIZE). 
+          It's taken from the process-wide identity registry of the ring(see ChordRing.node_id()), so every 
+          address is hashed once, the first time the node meets it.
 
         Returns:
-          int: The integer representation of the SHA-256 hash.
+          int: The identifier of the node on the Chord ring.
 
         '''
-        sha256 = hashlib.sha256()
-        sha256.update(data.encode('utf-8'))
-        return int(sha256.hexdigest(), 16)
+        return self.ring.node_id(data)
       
 
     def _own_key(self) -> int:
@@ -898,25 +2756,65 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
         _own_key
         ========
         
-        Computes and returns the Chord key corresponding to the node's IP address.
+        Returns the Chord key corresponding to the node's IP address.
         
         Note:
-         This method computes the Chord key for the current node based on its IP address.
-         It utilizes the `_hash_` method to generate a SHA-256 hash and then takes the modulo
-         with the size of the identifier space defined by the finger table.
+         The key is computed once, when the node starts, and kept in the node_id attribute.
 
         Returns:
          int: The Chord key calculated from the node's IP address.
         
         '''
-        return self._hash_(self.ip_addr) % 2**len(self.FT.FT)
+        return self.node_id
 
     def clear_hops(self, request, context) -> HopsResponse:
       hops = self.hopCounter.hops
       self.hopCounter.reset_hops()
       return HopsResponse(num_hops = hops)
     
-    def __establish_comm__(self, rpc_caller: str) -> None:
+    def get_cache_stats(self, request, context) -> CacheStats:
+      '''
+      Returns the counters of the query cache of the node(see QueryCache) and of the replicas of hot keys(see HotKeys).
+      '''
+      cache = self.query_cache
+      return CacheStats(hits = cache.hits, misses = cache.misses, evictions = cache.evictions, 
+                        entries = len(cache.entries), capacity = cache.capacity, replica_hits = self.replicas.hits,
+                        replicas = len(self.replicas.entries), hot_keys = len(self.hot_keys.replicated))
+    
+    def get_trace(self, request: TraceRequest, context) -> TraceResponse:
+      '''
+      get_trace
+      =========
+      
+      Returns the events buffered by the tracer of the node and, optionally, changes its trace level.
+
+      Args:
+        request(TraceRequest): gRPC request containing the sequence number of the last event already fetched, 
+        the maximum number of events to return and, optionally, the new trace level.
+        context: The context of the gRPC communication.
+
+      Note:
+        The fields of the events are formatted here, when they're fetched, rather than when they're recorded.
+        An unknown trace level is rejected with INVALID_ARGUMENT.
+
+      Returns:
+        TraceResponse: The events, oldest first, and the trace level in effect.
+      
+      '''
+      if request.HasField("level"):
+        try:
+          self.tracer.set_level(request.level)
+        except ValueError as e:
+          context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+          context.set_details(str(e))
+          return TraceResponse()
+      
+      events = [TraceEvent(seq = seq, timestamp = timestamp, level = LEVEL_NAMES[level], name = name,
+                           fields = {key: str(value) for key, value in fields.items()})
+                for seq, timestamp, level, name, fields in self.tracer.fetch(request.since, request.limit)]
+      return TraceResponse(events = events, level = LEVEL_NAMES[self.tracer.level])
+    
+    def __establish_comm__(self, rpc_caller: str, stub_class = chordprot_pb2_grpc.ChordStub):
       '''
       __establish_comm__
       ==================
@@ -925,24 +2823,33 @@ class ChordNode(chordprot_pb2_grpc.ChordServicer, chordprot_pb2_grpc.DataTransfe
 
       Args:
         rpc_caller(str): The IP address of the node to establish communication with.
+        stub_class: The stub class of the service to call, chordprot_pb2_grpc.ChordStub by default.
 
       Note:
         This method is used to establish a gRPC communication channel with the node specified
-        by the 'rpc_caller' parameter. It creates an insecure gRPC channel and returns the corresponding
-        gRPC stub, which can be used for making gRPC calls to the specified node.
+        by the 'rpc_caller' parameter. The channel is taken from the node's channel pool, which reuses one 
+        keepalive channel per peer across calls and threads, and the corresponding gRPC stub is returned.
+        
+        Calls addressed to the current node itself(e.g. from find_predecessor() or update_others()) are not sent 
+        over the network: a LocalStub dispatches them to the servicer methods in-process, which neither serializes 
+        the request nor occupies one of the server's worker threads. The hops counter records them either way.
       
       Returns:
           chordprot_pb2_grpc.ChordStub: The gRPC stub for communication with the specified node.
       
       '''
-      channel = grpc.insecure_channel(str(rpc_caller)+":50051")
-      self.stub = chordprot_pb2_grpc.ChordStub(channel)
-      return self.stub
+      if str(rpc_caller) == self.ip_addr:
+        return self.local_stubs[stub_class]
+      return self.channels.stub(rpc_caller, stub_class)
 
   
     
 if __name__ == '__main__':
-    node = ChordNode()  
+    if os.environ.get("SERVER_MODE", "thread") == "aio":
+        from aioChordNode import AioChordNode
+        node = AioChordNode()
+    else:
+        node = ChordNode()  
     print(f"{'=='*5} Starting Node Process {'=='*5}\nIp address: {node.ip_addr}")
     print(f"Computed values of 'start' field at FT:  ")
     for el in node.FT.FT:
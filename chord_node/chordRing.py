@@ -0,0 +1,248 @@
+import hashlib
+from bisect import bisect_left
+from typing import List, Sequence, Tuple
+
+
+class ChordRing:
+    '''
+    Modular arithmetic over the identifier space of the Chord ring.
+
+    The identifier space consists of the integers in [0, 2^m) arranged on a circle. All interval
+    tests are answered in constant time with modular comparisons, so the exponent m can be raised
+    up to the full width of SHA-256 (m = 256) without slowing down routing decisions.
+
+    Attributes:
+        exponent(int): The number of bits of an identifier (m). Equals the size of a finger table.
+        size(int): The number of identifiers on the ring (2^m).
+
+    '''
+
+    KEY_WIDTH = 64  # hex digits of a SHA-256 digest, width of a stored key
+    _identities = dict()  # (exponent, node address) -> node_id, shared by every ring of the process
+
+    def __init__(self, exponent: int) -> None:
+        self.exponent = int(exponent)
+        self.size = 2**self.exponent
+
+
+    def hash(self, data: str) -> int:
+        '''
+        hash
+        ====
+        Computes the SHA-256 hash of data and maps it onto the ring.
+
+        Args:
+          data(str): The data to be hashed, e.g. an IP address or a university name.
+
+        Returns:
+          int: The identifier of data, in [0, 2^m).
+
+        '''
+        digest = hashlib.sha256(data.encode('utf-8')).digest()
+        return int.from_bytes(digest, 'big') % self.size
+
+
+    def node_id(self, ip_addr: str) -> int:
+        '''
+        node_id
+        =======
+        Returns the identifier of the node at ip_addr, hashing the address only the first time the process meets it.
+
+        Note:
+          The identifiers of node addresses are cached in a registry shared by every ChordRing of the process, 
+          since the same few addresses are looked up on every routing decision. The registry grows with the 
+          number of distinct nodes seen. Arbitrary data, e.g. the keys of the records, is hashed with hash().
+
+        Returns:
+          int: The identifier of the node, in [0, 2^m).
+
+        '''
+        key = (self.exponent, ip_addr)
+        node_id = ChordRing._identities.get(key)
+        if node_id is None:
+            node_id = ChordRing._identities[key] = self.hash(ip_addr)
+        return node_id
+
+
+    def in_between(self, lobound: int, upbound: int, key_id: int) -> bool:
+        '''
+        in_between
+        ==========
+        Checks if key_id lies in the half-open ring interval [lobound, upbound).
+
+        Note:
+          Bounds are reduced modulo 2^m first, so callers may pass e.g. node_id + 1 without wrapping it.
+          The interval walks clockwise from lobound and wraps around zero when lobound > upbound.
+          Equal bounds denote an empty interval.
+
+        Returns:
+          bool: True if key_id is in the interval, False otherwise.
+
+        '''
+        lobound, upbound, key_id = lobound % self.size, upbound % self.size, key_id % self.size
+        if lobound < upbound:
+            return lobound <= key_id < upbound
+        if lobound > upbound:
+            return key_id >= lobound or key_id < upbound
+        return False
+
+
+    def in_open(self, lobound: int, upbound: int, key_id: int) -> bool:
+        '''
+        Checks if key_id lies in the open ring interval (lobound, upbound).
+        '''
+        return self.in_between(lobound + 1, upbound, key_id)
+
+
+    def in_half_open(self, lobound: int, upbound: int, key_id: int) -> bool:
+        '''
+        Checks if key_id lies in the ring interval (lobound, upbound], e.g. the keys owned by upbound.
+        '''
+        return self.in_between(lobound + 1, upbound + 1, key_id)
+
+
+    def distance(self, from_id: int, to_id: int) -> int:
+        '''
+        Returns the clockwise distance from from_id to to_id.
+        '''
+        return (to_id - from_id) % self.size
+
+
+    def finger_starts(self, node_id: int) -> List[int]:
+        '''
+        finger_starts
+        =============
+        Computes the 'start' field of every finger of node_id, i.e. (node_id + 2^i) mod 2^m for 0 <= i < m.
+
+        Returns:
+          List[int]: The m finger starts of the node.
+
+        '''
+        node_id %= self.size
+        return [(node_id + 2**i) % self.size for i in range(self.exponent)]
+
+
+    def finger_covering(self, node_id: int, key_id: int) -> int:
+        '''
+        finger_covering
+        ===============
+        Finds the finger of node_id whose interval [start, next start) contains key_id.
+
+        Note:
+          Finger i starts at node_id + 2^i, so its position is the index of the highest set bit of the
+          clockwise distance from node_id to key_id.
+
+        Returns:
+          int: The position of the finger in the finger table, or -1 if key_id equals node_id.
+
+        '''
+        return self.distance(node_id, key_id).bit_length() - 1
+
+
+    def successor_id(self, key_id: int, sorted_ids: Sequence[int]) -> int:
+        '''
+        successor_id
+        ============
+        Finds, by bisection, the first identifier at or after key_id in a sorted list of node identifiers.
+
+        Args:
+          key_id(int): The identifier to look up.
+          sorted_ids(Sequence[int]): The ascending identifiers of the nodes on the ring.
+
+        Returns:
+          int: The identifier of the node responsible for key_id.
+
+        '''
+        position = bisect_left(sorted_ids, key_id % self.size)
+        return sorted_ids[position % len(sorted_ids)]
+
+
+    def finger_nodes(self, node_id: int, sorted_ids: Sequence[int]) -> List[int]:
+        '''
+        finger_nodes
+        ============
+        Computes the finger table of node_id on a ring whose membership is fully known, e.g. by a bulk ring builder.
+
+        Args:
+          node_id(int): The identifier of the node owning the fingers.
+          sorted_ids(Sequence[int]): The ascending identifiers of the nodes on the ring.
+
+        Returns:
+          List[int]: The identifier of the successor of every finger start of the node.
+
+        '''
+        return [self.successor_id(start, sorted_ids) for start in self.finger_starts(node_id)]
+
+
+    def finger_index(self, node_id: int, fingers: Sequence[Tuple[int, int, str]]) -> Tuple[List[int], List[int]]:
+        '''
+        finger_index
+        ============
+        Builds the sorted index used by closest_preceding().
+
+        Args:
+          node_id(int): The identifier of the node owning the fingers.
+          fingers(Sequence[Tuple[int, int, str]]): The finger table entries (start, node, node_ip). Entries without
+          a node_ip are not known yet and are left out of the index.
+
+        Returns:
+          Tuple[List[int], List[int]]: The clockwise distances of the finger nodes from node_id in ascending
+          order and the positions of the corresponding entries in the finger table.
+
+        '''
+        ordered = sorted((self.distance(node_id, entry[1]), i) for i, entry in enumerate(fingers) if entry[2])
+        return [distance for distance, _ in ordered], [i for _, i in ordered]
+
+
+    def closest_preceding(self, node_id: int, key_id: int, index: Tuple[List[int], List[int]]) -> int:
+        '''
+        closest_preceding
+        =================
+        Finds the finger of node_id that most closely precedes key_id.
+
+        Args:
+          node_id(int): The identifier of the node owning the fingers.
+          key_id(int): The identifier being looked up.
+          index(Tuple[List[int], List[int]]): The finger index returned by finger_index().
+
+        Note:
+          The closest preceding finger is the finger node in (node_id, key_id) that lies furthest from node_id.
+          Since the distances are sorted it is found by bisection instead of a scan of the whole table.
+
+        Returns:
+          int: The position of the finger in the finger table, or -1 if no finger lies in (node_id, key_id).
+
+        '''
+        distances, positions = index
+        # (node_id, node_id) spans the whole ring except node_id itself.
+        key_distance = (key_id - node_id - 1) % self.size + 1
+        at = bisect_left(distances, key_distance) - 1
+        if at < 0 or distances[at] == 0:
+            return -1
+        return positions[at]
+
+
+    @staticmethod
+    def key_repr(key_id: int) -> str:
+        '''
+        Encodes an identifier as fixed-width hex, whose lexicographic order matches the numeric one.
+        '''
+        return f"{int(key_id):0{ChordRing.KEY_WIDTH}x}"
+
+
+    @staticmethod
+    def key_value(key_repr: str) -> int:
+        '''
+        Decodes an identifier encoded by key_repr().
+        '''
+        return int(key_repr, 16)
+
+
+    @staticmethod
+    def in_range(key_range: Tuple[int, int], key_id: int) -> bool:
+        '''
+        Checks if key_id lies in the ring interval (start, end] of key_range, for identifiers already on the ring, 
+        e.g. the hash values of stored records. Equal bounds denote an empty interval, as in in_half_open().
+        '''
+        start, end = map(int, key_range)
+        return start < key_id <= end if start <= end else key_id > start or key_id <= end
@@ -1,26 +1,49 @@
 from grpc import ServerInterceptor
+from grpc import aio
+from tracer import Tracer, DEBUG
+
+
+# calls that don't route a lookup or a finger update, thus aren't hops
+EXCLUDED_METHODS = frozenset([f"/chordprot.Chord/{method}" for method in 
+                              ["get_successor", "set_successor", "get_predecessor", "set_predecessor", "join",\
+                               "leave", "clear_hops", "notify", "install_routing_state", "get_trace", "get_cache_stats"]] +\
+                             [f"/chordprot.DataTransfer/{method}" for method in
+                              ["store", "request_data", "get_data", "get_finger_table", "stream_data", "ack_data", "handoff",\
+                               "pull_shards", "push_shards", "release_shards", "replicate", "invalidate_replica",\
+                               "store_replica", "sync_replica", "release_replica"]])
 
 
 class HopsCounterInterceptor(ServerInterceptor):
     
-    def __init__(self):
+    def __init__(self, tracer = None):
         self.hops = 0
+        self.tracer = tracer if tracer is not None else Tracer("off")
         
     def intercept_service(self, continuation, handler_call_details):
         
-        excluded_methods = ["get_successor", "set_successor", "get_predecessor", "set_predecessor", "get_data", "join",\
-                            "leave", "request_data", "get_finger_table", "store","clear_hops"]
-
-        excluded_methods = list(map(lambda method: f"/chordprot.Chord/{method}", excluded_methods))
-        
-        if handler_call_details.method not in excluded_methods:
-            print(f"Method called: {handler_call_details.method}")
-            self.hops += 1
+        self.record(handler_call_details.method)
         
         response =  continuation(handler_call_details)
 
         return response
 
+    def record(self, method):
+        # also called directly for requests a node dispatches to itself in-process
+        if method not in EXCLUDED_METHODS:
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "hop", method = method)
+            self.hops += 1
+
     def reset_hops(self):
         self.hops = 0 
-        print(f"Hops have been reset")
\ No newline at end of file
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "reset_hops")
+
+
+class AioHopsCounterInterceptor(HopsCounterInterceptor, aio.ServerInterceptor):
+    
+    async def intercept_service(self, continuation, handler_call_details):
+        
+        self.record(handler_call_details.method)
+        
+        return await continuation(handler_call_details)
@@ -0,0 +1,216 @@
+from bisect import bisect_left
+from threading import Lock
+from time import monotonic
+from typing import Callable, Iterable, List, Optional, Tuple
+from generatedStubs.chordprot_pb2 import DataTransferResponse
+
+
+class HotKeys:
+    '''
+    Owner side tracking of the request rates of the keys(universities) of a node, and of the replicas of the hot ones.
+
+    get_data() records every query the node answers from its own database. Every HOT_KEY_PERIOD seconds the node's
+    replicate_hot_keys() task samples the rates since the previous sample: the universities queried at least HOT_KEY_RATE
+    times per second are hot, and are replicated to the nodes preceding them on the lookup paths, unless replicas of
+    theirs are already live for more than another period. Replicas expire after HOT_KEY_TTL seconds.
+
+    Each replicated university has a version, advanced whenever its data changes(see changed()). A replica carries
+    the version read before its data, and the holders of the replicas of a changed university are queued for an
+    invalidation with the new version, which makes them drop the replica and reject any older one still on its way.
+
+    Attributes:
+        rate(float): The requests per second from which a university is hot(HOT_KEY_RATE, 0 disables replication).
+        period(float): The seconds between samples(HOT_KEY_PERIOD).
+        ttl(float): The seconds a replica lives(HOT_KEY_TTL).
+        fanout(int): The maximum number of replicas of a university(HOT_KEY_FANOUT).
+        counts(Dict[str, int]): The queries of each university since the latest sample.
+        replicated(Dict[str, Tuple[List[str], float]]): The holders of the replicas of each university and their expiry time.
+        versions(Dict[str, int]): The version of the data of each university ever replicated.
+        stale(Dict[str, List[str]]): The holders of the replicas of each changed university, awaiting an invalidation.
+
+    '''
+
+    def __init__(self, rate: float, period: float, ttl: float, fanout: int) -> None:
+        self.rate = float(rate)
+        self.period = float(period)
+        self.ttl = float(ttl)
+        self.fanout = max(1, int(fanout))
+        self.lock = Lock()
+        self.counts = dict()
+        self.sampled_at = monotonic()
+        self.replicated = dict()
+        self.versions = dict()
+        self.stale = dict()
+
+
+    def record(self, university: str) -> None:
+        '''
+        Counts a query of the given university answered by the node.
+        '''
+        if self.rate > 0:
+            with self.lock:
+                self.counts[university] = self.counts.get(university, 0) + 1
+
+
+    def sample(self) -> List[str]:
+        '''
+        sample
+        ======
+
+        Returns the universities queried at least rate times per second since the latest sample, without replicas
+        live for another period, and starts a new sample.
+
+        '''
+        with self.lock:
+            now = monotonic()
+            elapsed, self.sampled_at = max(now - self.sampled_at, 1e-9), now
+            counts, self.counts = self.counts, dict()
+            return [university for university, count in counts.items() if count / elapsed >= self.rate
+                    and self.replicated.get(university, (None, 0))[1] - now <= self.period]
+
+
+    def replicating(self, university: str, holders: List[str]) -> int:
+        '''
+        Registers the holders of new replicas of a university, before its data is read for them, and returns their version.
+        The holders of earlier replicas still live are kept, to be invalidated along with the new ones.
+        '''
+        with self.lock:
+            now = monotonic()
+            earlier, expiry = self.replicated.get(university, ([], 0))
+            holders = sorted(set(holders) | (set(earlier) if expiry > now else set()))
+            self.replicated[university] = (holders, now + self.ttl)
+            return self.versions.setdefault(university, 0)
+
+
+    def changed(self, universities: Iterable[str] = None, covered: Callable[[str], bool] = None) -> None:
+        '''
+        changed
+        =======
+
+        Advances the versions of the replicated universities whose data changed, the given ones, the ones covered,
+        or all of them if neither is given, queuing the holders of their replicas for an invalidation.
+
+        '''
+        with self.lock:
+            if universities is not None:
+                universities = [university for university in universities if university in self.replicated]
+            else:
+                universities = [university for university in self.replicated if covered is None or covered(university)]
+            for university in universities:
+                self.versions[university] += 1
+                holders, _ = self.replicated.pop(university)
+                self.stale[university] = sorted(set(self.stale.get(university, [])) | set(holders))
+
+
+    def invalidations(self) -> List[Tuple[str, int, List[str]]]:
+        '''
+        Returns and clears the queued invalidations, as (university, version, holders) tuples.
+        '''
+        with self.lock:
+            stale, self.stale = self.stale, dict()
+            return [(university, self.versions[university], holders) for university, holders in stale.items()]
+
+
+class Replicas:
+    '''
+    Holder side store of the replicas of hot keys pushed by their owners(see HotKeys).
+
+    A live replica answers the get_data() queries of its university for any threshold, with the tail of its records
+    sorted by awards, and lets a read lookup of that university reaching the node stop there(see
+    ChordNode.find_successor()). An expired or invalidated replica is kept as a tombstone until its expiry, holding the
+    owner to forward the queries of lookups it answered to, and the version below which replicas of its university are
+    rejected.
+
+    Attributes:
+        entries(Dict[str, tuple]): The (key_id, version, expiry, owner, awards, response) replica of each university,
+        its response set to None once invalidated.
+        hits(int): The number of queries answered by a replica.
+
+    '''
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.entries = dict()
+        self.hits = 0
+
+
+    def install(self, university: str, key_id: int, version: int, ttl: float, owner: str, data) -> bool:
+        '''
+        install
+        =======
+
+        Installs the replica of a university, unless a later version of it is held or was invalidated.
+
+        Args:
+            university(str): The university replicated.
+            key_id(int): The key of the university.
+            version(int): The version of the data of the university.
+            ttl(float): The seconds the replica lives.
+            owner(str): The IP address of the owner of the university.
+            data: The CompScientistData records of the university.
+
+        Returns:
+            bool: Whether the replica was installed.
+
+        '''
+        records = sorted(data, key = lambda scientist: scientist.Awards)
+        entry = (key_id, version, monotonic() + ttl, owner, [scientist.Awards for scientist in records], DataTransferResponse(data = records))
+        with self.lock:
+            held = self.entries.get(university)
+            if held is not None and held[1] > version:
+                return False
+            self._prune_()
+            self.entries[university] = entry
+            return True
+
+
+    def invalidate(self, university: str, version: int) -> None:
+        '''
+        Turns the replica of a university older than version into a tombstone, rejecting the older replicas to come.
+        '''
+        with self.lock:
+            held = self.entries.get(university)
+            if held is not None and held[1] < version:
+                key_id, _, expiry, owner = held[:4]
+                self.entries[university] = (key_id, version, expiry, owner, [], None)
+
+
+    def holds(self, key_id: int, university: str) -> bool:
+        '''
+        Returns whether the node holds a live replica of the given university under key_id. Universities may share a key,
+        so a replica of one doesn't stand for the others.
+        '''
+        entry = self.entries.get(university) if university else None
+        return entry is not None and entry[0] == key_id and entry[5] is not None and entry[2] > monotonic()
+
+
+    def lookup(self, university: str, threshold: int) -> Tuple[Optional[DataTransferResponse], Optional[str]]:
+        '''
+        lookup
+        ======
+
+        Answers a query from the replica of its university.
+
+        Returns:
+            Tuple[DataTransferResponse, str]: The response of a live replica(or None), and the owner of the university
+            if the node held a replica of it which expired or was invalidated(or None).
+
+        '''
+        entry = self.entries.get(university)
+        if entry is None:
+            return None, None
+        _, _, expiry, owner, awards, response = entry
+        if response is None or expiry <= monotonic():
+            return None, owner
+        self.hits += 1
+        start = bisect_left(awards, threshold)
+        return (response if start == 0 else DataTransferResponse(data = response.data[start:])), owner
+
+
+    def _prune_(self) -> None:
+        '''
+        Removes the replicas and tombstones past their expiry.
+        '''
+        now = monotonic()
+        for university in [university for university, entry in self.entries.items() if entry[2] <= now]:
+            del self.entries[university]
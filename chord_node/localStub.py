@@ -0,0 +1,94 @@
+import grpc
+from inspect import isawaitable
+
+
+class LocalRpcError(grpc.RpcError):
+    '''
+    The error raised by a LocalStub call whose handler set a status code other than OK,
+    mirroring the grpc.RpcError a remote caller would receive.
+    '''
+
+    def __init__(self, code, details):
+        super().__init__(f"{code}: {details}")
+        self._code = code
+        self._details = details
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+
+class LocalContext:
+    '''
+    Minimal stand-in for grpc.ServicerContext, handed to servicer methods invoked in-process.
+    '''
+
+    def __init__(self):
+        self.code = grpc.StatusCode.OK
+        self.details = None
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        self.details = details
+
+    def is_active(self):
+        return True
+
+
+class LocalStub:
+    '''
+    A drop-in replacement for a ChordStub addressed to the local node.
+
+    Calls are dispatched straight to the servicer methods of the node, without serializing
+    the request or occupying a worker thread of the node's own server. Each call is still
+    recorded by the hops counter, exactly as the server interceptor would record it.
+
+    Attributes:
+        servicer: The ChordNode serving the calls.
+        hops_counter(HopsCounterInterceptor): The interceptor counting the node's hops.
+        service(str): The fully qualified name of the emulated gRPC service.
+
+    '''
+
+    def __init__(self, servicer, hops_counter, service = "chordprot.Chord"):
+        self.servicer = servicer
+        self.hops_counter = hops_counter
+        self.service = service
+
+    def __getattr__(self, method):
+        handler = getattr(self.servicer, method)
+
+        def call(request, timeout = None, metadata = None):
+            self.hops_counter.record(f"/{self.service}/{method}")
+            context = LocalContext()
+            response = handler(request, context)
+            if context.code != grpc.StatusCode.OK:
+                raise LocalRpcError(context.code, context.details)
+            return response
+
+        return call
+
+
+class AioLocalStub(LocalStub):
+    '''
+    The asyncio counterpart of LocalStub: every call is a coroutine, awaiting the servicer method if it's a coroutine as well.
+    '''
+
+    def __getattr__(self, method):
+        handler = getattr(self.servicer, method)
+
+        async def call(request, timeout = None, metadata = None):
+            self.hops_counter.record(f"/{self.service}/{method}")
+            context = LocalContext()
+            response = handler(request, context)
+            if isawaitable(response):
+                response = await response
+            if context.code != grpc.StatusCode.OK:
+                raise LocalRpcError(context.code, context.details)
+            return response
+
+        return call
@@ -0,0 +1,384 @@
+import os
+import json
+import logging
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from threading import Thread, RLock
+from time import sleep
+from typing import List, Dict
+from storageEngine import StorageEngine
+from chordRing import ChordRing
+from tracer import Tracer, DEBUG
+from subprocess import run
+
+
+class memoryDb(StorageEngine):
+    '''
+    In-memory storage for each Chord node.
+
+    The records are kept by id in a dictionary, along with sorted arrays indexing them: per university, the (awards, id)
+    pairs answering fetch_data() with a binary search, and across universities the (hash value, id) pairs, whose slice
+    between two hash values is the range extracted by fetch_and_delete_data(). Ids ascend in the order records are stored,
+    so the array of the ids is sorted too and the chunks of a handoff(fetch_chunk) start with a binary search as well.
+    Stored records are appended to the arrays, which are sorted again by the next query reading them, so a load of
+    many batches sorts each array once, as chordDb defers its indexes. All the structures are guarded by one lock,
+    which queries and updates hold for the time of an in-memory operation.
+
+    Nothing touches the disk unless DB_SNAPSHOT_PERIOD is set, in which case the records and the handoff checkpoints are
+    written to a snapshot file every that many seconds if changed, and are loaded back from it by write_disk().
+
+    Attributes:
+        db_name(str): The name of the snapshot file.
+        records(Dict[int, tuple]): The (surname, education, awards, hash value) records, by id.
+        ids(List[int]): The ids of the records, ascending.
+        universities(Dict[str, List[tuple]]): The sorted (awards, id) pairs of the records of each university.
+        hashes(List[tuple]): The sorted (hash value, id) pairs of the records.
+        unsorted(set): The universities whose pairs were appended to since sorted, None standing for the hash values.
+        checkpoints(Dict[str, int]): The last record id stored from each source of an unfinished handoff.
+        last_id(int): The id of the latest stored record.
+        snapshot_period(float): The seconds between snapshots(DB_SNAPSHOT_PERIOD, 0 never snapshots).
+        tracer(Tracer): The tracer recording the database events, usually the one of the node.
+
+    '''
+
+    def __init__(self, tracer = None, db_name = None):
+        '''
+        __init__
+        ========
+
+        Initializes the in-memory storage, loading the snapshot found on disk if snapshots are enabled.
+
+        Args:
+            tracer(Tracer): The tracer recording the database events.
+            db_name(str): The name of the snapshot file. It defaults to one named after the node's hostname.
+
+        '''
+        logging.basicConfig(level = os.environ.get("LOG_LEVEL", "INFO").upper())
+        self.logger = logging.getLogger(__name__)
+        self.tracer = tracer if tracer is not None else Tracer.from_env()
+        self.snapshot_period = float(os.environ.get("DB_SNAPSHOT_PERIOD", 0))
+        self.lock = RLock()
+        self.generation = 0
+        self.opened = False
+        self._clear_()
+        if db_name is None:
+            hostname = run("hostname -I", shell = True, capture_output = True, text = True).stdout.strip()
+            db_name = f"{hostname}_chord.mem"
+        self.db_name = db_name
+        self.path = os.path.join("./Data", self.db_name)
+        if self.snapshot_period > 0 and os.path.exists(self.path):
+            self.logger.debug("Previous snapshot found. Loading it...")
+            self.write_disk()
+
+
+    def _clear_(self) -> None:
+        '''
+        Empties the storage.
+        '''
+        self.records = dict()
+        self.ids = list()
+        self.universities = defaultdict(list)
+        self.hashes = list()
+        self.unsorted = set()
+        self.checkpoints = dict()
+        self.last_id = 0
+        self.dirty = False
+
+
+    def write_disk(self) -> None:
+        '''
+        write_disk
+        ==========
+
+        Opens the storage, loading the snapshot on disk and starting the snapshot thread if DB_SNAPSHOT_PERIOD
+        is set. It does nothing if the storage is already open.
+
+        Returns:
+            None
+        '''
+
+        with self.lock:
+            if self.opened:
+                return
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "write_disk", db_name = self.db_name)
+            self.opened = True
+            self.generation += 1
+            if self.snapshot_period <= 0:
+                return
+            if os.path.exists(self.path):
+                self._load_()
+            Thread(target = self._snapshot_loop_, args = (self.generation,), name = "memoryDb-snapshot", daemon = True).start()
+
+
+    def _load_(self) -> None:
+        '''
+        Restores the records and the checkpoints from the snapshot file.
+        '''
+        with open(self.path) as snapshot:
+            state = json.load(snapshot)
+        self._clear_()
+        self._insert_([tuple(record) for record in state["records"]])
+        self.last_id = max(self.last_id, state["last_id"])
+        self.checkpoints = state["checkpoints"]
+        self.dirty = False
+        self.logger.debug(f"Loaded {len(self.records)} records from the snapshot.")
+
+
+    def _snapshot_loop_(self, generation: int) -> None:
+        '''
+        Snapshots the storage every DB_SNAPSHOT_PERIOD seconds if it changed, until it's deleted.
+        '''
+        while True:
+            sleep(self.snapshot_period)
+            if generation != self.generation:
+                return
+            if self.dirty:
+                self.snapshot()
+
+
+    def snapshot(self) -> None:
+        '''
+        snapshot
+        ========
+
+        Writes the records and the checkpoints to the snapshot file, replacing the previous one once complete,
+        so a crash while writing leaves the previous snapshot in place. The state is copied under the lock and
+        written out of it.
+
+        Returns:
+            None
+        '''
+
+        with self.lock:
+            generation = self.generation
+            state = {"last_id": self.last_id, "checkpoints": dict(self.checkpoints),
+                     "records": [(id, *record) for id, record in self.records.items()]}
+            self.dirty = False
+        try:
+            with open(f"{self.path}.tmp", "w") as snapshot:
+                json.dump(state, snapshot)
+            with self.lock:
+                if generation == self.generation:
+                    os.replace(f"{self.path}.tmp", self.path)
+                else:
+                    os.remove(f"{self.path}.tmp")
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "snapshot", records = len(state["records"]))
+        except OSError as error:
+            self.dirty = True
+            self.logger.error(f"Error while writing the snapshot: {error}")
+
+
+    def _insert_(self, records: List[tuple]) -> None:
+        '''
+        Adds (id, surname, education, awards, hash value) records of ascending ids, above the ones stored, to the
+        storage and appends them to its indexes, leaving the arrays appended to for _index_() to sort.
+        '''
+        for id, surname, education, awards, hash_value in records:
+            self.records[id] = (surname, education, awards, hash_value)
+            self.ids.append(id)
+            self.universities[education].append((awards, id))
+            self.hashes.append((hash_value, id))
+            self.unsorted.add(education)
+        if records:
+            self.unsorted.add(None)
+            self.last_id = records[-1][0]
+            self.dirty = True
+
+
+    def _index_(self, education = None) -> List[tuple]:
+        '''
+        Returns the sorted (awards, id) pairs of the given university, or the (hash value, id) pairs if education is None,
+        sorting them first if records were appended since. Sorting a sorted array followed by a run of new pairs is a merge.
+        '''
+        entries = self.hashes if education is None else self.universities.get(education, [])
+        if education in self.unsorted:
+            entries.sort()
+            self.unsorted.discard(education)
+        return entries
+
+
+    def _delete_(self, ids: set) -> None:
+        '''
+        Removes the records of the given ids from the storage and its indexes.
+        '''
+        if not ids:
+            return
+        educations = {self.records.pop(id)[1] for id in ids}
+        self.ids = [id for id in self.ids if id not in ids]
+        self.hashes = [entry for entry in self.hashes if entry[1] not in ids]
+        for education in educations:
+            self.universities[education] = [entry for entry in self.universities[education] if entry[1] not in ids]
+            if not self.universities[education]:
+                del self.universities[education]
+                self.unsorted.discard(education)
+        self.dirty = True
+
+
+    def _output_(self, id: int) -> Dict[str, any]:
+        '''
+        Returns the record of the given id as handed over, with its 'hash_value'.
+        '''
+        surname, education, awards, hash_value = self.records[id]
+        return {"surname": surname, "education": education, "awards": awards, "hash_value": hash_value}
+
+
+    def store_data(self, data_records, source = None, last = False)-> bool:
+        '''
+        store_data
+        ==========
+
+        Stores data records in memory, indexing them by university and hash value.
+
+        The chunks of a handoff(see fetch_chunk) update the checkpoint of their source, as in chordDb.store_data:
+        records up to the checkpoint are skipped and the last chunk removes the checkpoint. A batch with a
+        malformed record is stored as a whole or not at all.
+
+        Args:
+            data_records (list): A list of dictionaries representing data records.
+                                 Each dictionary should have keys: 'Surname', 'Education', 'Awards', and 'Hash'.
+            source (str, optional): The node handing the records over in chunks, in which case records also have
+                                    the key 'Id', their ascending id at source. Default is None.
+            last (bool, optional): Whether this is the last chunk of the handoff from source. Default is False.
+
+        Returns:
+            bool: True if the data is successfully stored, False otherwise.
+
+        '''
+
+        if len(data_records) == 0 and source is None:
+            self.logger.warning("No data to store in the database.")
+            return True
+
+        try:
+
+          with self.lock:
+            if source is not None:
+              checkpoint = self.checkpoints.get(source, 0)
+              handed = [record for record in data_records if int(record['Id']) > checkpoint]
+              if last:
+                self.checkpoints.pop(source, None)
+              elif handed:
+                self.checkpoints[source] = int(handed[-1]['Id'])
+              data_records = handed
+              self.dirty = True
+            records = [(self.last_id + offset, record['Surname'], record['Education'], int(record['Awards']), int(record['Hash']))
+                       for offset, record in enumerate(data_records, 1)]
+            self._insert_(records)
+          if self.tracer.debug:
+            self.tracer.event(DEBUG, "store_data", records = len(data_records))
+          self.logger.debug("Successfully stored data in the database.")
+          return True
+        except (KeyError, TypeError, ValueError) as error:
+            self.logger.error(f"Error while storing data: {error}")
+            return False
+
+
+    def fetch_data(self, education, awards_threshold = 0)-> List[Dict[str, any]]:
+        '''
+        fetch_data
+        ==========
+
+        Fetches the records of the given university(eq -> education) with at least awards_threshold awards,
+        the tail of the sorted (awards, id) pairs of the university from the first with enough awards.
+
+        Args:
+            education(str): The university to filter the records.
+            awards_threshold(int, optional): The minimum number of awards required. Default is 0.
+
+        Returns:
+            List[Dict[str, any]]: A list of dictionaries representing the fetched data records.
+                                  If no matching records are found, an empty list is returned.
+
+        '''
+
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "fetch_data", education = education, awards_threshold = awards_threshold)
+        with self.lock:
+            entries = self._index_(education)
+            start = bisect_left(entries, (awards_threshold, 0))
+            return [{"surname": self.records[id][0], "education": education, "awards": awards} for awards, id in entries[start:]]
+
+
+    def fetch_and_delete_data(self, key_range = None)-> List[Dict[str, any]]:
+        '''
+        fetch_and_delete_data
+        =====================
+
+        Fetches and deletes the records with a 'hash_value' in the ring interval (start, end] of key_range, the slice of the
+        sorted (hash value, id) pairs between them, or its two ends if the interval wraps around zero. If key_range is None, 
+        every record is fetched, the storage is emptied and closed, and its snapshot file is deleted.
+
+        Args:
+            key_range (Tuple[int, int], optional): The (start, end] ring interval of the hash values. Default is None.
+
+        Returns:
+            List[Dict[str, any]]: A list of dictionaries representing the fetched data records.
+                                  If no matching records are found, an empty list is returned.
+
+        '''
+
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "fetch_and_delete_data", key_range = key_range)
+        with self.lock:
+            if key_range is None:
+                data = [self._output_(id) for id in self.ids]
+                self._clear_()
+                self.opened = False
+                self.generation += 1
+                for path in (self.path, f"{self.path}.tmp"):
+                    if os.path.exists(path):
+                        os.remove(path)
+                return data
+            hashes = self._index_()
+            start, end = (bisect_right(hashes, (int(bound), float("inf"))) for bound in key_range)
+            ids = sorted(id for _, id in (hashes[start:end] if int(key_range[0]) <= int(key_range[1]) else hashes[start:] + hashes[:end]))
+            data = [self._output_(id) for id in ids]
+            self._delete_(set(ids))
+            return data
+
+
+    def fetch_chunk(self, key_range = None, after = 0, limit = 1000)-> List[Dict[str, any]]:
+        '''
+        fetch_chunk
+        ===========
+
+        Fetches, in the order of their ids, up to limit records with an id greater than after and a 'hash_value'
+        in the ring interval key_range unless it's None, without deleting them(see chordDb.fetch_chunk).
+
+        Returns:
+            List[Dict[str, any]]: A list of dictionaries representing the fetched data records, along with their 'id'.
+                                  An empty list is returned once the handoff is complete.
+
+        '''
+
+        with self.lock:
+            chunk = []
+            for id in self.ids[bisect_right(self.ids, after):]:
+                if key_range is None or ChordRing.in_range(key_range, self.records[id][3]):
+                    chunk.append({"id": id, **self._output_(id)})
+                    if len(chunk) == limit:
+                        break
+            return chunk
+
+
+    def acknowledge(self, key_range = None, upto = 0)-> int:
+        '''
+        Deletes the records of a handoff acknowledged by the receiver, i.e. the records with an id up to upto
+        and a 'hash_value' in the ring interval key_range, unless it's None. Returns their number.
+        '''
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "acknowledge", key_range = key_range, upto = upto)
+        with self.lock:
+            ids = {id for id in self.ids[:bisect_right(self.ids, upto)] if key_range is None or ChordRing.in_range(key_range, self.records[id][3])}
+            self._delete_(ids)
+            return len(ids)
+
+
+    def checkpoint(self, source)-> int:
+        '''
+        Returns the last record id stored from source by an unfinished handoff, 0 if there's none.
+        '''
+        with self.lock:
+            return self.checkpoints.get(source, 0)
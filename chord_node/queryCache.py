@@ -0,0 +1,159 @@
+from bisect import bisect_left
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from generatedStubs.chordprot_pb2 import DataTransferResponse, CompScientistData
+from chordRing import ChordRing
+
+
+class QueryCache:
+    '''
+    Bounded LRU cache of the get_data() responses of a node, by (university, awards threshold).
+
+    The records of a response are sorted by awards, so the entry of a university for threshold t also answers the
+    queries of the university for any threshold above t, with the tail of its records from the first with enough
+    awards. Such a derived response is cached under its own threshold as well. Responses are shared by the calls
+    they answer and must not be modified.
+
+    Entries are invalidated when the records of their university change: by university for the records stored or
+    removed(invalidate_records), by the key of the university for the ranges handed over(invalidate_keys), or all
+    at once(clear). Invalidations advance the version of the cache, and a response read from the database is cached
+    only if the version didn't change meanwhile, so a query racing an update never caches the data it replaced.
+
+    Attributes:
+        capacity(int): The maximum number of entries(QUERY_CACHE_SIZE, 0 disables the cache).
+        entries(OrderedDict): The (key, awards, response) entries by (university, threshold), least recently used first.
+        thresholds(Dict[str, set]): The cached thresholds of each university.
+        version(int): The number of invalidations so far.
+        hits, misses, evictions(int): The counters of the cache, served by get_cache_stats().
+
+    '''
+
+    def __init__(self, ring: ChordRing, capacity: int) -> None:
+        self.ring = ring
+        self.capacity = max(0, int(capacity))
+        self.entries = OrderedDict()
+        self.thresholds = dict()
+        self.lock = Lock()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def get(self, university: str, threshold: int) -> Optional[DataTransferResponse]:
+        '''
+        get
+        ===
+
+        Returns the cached response of a query, either cached for the threshold itself or derived from the entry of
+        the university with the greatest threshold below it, None on a miss.
+
+        '''
+        if self.capacity == 0:
+            return None
+        with self.lock:
+            entry = self.entries.get((university, threshold))
+            if entry is not None:
+                self.entries.move_to_end((university, threshold))
+                self.hits += 1
+                return entry[2]
+            lower = [cached for cached in self.thresholds.get(university, ()) if cached < threshold]
+            if not lower:
+                self.misses += 1
+                return None
+            key, awards, response = self.entries[(university, max(lower))]
+            self.entries.move_to_end((university, max(lower)))
+            start = bisect_left(awards, threshold)
+            response = DataTransferResponse(data = response.data[start:])
+            self._insert_(university, threshold, (key, awards[start:], response))
+            self.hits += 1
+            return response
+
+
+    def put(self, university: str, threshold: int, data: Iterable[Dict[str, any]], version: int) -> DataTransferResponse:
+        '''
+        put
+        ===
+
+        Builds the response of a query from the records read from the database and caches it, unless the cache was
+        invalidated since version, the one read before the query.
+
+        Args:
+            university(str): The university of the query.
+            threshold(int): The minimum number of awards of the query.
+            data(Iterable[Dict[str, any]]): The 'surname', 'education' and 'awards' of the records of the query.
+            version(int): The version of the cache before the records were read.
+
+        Returns:
+            DataTransferResponse: The response of the query.
+
+        '''
+        records = sorted(data, key = lambda scientist: scientist.get("awards"))
+        response = DataTransferResponse(data = map(lambda scientist: CompScientistData(Surname = scientist.get("surname"),
+                                                                                       Education = scientist.get("education"),
+                                                                                       Awards = scientist.get("awards")), records))
+        if self.capacity == 0:
+            return response
+        entry = (self.ring.hash(university), [scientist.get("awards") for scientist in records], response)
+        with self.lock:
+            if version == self.version:
+                self._insert_(university, threshold, entry)
+        return response
+
+
+    def _insert_(self, university: str, threshold: int, entry: Tuple) -> None:
+        '''
+        Caches an entry as the most recently used one, evicting the least recently used ones above capacity.
+        '''
+        self.entries[(university, threshold)] = entry
+        self.entries.move_to_end((university, threshold))
+        self.thresholds.setdefault(university, set()).add(threshold)
+        while len(self.entries) > self.capacity:
+            self._discard_(*next(iter(self.entries)))
+            self.evictions += 1
+
+
+    def _discard_(self, university: str, threshold: int) -> None:
+        '''
+        Removes the entry of a query.
+        '''
+        del self.entries[(university, threshold)]
+        self.thresholds[university].discard(threshold)
+        if not self.thresholds[university]:
+            del self.thresholds[university]
+
+
+    def invalidate_records(self, records: Iterable[Tuple[str, int]]) -> None:
+        '''
+        Drops the entries answering queries which include some of the given (university, awards) records, stored
+        or removed, i.e. the entries of their universities with a threshold up to the most awards of one of them.
+        '''
+        most = dict()
+        for university, awards in records:
+            most[university] = max(int(awards), most.get(university, 0))
+        with self.lock:
+            self.version += 1
+            for university, awards in most.items():
+                for threshold in [cached for cached in self.thresholds.get(university, ()) if cached <= awards]:
+                    self._discard_(university, threshold)
+
+
+    def invalidate_keys(self, covered: Callable[[int], bool]) -> None:
+        '''
+        Drops the entries of the universities whose key is covered, e.g. by the range handed over to a joining node.
+        '''
+        with self.lock:
+            self.version += 1
+            for university, threshold in [query for query, entry in self.entries.items() if covered(entry[0])]:
+                self._discard_(university, threshold)
+
+
+    def clear(self) -> None:
+        '''
+        Drops every entry.
+        '''
+        with self.lock:
+            self.version += 1
+            self.entries.clear()
+            self.thresholds.clear()
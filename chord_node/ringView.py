@@ -0,0 +1,176 @@
+import grpc
+import logging
+import yaml
+import os
+from random import choice, random
+from threading import Lock
+from time import monotonic
+from typing import List, Tuple
+from channelPool import ChannelPool
+
+
+class RingView:
+    '''
+    Client side view of the Chord ring: a membership list plus a pool of reusable channels.
+
+    The membership is learned from the ring itself, by walking the successor pointers from a seed node,
+    and is cached for ttl seconds, so that clients(the CLI, the benchmarks and the bulk loader) neither
+    rebuild channels nor query the Docker API for every request.
+
+    With successor replication the view also spreads the reads of a key over its replicas, the owner and the nodes
+    following it(see get_data), preferring the one with the fewest requests of the client outstanding.
+
+    Attributes:
+        ring(ChordRing): The identifier space of the ring.
+        chordprot_pb2: The generated protobuf messages module.
+        chordprot_pb2_grpc: The generated gRPC stubs module.
+        channels(ChannelPool): The pool of channels to the nodes.
+        ttl(float): The number of seconds after which the membership is refreshed.
+        members(List[Tuple[int, str]]): The (node_id, ip_addr) pairs of the nodes, in ring order.
+        outstanding(Dict[str, int]): The get_data() requests of the client in flight, by node.
+
+    '''
+
+    def __init__(self, ring, chordprot_pb2, chordprot_pb2_grpc, channels = None, ttl = 30.0):
+        self.ring = ring
+        self.chordprot_pb2 = chordprot_pb2
+        self.chordprot_pb2_grpc = chordprot_pb2_grpc
+        self.channels = channels if channels is not None else ChannelPool()
+        self.ttl = ttl
+        self.members = list()
+        self.refreshed_at = None
+        self.outstanding = dict()
+        self.lock = Lock()
+        self.logger = logging.getLogger(__name__)
+
+
+    def stub(self, ip_addr: str, stub_class = None):
+        '''
+        Returns a pooled stub(ChordStub by default) for the node at ip_addr.
+        '''
+        return self.channels.stub(ip_addr, stub_class or self.chordprot_pb2_grpc.ChordStub)
+
+
+    def refresh(self, seeds: List[str]) -> List[Tuple[int, str]]:
+        '''
+        refresh
+        =======
+
+        Rebuilds the membership by walking the ring's successor pointers from the first reachable seed.
+
+        Args:
+            seeds(List[str]): IP addresses of nodes believed to be in the ring.
+
+        Returns:
+            List[Tuple[int, str]]: The (node_id, ip_addr) pairs of the nodes, in ring order.
+
+        '''
+        Empty = self.chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty
+        for seed in seeds:
+            members, visited, node_ip = list(), set(), seed
+            try:
+                while node_ip not in visited:
+                    visited.add(node_ip)
+                    members.append((self.ring.node_id(node_ip), node_ip))
+                    node_ip = self.stub(node_ip).get_successor(Empty()).ip_addr
+            except grpc.RpcError as e:
+                self.logger.warning(f"Walking the ring from {seed} failed: {e}")
+                continue
+            self.members = sorted(members)
+            self.refreshed_at = monotonic()
+            return self.members
+        return self.members
+
+
+    def nodes(self, seeds = None) -> List[Tuple[int, str]]:
+        '''
+        Returns the cached membership, refreshing it from the ring once it's older than ttl.
+        Known members are tried as seeds before the given ones.
+        '''
+        if self.refreshed_at is None or monotonic() - self.refreshed_at > self.ttl:
+            self.refresh([ip_addr for _, ip_addr in self.members] + list(seeds or []))
+        return self.members
+
+
+    def random_node(self, seeds = None) -> str:
+        '''
+        Returns the IP address of a random member of the ring.
+        '''
+        return choice(self.nodes(seeds))[1]
+
+
+    def replicas(self, ip_addr: str, factor: int) -> List[str]:
+        '''
+        Returns the node at ip_addr followed by its factor - 1 successors in the view, the nodes holding its keys.
+        '''
+        ips = [member[1] for member in self.members]
+        if ip_addr not in ips:
+            return [ip_addr]
+        index = ips.index(ip_addr)
+        return [ips[(index + i) % len(ips)] for i in range(min(max(1, factor), len(ips)))]
+
+
+    def get_data(self, ip_addr: str, request, factor: int = 1, timeout: float = None):
+        '''
+        get_data
+        ========
+
+        Sends a range query to one of the replicas of the keys of the node at ip_addr, its owner.
+
+        The replicas are tried in the order of the requests of the client outstanding at them, the least loaded first
+        and ties broken at random, falling back to the next one if a replica times out or is unavailable.
+
+        Args:
+            ip_addr(str): The IP address of the owner of the key queried.
+            request(RangeQueryRequest): The range query.
+            factor(int): The number of replicas of each key(REPLICATION_FACTOR).
+            timeout(float): The seconds to wait for each replica, unbounded if None.
+
+        Returns:
+            DataTransferResponse: The response of the first replica answering.
+
+        Raises:
+            grpc.RpcError: If no replica answered, the error of the last one.
+
+        '''
+        with self.lock:
+            candidates = sorted(self.replicas(ip_addr, factor), key = lambda node_ip: (self.outstanding.get(node_ip, 0), random()))
+        for attempt, node_ip in enumerate(candidates):
+            with self.lock:
+                self.outstanding[node_ip] = self.outstanding.get(node_ip, 0) + 1
+            try:
+                return self.stub(node_ip, self.chordprot_pb2_grpc.DataTransferStub).get_data(request, timeout = timeout)
+            except grpc.RpcError as e:
+                if e.code() not in (grpc.StatusCode.DEADLINE_EXCEEDED, grpc.StatusCode.UNAVAILABLE) or attempt == len(candidates) - 1:
+                    raise
+                self.logger.warning(f"Replica {node_ip} failed to answer, falling back to the next one: {e}")
+            finally:
+                with self.lock:
+                    self.outstanding[node_ip] -= 1
+
+
+    def discard(self, ip_addr: str) -> None:
+        '''
+        Removes a node, e.g. one that has left the ring, from the view and closes its channel.
+        '''
+        self.members = [member for member in self.members if member[1] != ip_addr]
+        self.channels.evict(ip_addr)
+
+
+    def save(self, path: str) -> None:
+        '''
+        Persists the membership, so that later processes can use it as seeds.
+        '''
+        with open(path, "w") as view_file:
+            yaml.dump([ip_addr for _, ip_addr in self.members], view_file)
+
+
+    @staticmethod
+    def load(path: str) -> List[str]:
+        '''
+        Loads the IP addresses persisted by save(), if any.
+        '''
+        if not os.path.exists(path):
+            return []
+        with open(path, "r") as view_file:
+            return yaml.safe_load(view_file) or []
@@ -0,0 +1,260 @@
+import os
+import tempfile
+import logging
+from collections import defaultdict
+from typing import List, Dict, Tuple
+from chordDb import chordDb
+from chordRing import ChordRing
+from storageEngine import StorageEngine
+from tracer import Tracer, DEBUG
+from subprocess import run
+
+
+class shardedDb(StorageEngine):
+    '''
+    Range partitioned database management for each Chord node.
+
+    The identifier space is split into fixed ranges of equal size, the shards, and the records of each shard are kept
+    in a database file of their own, managed by a chordDb. Shard i holds the hash values from ceil(i * size / count) up
+    to the start of shard i + 1. As every node splits the identifier space the same way, a shard of one node maps to
+    the same shard of any other node, and handing keys over moves database files instead of re-encoding their records:
+    export() copies the records of the shards to hand over into new database files, whose bytes are streamed to the
+    receiving node, which merges them(see chordDb.merge) into its own shards.
+
+    The shards are selected through DB_SHARDS, the same on every node. With a single shard(the default) nodes keep
+    their records in one chordDb instead.
+
+    As a StorageEngine, the shards are one storage: the id of a record is its id in its shard times the number of
+    shards, plus the index of the shard, so ids are unique across the shards and ascend within each one.
+
+    Attributes:
+        ring(ChordRing): The identifier space of the network.
+        shards(List[chordDb]): The databases of the shards, in the order of their ranges.
+        tracer(Tracer): The tracer recording the database events, usually the one of the node.
+
+    '''
+
+    sharded = True
+
+    def __init__(self, ring: ChordRing, count: int, tracer = None):
+        '''
+        __init__
+        ========
+
+        Initializes the shards of the node's database, connecting to the files of the shards found on disk.
+
+        Args:
+            ring(ChordRing): The identifier space of the network.
+            count(int): The number of shards, at most the size of the identifier space.
+            tracer(Tracer): The tracer recording the database events.
+
+        Raises:
+            ValueError: If count isn't between 1 and the size of the identifier space.
+
+        '''
+        logging.basicConfig(level = os.environ.get("LOG_LEVEL", "INFO").upper())
+        self.logger = logging.getLogger(__name__)
+        self.tracer = tracer if tracer is not None else Tracer.from_env()
+        if not 1 <= count <= ring.size:
+            raise ValueError(f"The number of shards must be between 1 and {ring.size}, got {count}.")
+        self.ring = ring
+        hostname = run("hostname -I", shell = True, capture_output = True, text = True).stdout.strip()
+        self.shards = [chordDb(tracer = self.tracer, db_name = f"{hostname}_chord.{index:04d}.db") for index in range(count)]
+
+
+    def shard_of(self, key: int) -> int:
+        '''
+        Returns the index of the shard holding the given hash value.
+        '''
+        return int(key) * len(self.shards) // self.ring.size
+
+
+    def shards_in(self, key_range) -> List[Tuple[int, bool]]:
+        '''
+        Returns the index of each shard holding hash values of the ring interval (start, end] of key_range(all if None),
+        along with whether the interval covers the whole shard.
+        '''
+        count = len(self.shards)
+        if key_range is None:
+            return [(index, True) for index in range(count)]
+        start, end = map(int, key_range)
+        if start == end:
+            return []
+        selected = []
+        for index in range(count):
+            first, last = -(-index * self.ring.size // count), -(-(index + 1) * self.ring.size // count) - 1
+            whole = self.ring.in_half_open(start, end, first) and self.ring.distance(first, last) <= self.ring.distance(first, end)
+            if whole or self.ring.in_half_open(start, end, first) or first <= (start + 1) % self.ring.size <= last:
+                selected.append((index, whole))
+        return selected
+
+
+    def write_disk(self) -> None:
+        '''
+        write_disk
+        ==========
+
+        Opens the databases of all the shards, creating them if needed(see chordDb.write_disk).
+
+        Returns:
+            None
+        '''
+
+        for shard in self.shards:
+            shard.write_disk()
+
+
+    def store_data(self, data_records, source = None, last = False)-> bool:
+        '''
+        store_data
+        ==========
+
+        Stores data records in the databases of their shards.
+
+        Args:
+            data_records (list): A list of dictionaries representing data records.
+                                 Each dictionary should have keys: 'Surname', 'Education', 'Awards', and 'Hash'.
+            source (str, optional): The node handing the records over in chunks(see chordDb.store_data). Every shard keeps 
+                                    the checkpoint of the records of source it stored.
+            last (bool, optional): Whether this is the last chunk of the handoff from source, removing the checkpoints.
+
+        Returns:
+            bool: True if the data is successfully stored in every shard, False otherwise.
+
+        '''
+
+        if len(data_records) == 0 and source is None:
+            self.logger.warning("No data to store in the database.")
+            return True
+
+        groups = defaultdict(list)
+        for record in data_records:
+            groups[self.shard_of(record['Hash'])].append(record)
+        if source is not None and last:
+            return all([shard.store_data(groups.get(index, []), source, last) for index, shard in enumerate(self.shards)])
+        return all([self.shards[index].store_data(records, source) for index, records in groups.items()])
+
+
+    def fetch_data(self, education, awards_threshold = 0)-> List[Dict[str, any]]:
+        '''
+        fetch_data
+        ==========
+
+        Fetches the records of the given university(eq -> education) with at least awards_threshold awards
+        from every shard(see chordDb.fetch_data).
+
+        Returns:
+            List[Dict[str, any]]: A list of dictionaries representing the fetched data records.
+
+        '''
+
+        return [record for shard in self.shards for record in shard.fetch_data(education, awards_threshold)]
+
+
+    def fetch_and_delete_data(self, key_range = None)-> List[Dict[str, any]]:
+        '''
+        fetch_and_delete_data
+        =====================
+
+        Fetches and deletes the records with a 'hash_value' in the ring interval key_range from the shards
+        that may hold some(see chordDb.fetch_and_delete_data). If key_range is None, every record is fetched
+        and the files of all the shards are deleted.
+
+        Returns:
+            List[Dict[str, any]]: A list of dictionaries representing the fetched data records.
+
+        '''
+
+        return [record for index, _ in self.shards_in(key_range) for record in self.shards[index].fetch_and_delete_data(key_range)]
+
+
+    def fetch_chunk(self, key_range = None, after = 0, limit = 1000)-> List[Dict[str, any]]:
+        '''
+        fetch_chunk
+        ===========
+
+        Fetches, in the order of their ids, up to limit records with an id greater than after and a 'hash_value'
+        in the ring interval key_range unless it's None, from the shards overlapping it(see chordDb.fetch_chunk).
+
+        Note:
+          A record stored in a shard while the chunks are read may get an id below the last one read, if another shard 
+          is ahead, and be skipped. Handoffs move the files of the shards instead(see export), and the chunks only serve 
+          reads of all the data that hold stores back, e.g. the syncs of the successor replicas.
+
+        Returns:
+            List[Dict[str, any]]: A list of dictionaries representing the fetched data records, along with their 'id'.
+                                  An empty list is returned once all of them were read.
+
+        '''
+
+        count = len(self.shards)
+        chunk = []
+        for index, _ in self.shards_in(key_range):
+            chunk.extend({**record, "id": record["id"] * count + index} 
+                         for record in self.shards[index].fetch_chunk(key_range, (after - index) // count, limit))
+        return sorted(chunk, key = lambda record: record["id"])[:limit]
+
+
+    def acknowledge(self, key_range = None, upto = 0)-> int:
+        '''
+        Deletes the records with an id up to upto and a 'hash_value' in the ring interval key_range(any if None) 
+        from every shard overlapping it, returning their number(see chordDb.acknowledge).
+        '''
+        count = len(self.shards)
+        return sum(self.shards[index].acknowledge(key_range, (upto - index) // count) for index, _ in self.shards_in(key_range))
+
+
+    def checkpoint(self, source)-> int:
+        '''
+        Returns the last record id stored from source by an unfinished handoff, the lowest of the checkpoints of the
+        shards, 0 if there's none. Resuming from it, each shard skips the records up to its own checkpoint.
+        '''
+        return min(shard.checkpoint(source) for shard in self.shards)
+
+
+    def export(self, key_range = None)-> List[Tuple[int, str, int, str]]:
+        '''
+        export
+        ======
+
+        Copies the records with a 'hash_value' in the ring interval key_range(all if None) into one new
+        database file per shard holding some, to be handed over as bytes(see chordDb.export).
+
+        Note:
+          Every shard lying in the interval is copied whole, and only the shards at its ends are filtered 
+          by hash value. The records stay in the shards until they're acknowledged.
+
+        Returns:
+            List[Tuple[int, str, int, str]]: The index of each exported shard, the path of its copy, the id of its last
+                                             copied record, for acknowledge_shard(), and the source to merge the copy as.
+
+        '''
+
+        exported = []
+        for index, whole in self.shards_in(key_range):
+            shard = self.shards[index]
+            # a file of its own per export, as concurrent joins may pull the same shard
+            descriptor, path = tempfile.mkstemp(suffix = ".export", prefix = f"{shard.db_name}.", dir = "./Data")
+            os.close(descriptor)
+            upto = shard.export(path, None if whole else key_range)
+            if upto == 0:
+                os.remove(path)
+                continue
+            exported.append((index, path, upto, f"{shard.db_name}/{shard.token}"))
+        if self.tracer.debug:
+            self.tracer.event(DEBUG, "export_shards", key_range = key_range, shards = [index for index, *_ in exported])
+        return exported
+
+
+    def acknowledge_shard(self, index: int, key_range = None, upto = 0)-> int:
+        '''
+        Deletes the records of an exported shard merged by the receiver, upto being an id of the shard(see chordDb.acknowledge).
+        '''
+        return self.shards[index].acknowledge(key_range, upto)
+
+
+    def merge(self, index: int, path, source)-> int:
+        '''
+        Merges a database file exported from shard index of another node into the same shard(see chordDb.merge).
+        '''
+        return self.shards[index].merge(path, source)
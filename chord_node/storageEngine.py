@@ -0,0 +1,85 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict
+
+
+class StorageEngine(ABC):
+    '''
+    The storage of the records held by a Chord node, as used by ChordNode.
+
+    Records are scientists(surname, education, awards) together with the hash value of their key, the university,
+    and an id assigned in ascending order as they're stored. An engine serves batch insertions(store_data), the
+    queries of get_data() by university and minimum number of awards(fetch_data), and the extraction of the records
+    with a hash value in a ring interval (start, end], key_range, either at once(fetch_and_delete_data) or in acknowledged 
+    chunks ordered by id(fetch_chunk, acknowledge, checkpoint), for the key handoffs of joins and leaves.
+
+    The engine of a node is selected through DB_ENGINE: 'sqlite'(chordDb, the default) or 'memory'(memoryDb), the 
+    SQLite one split into shards(shardedDb) if DB_SHARDS is above 1.
+
+    '''
+
+    # Whether the handoffs move the files of shards(export, merge) instead of chunks of records.
+    sharded = False
+
+    @abstractmethod
+    def write_disk(self) -> None:
+        '''
+        Opens the storage, creating it if needed. It does nothing if the storage is already open.
+        '''
+
+
+    @abstractmethod
+    def store_data(self, data_records, source = None, last = False) -> bool:
+        '''
+        store_data
+        ==========
+
+        Stores a batch of data records.
+
+        Args:
+            data_records (list): A list of dictionaries with keys 'Surname', 'Education', 'Awards' and 'Hash'.
+            source (str, optional): The node handing the records over in chunks, in which case records also have
+                                    the key 'Id', their ascending id at source. Records up to the checkpoint of
+                                    source are skipped, and the checkpoint advances to the last record.
+            last (bool, optional): Whether this is the last chunk of the handoff from source, removing its checkpoint.
+
+        Returns:
+            bool: True if the data is successfully stored, False otherwise.
+
+        '''
+
+
+    @abstractmethod
+    def fetch_data(self, education, awards_threshold = 0) -> List[Dict[str, any]]:
+        '''
+        Returns the 'surname', 'education' and 'awards' of the records of the given university with at least awards_threshold awards.
+        '''
+
+
+    @abstractmethod
+    def fetch_and_delete_data(self, key_range = None) -> List[Dict[str, any]]:
+        '''
+        Removes and returns the records with a 'hash_value' in the ring interval key_range. If key_range is None, all the 
+        records are returned and the storage is deleted.
+        '''
+
+
+    @abstractmethod
+    def fetch_chunk(self, key_range = None, after = 0, limit = 1000) -> List[Dict[str, any]]:
+        '''
+        Returns, in the order of their ids, up to limit records with an 'id' greater than after and a 'hash_value' in
+        the ring interval key_range(any if None), without deleting them.
+        '''
+
+
+    @abstractmethod
+    def acknowledge(self, key_range = None, upto = 0) -> int:
+        '''
+        Deletes the records with an id up to upto and a 'hash_value' in the ring interval key_range(any if None), returning their number.
+        '''
+
+
+    @abstractmethod
+    def checkpoint(self, source) -> int:
+        '''
+        Returns the last record id stored from source by an unfinished handoff, 0 if there's none.
+        '''
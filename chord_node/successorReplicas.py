@@ -0,0 +1,237 @@
+import asyncio
+from contextlib import contextmanager
+from threading import Condition, Lock
+from typing import Callable, Dict, List, Optional, Tuple
+from chordRing import ChordRing
+from storageEngine import StorageEngine
+
+
+class SuccessorReplicas:
+    '''
+    The successor replicas of a node: the copies of its data held by its successors, and the copies of the data of its
+    predecessors held by the node.
+
+    Each key is held by its owner and by the REPLICATION_FACTOR - 1 successors of the owner, its chain. Owner side, every
+    store() is pipelined through the chain: the owner stores the records and forwards them to the first successor of the
+    chain, which stores them and forwards them to the next one, and store() returns once the last one has stored them.
+    Every REPLICA_SYNC_PERIOD seconds the owner walks its successors(see ChordNode.sync_replicas): a successor joining the
+    chain gets all the data of the owner in a full sync, and a successor leaving it releases its replica. A change of the
+    range of the owner(a new predecessor) or of its data outside store()(a handoff) syncs the whole chain again, which is how
+    the replicas follow the joins and leaves of the ring. Stores are pipelined concurrently, while a sync waits for the ones
+    in flight and holds the new ones back(see enter), so that every record reaches the chain either through the sync or after it.
+
+    Holder side, the replica of each owner is kept in a storage engine of its own, along with the range of keys of the owner
+    at its latest sync, (start, owner], and answers the get_data() queries of the keys in that range. A sync is staged into a
+    new engine, which replaces the old one once complete, and drops the replicas of the owners inside the new range, e.g. of
+    a predecessor of the owner that left the ring.
+
+    Attributes:
+        factor(int): The number of copies of each key, the owner's included(REPLICATION_FACTOR, 1 disables replication).
+        period(float): The seconds between the walks of the chain of the node(REPLICA_SYNC_PERIOD).
+        chain(List[str]): The successors the data of the node was last synced to.
+        start(int): The identifier of the predecessor of the node at the latest sync, None before the first one.
+        dirty(bool): Whether the data of the node changed outside store() since the latest sync.
+        owners(Dict[str, Tuple[int, int, StorageEngine]]): The (start, owner_id, engine) replica of each owner held by the node.
+
+    '''
+
+    def __init__(self, ring: ChordRing, factor: int, period: float, engine: Callable[[str], StorageEngine]) -> None:
+        self.ring = ring
+        self.factor = max(1, int(factor))
+        self.period = float(period)
+        self.engine = engine
+        self.chain = list()
+        self.start = None
+        self.dirty = False
+        self.lock = Lock()
+        self.owners = dict()
+        self.syncs = 0
+        self.gate = Condition()
+        self.writers = 0
+        self.waiting = 0
+        self.syncing = False
+
+
+    def enter(self, exclusive: bool = False) -> None:
+        '''
+        Waits until the node may pipeline a store(shared) or sync its chain(exclusive). A waiting sync holds new stores back.
+        '''
+        with self.gate:
+            if exclusive:
+                self.waiting += 1
+                self.gate.wait_for(lambda: not self.syncing and self.writers == 0)
+                self.waiting -= 1
+                self.syncing = True
+            else:
+                self.gate.wait_for(lambda: not self.syncing and self.waiting == 0)
+                self.writers += 1
+
+
+    def exit(self, exclusive: bool = False) -> None:
+        '''
+        Ends a store or a sync admitted by enter().
+        '''
+        with self.gate:
+            if exclusive:
+                self.syncing = False
+            else:
+                self.writers -= 1
+            self.gate.notify_all()
+
+
+    @contextmanager
+    def gated(self, exclusive: bool = False):
+        '''
+        Runs the body as a store(shared) or a sync(exclusive) of the node, see enter().
+        '''
+        self.enter(exclusive)
+        try:
+            yield
+        finally:
+            self.exit(exclusive)
+
+
+    def plan(self, chain: List[str], start: int) -> Tuple[List[str], List[str]]:
+        '''
+        plan
+        ====
+
+        Compares the current chain and range of the node with the ones of its latest sync.
+
+        Args:
+            chain(List[str]): The REPLICATION_FACTOR - 1 successors of the node, nearest first.
+            start(int): The identifier of the predecessor of the node.
+
+        Returns:
+            Tuple[List[str], List[str]]: The successors to sync, all of them if the range or the data of the node changed,
+            and the ones to release.
+
+        '''
+        if self.dirty or start != self.start:
+            return list(chain), [ip_addr for ip_addr in self.chain if ip_addr not in chain]
+        return [ip_addr for ip_addr in chain if ip_addr not in self.chain], [ip_addr for ip_addr in self.chain if ip_addr not in chain]
+
+
+    def synced(self, chain: List[str], start: int) -> None:
+        '''
+        Records a completed sync of the node's data to chain, for the range starting at start.
+        '''
+        self.chain, self.start, self.dirty = list(chain), start, False
+
+
+    def stage(self, owner: str) -> StorageEngine:
+        '''
+        Returns a new, open, engine to stage the sync of the replica of owner into.
+        '''
+        with self.lock:
+            self.syncs += 1
+            staged = self.engine(f"{owner}.{self.syncs}")
+        staged.write_disk()
+        return staged
+
+
+    def commit(self, owner: str, start: int, owner_id: int, staged: StorageEngine) -> None:
+        '''
+        commit
+        ======
+
+        Replaces the replica of owner with the staged one, covering the keys in (start, owner_id], and drops the
+        replicas of the owners lying inside that range.
+
+        '''
+        with self.lock:
+            previous = self.owners.get(owner)
+            self.owners[owner] = (start, owner_id, staged)
+        if previous is not None:
+            previous[2].fetch_and_delete_data()
+        self.release_within(start, owner_id)
+
+
+    def write(self, owner: str, records: List[Dict[str, any]]) -> bool:
+        '''
+        Stores records pipelined by owner into its replica. A replica not synced yet ignores them, as its sync will carry them.
+        '''
+        held = self.owners.get(owner)
+        return True if held is None else held[2].store_data(records)
+
+
+    def release(self, owner: str) -> Optional[Tuple[int, int]]:
+        '''
+        Drops the replica of owner, returning the range it covered(None if it wasn't held).
+        '''
+        with self.lock:
+            held = self.owners.pop(owner, None)
+        if held is None:
+            return None
+        held[2].fetch_and_delete_data()
+        return held[:2]
+
+
+    def release_within(self, start: int, end: int) -> List[str]:
+        '''
+        Drops the replicas of the owners lying in (start, end), e.g. inside the range of the node itself, returning them.
+        '''
+        owners = [owner for owner, (_, owner_id, _) in list(self.owners.items()) if self.ring.in_between(start + 1, end, owner_id)]
+        for owner in owners:
+            self.release(owner)
+        return owners
+
+
+    def clear(self) -> None:
+        '''
+        Drops every replica held, e.g. when the node leaves the ring.
+        '''
+        for owner in list(self.owners):
+            self.release(owner)
+
+
+    def covering(self, key_id: int) -> Optional[StorageEngine]:
+        '''
+        Returns the engine of the replica covering key_id, the one of the nearest owner if ranges overlap, None if no replica does.
+        '''
+        held = [(self.ring.distance(key_id, owner_id), engine) for start, owner_id, engine in list(self.owners.values())
+                if self.ring.in_half_open(start, owner_id, key_id)]
+        return min(held, key = lambda replica: replica[0])[1] if held else None
+
+
+class AioSuccessorReplicas(SuccessorReplicas):
+    '''
+    The successor replicas of an asyncio node server.
+
+    Stores and syncs wait at an asyncio gate on the event loop instead of a thread gate: a store held back by a sync
+    would otherwise block a worker thread, and enough of them would exhaust the threads the sync itself runs on.
+
+    '''
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.gate = asyncio.Condition()
+
+
+    async def enter(self, exclusive: bool = False) -> None:
+        '''
+        Asynchronous counterpart of SuccessorReplicas.enter().
+        '''
+        async with self.gate:
+            if exclusive:
+                self.waiting += 1
+                try:
+                    await self.gate.wait_for(lambda: not self.syncing and self.writers == 0)
+                finally:
+                    self.waiting -= 1
+                self.syncing = True
+            else:
+                await self.gate.wait_for(lambda: not self.syncing and self.waiting == 0)
+                self.writers += 1
+
+
+    async def exit(self, exclusive: bool = False) -> None:
+        '''
+        Asynchronous counterpart of SuccessorReplicas.exit().
+        '''
+        async with self.gate:
+            if exclusive:
+                self.syncing = False
+            else:
+                self.writers -= 1
+            self.gate.notify_all()
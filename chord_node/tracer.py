@@ -0,0 +1,119 @@
+import os
+from collections import deque
+from itertools import count
+from random import random
+from time import time
+from typing import List, Tuple
+
+
+DEBUG, INFO, WARNING, ERROR, OFF = 10, 20, 30, 40, 100
+
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR, "off": OFF}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+
+class Tracer:
+    '''
+    Level gated and sampled tracing of events into an in-memory ring buffer.
+
+    An event is a name plus keyword fields, e.g. ("closest_preceding_finger", key_id = 42). Call sites test the
+    flag of the event's level(debug, info, warning, error) before building it, so a disabled level costs one attribute
+    lookup: no string is formatted and nothing is written to stdout. Events of an enabled level are kept with
+    probability sample_rate in a buffer of the latest capacity events, from which get_trace() serves them over RPC.
+    With echo set, kept events are also printed, e.g. for scripts whose output is read from the console.
+
+    Attributes:
+        level(int): The lowest level recorded(DEBUG, INFO, WARNING, ERROR or OFF).
+        sample_rate(float): The fraction of the events of enabled levels that is kept.
+        echo(bool): Whether kept events are printed as well.
+        events(deque): The latest kept events, as (seq, timestamp, level, name, fields) records.
+        debug, info, warning, error(bool): Whether events of the corresponding level are recorded.
+
+    '''
+
+    def __init__(self, level = "info", sample_rate = 1.0, capacity = 4096, echo = False) -> None:
+        self.sample_rate = float(sample_rate)
+        self.echo = echo
+        self.events = deque(maxlen = int(capacity))
+        self.seq = count(1)
+        self.set_level(level)
+
+
+    @classmethod
+    def from_env(cls, echo = False) -> "Tracer":
+        '''
+        Creates a tracer configured through TRACE_LEVEL, TRACE_SAMPLE_RATE, TRACE_BUFFER_SIZE and TRACE_ECHO.
+        '''
+        return cls(level = os.environ.get("TRACE_LEVEL", "info"),
+                   sample_rate = float(os.environ.get("TRACE_SAMPLE_RATE", 1.0)),
+                   capacity = int(os.environ.get("TRACE_BUFFER_SIZE", 4096)),
+                   echo = os.environ.get("TRACE_ECHO", str(int(echo))) == "1")
+
+
+    def set_level(self, level) -> None:
+        '''
+        set_level
+        =========
+
+        Changes the lowest recorded level, given as a name("debug", "info", "warning", "error", "off") or a number.
+
+        Raises:
+            ValueError: If level isn't a known level name.
+
+        '''
+        if isinstance(level, str):
+            if level.lower() not in LEVELS:
+                raise ValueError(f"Unknown trace level '{level}', expected one of {', '.join(LEVELS)}.")
+            level = LEVELS[level.lower()]
+        self.level = level
+        self.debug = level <= DEBUG
+        self.info = level <= INFO
+        self.warning = level <= WARNING
+        self.error = level <= ERROR
+
+
+    def event(self, level: int, name: str, **fields) -> None:
+        '''
+        event
+        =====
+
+        Records an event, unless it's dropped by sampling. Callers check the flag of the level first.
+
+        Args:
+            level(int): The level of the event.
+            name(str): The name of the event, usually the method emitting it.
+            fields: The values describing the event. They're formatted only when the event is fetched or echoed.
+
+        '''
+        if level < self.level or (self.sample_rate < 1.0 and random() >= self.sample_rate):
+            return
+        record = (next(self.seq), time(), level, name, fields)
+        self.events.append(record)
+        if self.echo:
+            print(self.format(record))
+
+
+    def fetch(self, since: int = 0, limit: int = 0) -> List[Tuple[int, float, int, str, dict]]:
+        '''
+        fetch
+        =====
+
+        Returns the buffered events with a sequence number greater than since, oldest first.
+
+        Args:
+            since(int): The sequence number of the last event already fetched(0 for all).
+            limit(int): The maximum number of events returned, the most recent ones(0 for no limit).
+
+        '''
+        events = [record for record in list(self.events) if record[0] > since]
+        return events[-limit:] if limit > 0 else events
+
+
+    @staticmethod
+    def format(record: Tuple[int, float, int, str, dict]) -> str:
+        '''
+        Formats an event as a single line of text.
+        '''
+        seq, timestamp, level, name, fields = record
+        details = " ".join(f"{key}={value}" for key, value in fields.items())
+        return f"[{LEVEL_NAMES.get(level, level)}] {name} {details}".rstrip()
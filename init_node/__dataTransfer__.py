@@ -1,48 +1,75 @@
-import grpc
 import logging
 from generatedStubs.chordprot_pb2_grpc import ChordStub, DataTransferStub
 from generatedStubs.chordprot_pb2 import (
-    SuccessorRequest,
+    SuccessorsRequest,
     CompScientistData,
     DataTransferRequest
 )
 
 from random import randint
+from collections import defaultdict
+from channelPool import ChannelPool
+from tracer import Tracer, INFO
+
+
+# the number of batched lookups of the keys' owners, each one retrying the keys the previous one left unresolved
+LOOKUP_ATTEMPTS = 3
 
 
 
 class DataTransfer:
     
-    def __init__(self, data, network):
+    def __init__(self, data, network, tracer = None):
      
      self.logger = logging.getLogger(__name__)
      logging.basicConfig(level=logging.WARNING)
      self.network = network
      self.scientists = data
+     self.channels = ChannelPool()
+     self.tracer = tracer if tracer is not None else Tracer.from_env(echo = True)
    
     def transmitData(self, hash_fun):
-        print(len(self.scientists.keys())) 
-
+        if self.tracer.info:
+            self.tracer.event(INFO, "transmit_data", keys = len(self.scientists))
 
-        for key, value in self.scientists.items():
-            hash_value = hash_fun(key)
+        hash_values = {key: hash_fun(key) for key in self.scientists.keys()}
+        owner_ip = dict()
+        pending = set(hash_values.values())
+       
+        # one batched lookup resolves the owners of all keys, the ones left unresolved are looked up again through another node
+        for _ in range(LOOKUP_ATTEMPTS):
             elected_node = self.network[randint(0,len(self.network)-1)][1]
-            # print(f"Hash value of key: {hash_value}")
-           
             try:  
-                with grpc.insecure_channel(f"{elected_node}:50051") as channel:
-                    client = ChordStub(channel)
-                    node = client.find_successor(SuccessorRequest(key_id = hash_value))
-                    # print(f"Sending to {node}")
-                with grpc.insecure_channel(f"{node.ip_addr}:50051") as channel:
-                     client = DataTransferStub(channel)
-                     dt = DataTransferRequest(data = map(lambda sc:  CompScientistData(Surname = sc['Surname'], 
-                                                                              Education = sc['Education'], 
-                                                                              Awards = sc['Awards'],
-                                                                              Hash = hash_value), #adding hash_value
-                                            value))                     
-                     client.store(dt)
-                
+                client = self.channels.stub(elected_node, ChordStub)
+                owners = client.find_successors(SuccessorsRequest(key_ids = [str(hash_value) for hash_value in pending]))
+            except Exception as e:
+                self.logger.error(f"Error during lookup of the keys' owners occured: {e}")
+                continue
+            owner_ip.update((int(owner.key_id), owner.ip_addr) for owner in owners.owners)
+            pending = set(map(int, owners.unresolved))
+            if len(pending) == 0:
+                break
+        
+        node_records = defaultdict(list)
+        skipped = 0
+        for key, value in self.scientists.items():
+            hash_value = hash_values[key]
+            if hash_value not in owner_ip:
+                skipped += len(value)
+                continue
+            node_records[owner_ip[hash_value]].extend(map(lambda sc:  CompScientistData(Surname = sc['Surname'], 
+                                                                                       Education = sc['Education'], 
+                                                                                       Awards = sc['Awards'],
+                                                                                       Hash = str(hash_value)), #adding hash_value
+                                                          value))
+        if skipped > 0:
+            self.logger.error(f"The owners of {len(pending)} keys couldn't be resolved, skipping {skipped} records.")
+        
+        # one store call per owning node
+        for node_ip, records in node_records.items():
+            try:  
+                client = self.channels.stub(node_ip, DataTransferStub)
+                client.store(DataTransferRequest(data = records))
                     
             except Exception as e:
                 self.logger.error(f"Error during transmission occured: {e}")
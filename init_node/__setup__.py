@@ -8,14 +8,25 @@ import yaml
 #expression is interpreted successfully.
 from generatedStubs.chordprot_pb2_grpc import ChordStub 
 from generatedStubs.chordprot_pb2 import (
-    JoinRequest
+    JoinRequest,
+    RoutingState,
+    FingerTableRecord
 )
 from random import (
     shuffle,
-    randint
+    choice
 )
 from time import sleep
+from timeit import default_timer as timer
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
 from generatedStubs.chordprot_pb2_grpc import google_dot_protobuf_dot_empty__pb2 as google_pb_empty
+import generatedStubs.chordprot_pb2 as chordprot_pb2
+import generatedStubs.chordprot_pb2_grpc as chordprot_pb2_grpc
+from channelPool import ChannelPool
+from chordRing import ChordRing
+from ringView import RingView
+from tracer import Tracer, DEBUG, INFO, WARNING, ERROR
 
 
 class ChordInitialization:  
@@ -23,20 +34,33 @@ class ChordInitialization:
     Behavior class for initializing a chord network.
     '''
 
-    def __init__(self, config_file):
+    def __init__(self, config_file, tracer = None):
 
+        # the events of the bring-up are echoed to the console by default(TRACE_ECHO)
+        self.tracer = tracer if tracer is not None else Tracer.from_env(echo = True)
         self.netname = os.environ.get(config_file['chord']['network_var'])
         try:
             client = docker.from_env()
-            print(f"client dockinit| {os.environ.get(config_file['chord']['container_var'])}")
+            if self.tracer.debug:
+                self.tracer.event(DEBUG, "docker_client", container = os.environ.get(config_file['chord']['container_var']))
             
             self.container_id = client.containers.get(os.environ.get(config_file['chord']['container_var'])).id
         except docker.errors.APIError as e:
-             print(f"Failed to get container id for init_node")
+             if self.tracer.warning:
+                 self.tracer.event(WARNING, "container_id_failed", error = e)
     
 
         self.network = self._dnet_inspect()
         self.active_chord = list()
+        self.join_stats = list()
+        self.lock = Lock()
+        self.channels = ChannelPool()
+        self.exponent = int(os.environ.get(config_file['chord']['exp'], 7))
+        self.join_mode = os.environ.get("JOIN_MODE", "eager")
+        self.build_mode = os.environ.get("BUILD_MODE", "join")
+        self.parallelism = max(1, int(os.environ.get("JOIN_PARALLELISM", 8)))
+        self.ready_timeout = float(os.environ.get("READY_TIMEOUT", 30))
+        self.convergence_timeout = float(os.environ.get("CONVERGENCE_TIMEOUT", 60))
         
 
     def _dnet_inspect(self):
@@ -51,37 +75,174 @@ class ChordInitialization:
                     network.append((value["Name"], value["IPv4Address"].split("/")[0]))
 
         except docker.errors.APIError as e:
-            print(f"The {self.netname} docker network wasn't found. Critical failure...")
+            if self.tracer.error:
+                self.tracer.event(ERROR, "network_not_found", network = self.netname)
             # return a sorted (ip address) list of nodes
         return sorted(network, key = lambda x: int(x[1].split(".")[3]))
 
     def initialize(self):
+        '''
+        initialize
+        ==========
         
-        print(f"Initial hosts in network: {len(self.network)}")
-        network_size = len(self.network)
+        Brings up the Chord ring: a randomly elected node forms the ring and the remaining nodes join it.
+
+        Note:
+          A node joins as soon as its server answers(a readiness check of its channel, READY_TIMEOUT seconds at most), 
+          instead of after a fixed sleep. Up to JOIN_PARALLELISM joins run concurrently, each through a random node 
+          that has already joined. Concurrent joins require the stabilization protocol(JOIN_MODE = 'stabilize'), 
+          with eager joins(update_others()) the nodes join one at a time. In stabilization mode the method returns once 
+          the successor pointers link all joined nodes.
+          
+          The wall time and the number of RPCs sent by the joining node are recorded for every join in join_stats.
+        
+          With BUILD_MODE = 'bulk' the ring is built by bulk_build() instead.
+        
+        Returns:
+          None
+        
+        '''
+        if self.build_mode == "bulk":
+            return self.bulk_build()
+        
+        if self.tracer.info:
+            self.tracer.event(INFO, "initialize", hosts = len(self.network), join_mode = self.join_mode)
+        starttime = timer()
         shuffle(self.network)
         elected_host = self.network.pop()
-        print(f"Election begins...")
-        sleep(1.5)
-        print(f"Initial elected Node: {elected_host}")
-        channel = grpc.insecure_channel(elected_host[0]+":50051")
+        if self.tracer.info:
+            self.tracer.event(INFO, "elected", host = elected_host)
+        self._join_node_(elected_host, init = True)
+
+        parallelism = self.parallelism if self.join_mode == "stabilize" else 1
+        if self.tracer.info:
+            self.tracer.event(INFO, "join_nodes", nodes = len(self.network), parallelism = parallelism)
+        with ThreadPoolExecutor(max_workers = parallelism) as executor:
+            list(executor.map(self._join_node_, self.network))
+        self.network = list()
+
+        if self.join_mode == "stabilize":
+            self._await_ring_()
+        self._report_(timer() - starttime)
+
+
+    def bulk_build(self):
+        '''
+        bulk_build
+        ==========
+        
+        Builds the ring in one pass, without protocol joins.
+
+        Note:
+          Every node address is hashed and the predecessor, the successor and the finger table of every node are computed 
+          locally, by bisecting the sorted node identifiers for each finger start. Each node then receives its state through 
+          a single install_routing_state call, with up to JOIN_PARALLELISM calls in flight, so the ring costs N RPCs 
+          instead of the O(N log^2 N) of N joins. Nodes whose server isn't ready within READY_TIMEOUT seconds are left out, 
+          and so are nodes whose identifier collides with the identifier of another node.
+        
+        Returns:
+          None
+        
+        '''
+        if self.tracer.info:
+            self.tracer.event(INFO, "bulk_build", hosts = len(self.network))
+        starttime = timer()
+        ring = ChordRing(self.exponent)
+        with ThreadPoolExecutor(max_workers = self.parallelism) as executor:
+            ready = list(executor.map(lambda host: self.channels.ready(host[1], timeout = self.ready_timeout), self.network))
+        
+        hosts = dict()
+        for host, is_ready in zip(self.network, ready):
+            node_id = ring.node_id(host[1])
+            if not is_ready:
+                if self.tracer.warning:
+                    self.tracer.event(WARNING, "not_ready", host = host, timeout = self.ready_timeout)
+            elif node_id in hosts:
+                if self.tracer.warning:
+                    self.tracer.event(WARNING, "collision", host = host, other = hosts[node_id], node_id = node_id)
+            else:
+                hosts[node_id] = host
+        sorted_ids = sorted(hosts)
+        
+        def install(position):
+            node_id = sorted_ids[position]
+            fingers = [FingerTableRecord(start = str(start), node = str(finger), node_ip = hosts[finger][1]) 
+                       for start, finger in zip(ring.finger_starts(node_id), ring.finger_nodes(node_id, sorted_ids))]
+            state = RoutingState(predecessor_ip_addr = hosts[sorted_ids[position - 1]][1],
+                                 successor_ip_addr = hosts[sorted_ids[(position + 1) % len(sorted_ids)]][1],
+                                 fingers = fingers)
+            try:
+                self.channels.stub(hosts[node_id][1], ChordStub).install_routing_state(state)
+                return hosts[node_id]
+            except grpc.RpcError as e:
+                if self.tracer.warning:
+                    self.tracer.event(WARNING, "install_routing_state_failed", host = hosts[node_id], error = e)
+        
+        with ThreadPoolExecutor(max_workers = self.parallelism) as executor:
+            self.active_chord = [host for host in executor.map(install, range(len(sorted_ids))) if host is not None]
+        self.network = list()
+        if self.tracer.info:
+            self.tracer.event(INFO, "ring_built", nodes = len(self.active_chord), seconds = round(timer() - starttime, 3), rpcs = len(sorted_ids), build_mode = "bulk")
+
+
+    def _join_node_(self, host, init = False):
+        '''
+        Joins host to the ring, through a random active node, once its server is ready, and records the join in join_stats.
+        '''
+        if not self.channels.ready(host[1], timeout = self.ready_timeout):
+            if self.tracer.warning:
+                self.tracer.event(WARNING, "not_ready", host = host, timeout = self.ready_timeout)
+            return
+        
+        with self.lock:
+            contact = host if init else choice(self.active_chord)
+        starttime = timer()
+        try:
+            response = self.channels.stub(host[1], ChordStub).join(JoinRequest(ip_addr = contact[1], init = init))
+        except grpc.RpcError as e:
+            if self.tracer.warning:
+                self.tracer.event(WARNING, "join_failed", host = host, error = e)
+            return
+        elapsed = timer() - starttime
+        
+        with self.lock:
+            self.active_chord.append(host)
+            self.join_stats.append((host, elapsed, response.num_rpcs))
+        if self.tracer.info:
+            self.tracer.event(INFO, "joined", host = host, contact = contact[0], seconds = round(elapsed, 3), rpcs = response.num_rpcs)
+
+
+    def _await_ring_(self):
+        '''
+        Waits, CONVERGENCE_TIMEOUT seconds at most, until walking the successor pointers visits every joined node.
+        '''
+        view = RingView(ChordRing(self.exponent), chordprot_pb2, chordprot_pb2_grpc, channels = self.channels)
+        seeds = [host[1] for host in self.active_chord]
+        deadline = timer() + self.convergence_timeout
+        while len(view.refresh(seeds)) < len(self.active_chord) and timer() < deadline:
+            sleep(0.2)
+        if self.tracer.info:
+            self.tracer.event(INFO, "ring_linked", linked = len(view.members), joined = len(self.active_chord))
+
+
+    def _report_(self, total_time):
+        '''
+        Traces the per join statistics and the calls routed ring-wide during the bring-up(resetting the hop counters of the nodes).
+        '''
+        routed = 0
+        for host in self.active_chord:
+            try:
+                routed += self.channels.stub(host[1], ChordStub).clear_hops(google_pb_empty.Empty()).num_hops
+            except grpc.RpcError as e:
+                if self.tracer.warning:
+                    self.tracer.event(WARNING, "clear_hops_failed", host = host, error = e)
         
-        client = ChordStub(channel)
-        client.join(JoinRequest(ip_addr = elected_host[1], init = True))
-        self.active_chord.append(elected_host)
-
-        for i in range(network_size - 1): 
-            shuffle(self.network)
-            arbitary_node = self.active_chord[randint(0, len(self.active_chord) - 1)] 
-            print(arbitary_node)
-            elected_host = self.network.pop()
-            print(f"[{i}]: Election begins...")
-            sleep(0.3)
-            print(f"[{i}]: Elected Node for initilization: {elected_host}")
-            channel = grpc.insecure_channel(elected_host[1]+":50051")
-            client = ChordStub(channel)
-            client.join(JoinRequest(ip_addr = arbitary_node[1]))
-            self.active_chord.append(elected_host)
+        times = [elapsed for _, elapsed, _ in self.join_stats]
+        rpcs = [num_rpcs for _, _, num_rpcs in self.join_stats]
+        if len(times) > 0 and self.tracer.info:
+            self.tracer.event(INFO, "ring_built", nodes = len(self.active_chord), seconds = round(total_time, 3),
+                              join_mean = round(sum(times)/len(times), 3), join_max = round(max(times), 3),
+                              rpcs_mean = round(sum(rpcs)/len(rpcs), 1), rpcs_max = max(rpcs), routed = routed)
 
 
             
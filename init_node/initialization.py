@@ -10,8 +10,9 @@ from __setup__ import (
     google_pb_empty
 )
 from timeit import default_timer as timer
-import hashlib
 from functools import partial
+from chordRing import ChordRing
+from tracer import Tracer, INFO, ERROR
 
 from random import randint
 
@@ -19,55 +20,61 @@ def hash(data, modulus) -> int:
         '''
         _hash_
         ======
-        Computes the SHA-256 hash and returns it as an integer.
+        Computes the SHA-256 hash and returns it as an identifier on the Chord ring.
 
         Args:
           data: The data to be hashed.
+          modulus: The exponent m of the identifier space [0, 2^m).
         
         Note:
           This method takes input data, encodes it in UTF-8, computes the SHA-256 hash
-          and returns the hash value as an integer.
+          and reduces it modulo 2^m through the shared ring arithmetic(ChordRing).
 
         Returns:
-          int: The integer representation of the SHA-256 hash.
+          int: The identifier of the data on the Chord ring.
 
         '''
-        sha256 = hashlib.sha256()
-        sha256.update(data.encode('utf-8'))
-        return int(sha256.hexdigest(),16) % (2**modulus)  
+        return ChordRing(modulus).hash(data)  
 
 
 
 
 def main():
     
+    tracer = Tracer.from_env(echo = True)
     try:
     
         with open(os.path.join('netcrwl_config.yml'), 'r') as config:
                     config_file = yaml.load(config, Loader = yaml.FullLoader)
         
-        print(f"Beginning the setup of the chord network...")
-        chord = ChordInitialization(config_file = config_file)
+        if tracer.info:
+            tracer.event(INFO, "setup")
+        chord = ChordInitialization(config_file = config_file, tracer = tracer)
         chord.initialize()
-        print(f"Network was successfully initialized.")
+        if tracer.info:
+            tracer.event(INFO, "network_initialized", nodes = len(chord.active_chord))
         
         
         cache_hit = os.environ.get(config_file['data_cache']) 
-        print(cache_hit)
+        if tracer.info:
+            tracer.event(INFO, "data_cache", cache = cache_hit)
         if cache_hit == "miss":
             crawler = WebCrawler(config_file = config_file)
             starttime = timer()
             Scientist_dict = crawler.fetchData()
             endtime = timer()
-            print(f"Data successfully fetched in {endtime - starttime} seconds.")
-            dataLoader = DataTransfer(data = Scientist_dict, network = chord.active_chord)
+            if tracer.info:
+                tracer.event(INFO, "data_fetched", seconds = round(endtime - starttime, 3))
+            dataLoader = DataTransfer(data = Scientist_dict, network = chord.active_chord, tracer = tracer)
             dataLoader.transmitData(hash_fun = partial(hash, modulus = int(os.environ.get(config_file['chord']['exp']))))
 
-        print(f"Initilization of the chord network was successful.")
+        if tracer.info:
+            tracer.event(INFO, "initialized")
 
       
     except Exception as e:
-        print(f"Error occured at Initilization: {e}")
+        if tracer.error:
+            tracer.event(ERROR, "initialization_failed", error = e)
 
 
 if __name__ == "__main__":
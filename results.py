@@ -7,15 +7,17 @@ from ChordSeek import (
     lookup,
     leave,
     join,
-    _dnet_inspect,
+    _ring_view,
+    _ring_nodes,
     click
 )
-import grpc
+from chordRing import ChordRing
 from string import ascii_lowercase
 from random import choices, randint
 from importlib import import_module
 from math import log2
 from time import sleep
+from timeit import default_timer as timer
 
 
 
@@ -32,11 +34,10 @@ def benchmark_lookup(network, ChordStub, node_replicas, Empty, reps):
         lookup.callback(random_text,random_uint) 
 
     for _, node_ip in network:
-        with grpc.insecure_channel(f"{node_ip}"+":50051") as channel:
-            client = ChordStub(channel)
-            hops = client.clear_hops(Empty.Empty()).num_hops
-            hops_per_node.append(hops)
-            hops_count += hops
+        client = _ring_view().stub(node_ip)
+        hops = client.clear_hops(Empty.Empty()).num_hops
+        hops_per_node.append(hops)
+        hops_count += hops
         
     hops_per_node = list(map(lambda hp: (1/reps)*hp, hops_per_node))
     
@@ -44,6 +45,57 @@ def benchmark_lookup(network, ChordStub, node_replicas, Empty, reps):
 
     print(f"Total hops on average: {(1/reps)*hops_count} | expecting O(log{node_replicas}) = {log2(node_replicas)}")    
     print(f"Average hops per node per lookup: {hops_per_node}")
+    
+    verify_routing(network, ChordStub, Empty, reps)
+        
+
+def verify_routing(network, ChordStub, Empty, reps):
+    '''
+    Checks the owners returned by find_successor against the ones computed locally 
+    from the hashed addresses of the network's nodes.
+    '''
+    
+    chordprot_pb2 = import_module(".chordprot_pb2", package = "protobufs.generated")
+    ring = ChordRing(project_config["compose"]["variables"]["IDENT_SPACE_EXP"])
+    node_ids = sorted(ring.hash(node_ip) for _, node_ip in network)
+    
+    mismatches = 0
+    for _ in range(reps):
+        key_id = ring.hash("".join(choices(ascii_lowercase, k = 5)))
+        _, node_ip = network[randint(0, len(network) - 1)]
+        owner = _ring_view().stub(node_ip).find_successor(chordprot_pb2.SuccessorRequest(key_id = str(key_id)))
+        if int(owner.node_id) != ring.successor_id(key_id, node_ids):
+            mismatches += 1
+    
+    for _, node_ip in network:
+        _ring_view().stub(node_ip).clear_hops(Empty.Empty())
+    
+    print(f"Lookups routed to the wrong owner: {mismatches}/{reps}")
+        
+
+def benchmark_routing(network, ChordStub, node_replicas, Empty, reps):
+    '''
+    Compares hops and latency of iterative and recursive find_successor lookups over the same random keys.
+    '''
+    
+    chordprot_pb2 = import_module(".chordprot_pb2", package = "protobufs.generated")
+    ring = ChordRing(project_config["compose"]["variables"]["IDENT_SPACE_EXP"])
+    keys = [ring.hash("".join(choices(ascii_lowercase, k = 5))) for _ in range(reps)]
+    entry_nodes = [network[randint(0, len(network) - 1)][1] for _ in range(reps)]
+    
+    for mode in ("iterative", "recursive"):
+        latency = 0.0
+        for key_id, node_ip in zip(keys, entry_nodes):
+            client = _ring_view().stub(node_ip)
+            starttime = timer()
+            client.find_successor(chordprot_pb2.SuccessorRequest(key_id = str(key_id), recursive = mode == "recursive"))
+            latency += timer() - starttime
+        
+        hops_count = 0
+        for _, node_ip in network:
+            hops_count += _ring_view().stub(node_ip).clear_hops(Empty.Empty()).num_hops
+        
+        print(f"[{mode}] Total hops on average: {(1/reps)*hops_count} | Average latency: {(1000/reps)*latency:.3f} ms | expecting O(log{node_replicas}) = {log2(node_replicas)}")
         
 
 def benchmark_leave(ChordStub, node_replicas, Empty, reps):
@@ -53,21 +105,19 @@ def benchmark_leave(ChordStub, node_replicas, Empty, reps):
     for _ in range(reps): 
         join.callback()
         sleep(1.0)
-        network = _dnet_inspect()
+        network = _ring_nodes()
         for _, node_ip in network:
-            with grpc.insecure_channel(f"{node_ip}"+":50051") as channel:
-                client = ChordStub(channel)
-                client.clear_hops(Empty.Empty())
+            client = _ring_view().stub(node_ip)
+            client.clear_hops(Empty.Empty())
               
               
     for _ in range(reps):             
-        network = _dnet_inspect()
+        network = _ring_nodes()
         leave.callback(network[-1][1])
-        network = _dnet_inspect()
+        network = _ring_nodes()
         for _, node_ip in network:
-            with grpc.insecure_channel(f"{node_ip}"+":50051") as channel:
-                client = ChordStub(channel)
-                hops.append(client.clear_hops(Empty.Empty()).num_hops)
+            client = _ring_view().stub(node_ip)
+            hops.append(client.clear_hops(Empty.Empty()).num_hops)
         
     
     print(f"Total average hops: {(1/reps)*sum(hops)} | expecting O(log{node_replicas}^2) = {log2(node_replicas)**2}")
@@ -81,21 +131,19 @@ def benchmark_join(ChordStub, node_replicas, Empty, reps):
     
     for _ in range(reps): 
         join.callback()
-        network = _dnet_inspect()
+        network = _ring_nodes()
         for _, node_ip in network:
-            with grpc.insecure_channel(f"{node_ip}"+":50051") as channel:
-                client = ChordStub(channel)
-                hops.append(client.clear_hops(Empty.Empty()).num_hops)
+            client = _ring_view().stub(node_ip)
+            hops.append(client.clear_hops(Empty.Empty()).num_hops)
               
               
     for _ in range(reps):             
-        network = _dnet_inspect()
+        network = _ring_nodes()
         leave.callback(network[-1][1])
-        network = _dnet_inspect()
+        network = _ring_nodes()
         for _, node_ip in network:
-            with grpc.insecure_channel(f"{node_ip}"+":50051") as channel:
-                client = ChordStub(channel)
-                client.clear_hops(Empty.Empty())
+            client = _ring_view().stub(node_ip)
+            client.clear_hops(Empty.Empty())
         
     
     print(f"Total average hops: {(1/reps)*sum(hops)} | expecting O(log{node_replicas}^2) = {log2(node_replicas)**2}")
@@ -110,7 +158,7 @@ def benchmark_wrapper(option, reps):
         setup_network()
         chordprot_pb2 = import_module(".chordprot_pb2", package = "protobufs.generated")
         chordprot_pb2_grpc = import_module(".chordprot_pb2_grpc", package = "protobufs.generated")
-        network = _dnet_inspect()
+        network = _ring_nodes()
         ChordStub = getattr(chordprot_pb2_grpc, 'ChordStub')
         Empty = getattr(chordprot_pb2,"google_dot_protobuf_dot_empty__pb2")
         
@@ -118,9 +166,8 @@ def benchmark_wrapper(option, reps):
         
         # potential gather
         for _, node_ip in network:
-            with grpc.insecure_channel(f"{node_ip}"+":50051") as channel:
-                client = ChordStub(channel)
-                client.clear_hops(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty())
+            client = _ring_view().stub(node_ip)
+            client.clear_hops(chordprot_pb2_grpc.google_dot_protobuf_dot_empty__pb2.Empty())
 
         print(f"Hop counters have been globally reset!")
         
@@ -130,6 +177,12 @@ def benchmark_wrapper(option, reps):
                                                             ["NODE_REPLICAS"],
                                                             Empty, reps)
             
+        elif option == "routing":
+            benchmark_routing(network, ChordStub, project_config["compose"]\
+                                                            ["variables"]\
+                                                            ["NODE_REPLICAS"],
+                                                            Empty, reps)
+            
         elif option == "leave":
             benchmark_leave(ChordStub, project_config["compose"]\
                                                             ["variables"]\